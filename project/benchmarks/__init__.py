@@ -0,0 +1,8 @@
+"""Benchmarks for the game models and patterns.
+
+Run a benchmark from the project folder, for example:
+    python -m benchmarks.bench_flyweight
+
+`benchmarks.suite` times the hot paths of every model and pattern with the
+harness of `benchmarks.harness`, and saves results to compare between commits.
+"""
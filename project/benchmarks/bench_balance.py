@@ -0,0 +1,99 @@
+"""Monte-Carlo balance of the weapons against the monsters, on 1 to N processes.
+
+The vectorized encounters are checked against weapons really used one swing
+at a time, every worker count must give the same report, and the partial
+reports must stream in shard by shard.
+"""
+import os
+import random
+import time
+
+import numpy as np
+
+from src.models.weapon import Bow, Shield, WeaponBrokenState
+from src.patterns.prototype.prototype_registry import clone
+from src.simulation.balance import BalanceSimulator, Rules, fight, monster_stats, weapon_stats
+
+ENCOUNTERS = 400_000
+REFERENCE = 20_000
+
+
+def reference(weapon, monster, rules: Rules, count: int, rng: random.Random):
+    """Encounters with real weapons: win rate, mean rounds to kill and mean durability consumed."""
+    wins = kill_rounds = worn = 0
+    for _ in range(count):
+        used = clone(weapon)
+        hp, health = monster.variant.hp(), rules.health
+        for rounds in range(1, rules.max_rounds + 1):
+            if isinstance(used, Shield):
+                dealt = 0
+            elif isinstance(used, Bow):
+                dealt = used.get_total_damage() if used.arrow_count > 0 else 0
+            else:
+                dealt = 0 if isinstance(used.state, WeaponBrokenState) else used.get_total_damage()
+            used.use()
+            if rng.random() >= rules.player_miss:
+                hp -= dealt
+            if hp <= 0:
+                wins += 1
+                kill_rounds += rounds
+                break
+            if rng.random() >= rules.monster_miss:
+                health -= monster.variant.attack_power()
+            if health <= 0:
+                break
+        worn += weapon.durability - used.durability
+    return wins / count, kill_rounds / max(1, wins), worn / count
+
+
+def check_against_objects(simulator: BalanceSimulator) -> None:
+    rules = simulator.rules
+    weapons, monsters = weapon_stats(simulator.weapons), monster_stats(simulator.monsters)
+    rng = np.random.default_rng(1)
+    for row, weapon in enumerate(simulator.weapons):
+        for col, monster in enumerate(simulator.monsters[:3]):
+            wins, _, time_to_kill, durability = fight(weapons[row], monsters[col], rules, REFERENCE, rng)
+            rounds = np.arange(rules.max_rounds + 1)
+            expected = reference(weapon, monster, rules, REFERENCE, random.Random(row * 3 + col))
+            actual = (wins / REFERENCE, time_to_kill @ rounds / max(1, wins), durability @ rounds / REFERENCE)
+            assert abs(actual[0] - expected[0]) < 0.02, (weapon.name, monster.name, actual, expected)
+            # The time to kill of rare wins is too noisy to compare
+            assert expected[0] < 0.1 or abs(actual[1] - expected[1]) < 0.15, (weapon.name, monster.name, actual, expected)
+            assert abs(actual[2] - expected[2]) < 0.15, (weapon.name, monster.name, actual, expected)
+
+
+def main() -> None:
+    simulator = BalanceSimulator()
+    pairs = len(simulator.weapons) * len(simulator.monsters)
+    check_against_objects(simulator)
+
+    start = time.perf_counter()
+    baseline = simulator.run(ENCOUNTERS, workers=0)
+    serial = time.perf_counter() - start
+    total = baseline.total_encounters
+    assert total == ENCOUNTERS * pairs
+
+    print(f"{pairs} weapon/monster pairs, {ENCOUNTERS:,} encounters each ({total:,} in all)")
+    print(f"{'workers':<16}{'time (s)':>10}{'encounters/s':>16}{'speedup':>10}")
+    print(f"{'in process':<16}{serial:>10.2f}{total / serial:>16,.0f}{1:>10.2f}")
+    counts = sorted({1 << i for i in range((os.cpu_count() or 1).bit_length())} | {os.cpu_count() or 1})
+    for workers in counts:
+        start = time.perf_counter()
+        partials = 0
+        done = 0
+        for report in simulator.simulate(ENCOUNTERS, workers):
+            assert report.total_encounters > done, "partial reports must grow"
+            done = report.total_encounters
+            partials += 1
+        elapsed = time.perf_counter() - start
+        assert partials == len(simulator.tasks(ENCOUNTERS))
+        for name in ("encounters", "wins", "draws", "time_to_kill", "durability"):
+            assert np.array_equal(getattr(report, name), getattr(baseline, name)), f"{name} depends on the workers"
+        print(f"{workers:<16}{elapsed:>10.2f}{total / elapsed:>16,.0f}{serial / elapsed:>10.2f}")
+
+    print()
+    print("\n".join(baseline.lines()))
+
+
+if __name__ == "__main__":
+    main()
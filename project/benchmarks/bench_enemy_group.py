@@ -0,0 +1,82 @@
+"""Resolve a fight between two 10k-member hordes made of squads of squads.
+
+The vectorized groups are checked against a member by member loop.
+"""
+import time
+from typing import List, Tuple
+
+from src.patterns.bridge.monster_bridge import Bokoblin, Moblin, Hinox
+from src.patterns.bridge.monster_variant import RedVariant, BlueVariant, WhiteVariant
+from src.patterns.composite.enemy_group import EnemyGroup
+from src.patterns.flyweight.monster_flyweight import MonsterVariantFactory
+
+MEMBERS = 10_000
+SQUAD = 10
+KINDS = (Bokoblin, Moblin, Hinox)
+VARIANTS = (RedVariant, BlueVariant, WhiteVariant)
+
+
+def horde(name: str, offset: int) -> EnemyGroup:
+    """Companies of squads of monsters."""
+    companies = []
+    for company in range(MEMBERS // (SQUAD * SQUAD)):
+        squads = []
+        for squad in range(SQUAD):
+            start = offset + (company * SQUAD + squad) * SQUAD
+            squads.append(EnemyGroup(f"squad {squad}", [
+                KINDS[i % 3](MonsterVariantFactory.get(VARIANTS[(i // 3) % 3])) for i in range(start, start + SQUAD)
+            ]))
+        companies.append(EnemyGroup(f"company {company}", squads))
+    return EnemyGroup(name, companies)
+
+
+def _loop_fight(first: List[Tuple[int, int]], second: List[Tuple[int, int]]) -> Tuple[int, List[int], List[int]]:
+    """Same fight, one member at a time."""
+    hp_a, attack_a = [hp for hp, _ in first], [attack for _, attack in first]
+    hp_b, attack_b = [hp for hp, _ in second], [attack for _, attack in second]
+
+    def damage(hp, attack):
+        return sum(power for life, power in zip(hp, attack) if life > 0)
+
+    def take(hp, amount):
+        for i, life in enumerate(hp):
+            if amount <= 0:
+                break
+            hit = min(life, amount)
+            hp[i] -= hit
+            amount -= hit
+
+    rounds = 0
+    while any(hp_a) and any(hp_b):
+        dealt, taken = damage(hp_a, attack_a), damage(hp_b, attack_b)
+        take(hp_a, taken)
+        take(hp_b, dealt)
+        rounds += 1
+    return rounds, hp_a, hp_b
+
+
+def main() -> None:
+    start = time.perf_counter()
+    first, second = horde("Horde", 0), horde("Legion", 1)
+    built = time.perf_counter() - start
+    assert len(first) == len(second) == MEMBERS
+    columns = [[(m.variant.hp(), m.variant.attack_power()) for m in group.members()] for group in (first, second)]
+
+    start = time.perf_counter()
+    rounds = first.fight(second)
+    fought = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loop_rounds, hp_a, hp_b = _loop_fight(*columns)
+    looped = time.perf_counter() - start
+    assert (rounds, hp_a, hp_b) == (loop_rounds, first.hp.tolist(), second.hp.tolist()), "fights differ"
+
+    winner = first if not first.is_defeated() else second
+    print(f"{MEMBERS} vs {MEMBERS} monsters, {rounds} rounds, {winner.get_stats()}")
+    print(f"build hordes {built * 1000:>9.1f} ms")
+    print(f"vectorized   {fought * 1000:>9.1f} ms ({fought / rounds * 1000:.3f} ms per round)")
+    print(f"loop         {looped * 1000:>9.1f} ms ({looped / fought:.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
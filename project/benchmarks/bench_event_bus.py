@@ -0,0 +1,86 @@
+"""Dispatch cost of the event bus against an observable notifying every observer.
+
+Observers listen to one of many topics; the cost of an event should follow
+the number of observers of its topic, not the total number of observers.
+"""
+import gc
+import time
+
+from src.patterns.observer.event_bus import Event, EventBus
+
+TOPICS = 1_000
+EVENTS = 100_000
+
+
+class Listener:
+    __slots__ = ("topic", "received", "__weakref__")
+
+    def __init__(self, topic: str) -> None:
+        self.topic = topic
+        self.received = 0
+
+    def update(self, event: Event) -> None:
+        self.received += 1
+
+
+class Observable:
+    """Classic observer list: every observer is notified and filters the events."""
+
+    def __init__(self) -> None:
+        self.observers = []
+
+    def notify_observers(self, event: Event) -> None:
+        for observer in self.observers:
+            if observer.topic == event.topic:
+                observer.update(event)
+
+
+def run(observers: int) -> tuple:
+    listeners = [Listener(f"topic {i % TOPICS}") for i in range(observers)]
+    bus = EventBus()
+    for listener in listeners:
+        bus.subscribe(listener.topic, listener.update)
+    start = time.perf_counter()
+    for i in range(EVENTS):
+        bus.publish(f"topic {i % 10}", None, i)
+    bus.dispatch()
+    with_bus = time.perf_counter() - start
+    received = sum(listener.received for listener in listeners)
+    expected = sum(1 for listener in listeners if int(listener.topic.split()[1]) < 10) * EVENTS // 10
+    assert received == expected, (received, expected)
+
+    observable = Observable()
+    observable.observers.extend(listeners)
+    calls = min(EVENTS, 2_000)
+    start = time.perf_counter()
+    for i in range(calls):
+        observable.notify_observers(Event(f"topic {i % 10}", None, i))
+    naive = (time.perf_counter() - start) * EVENTS / calls
+    return with_bus, naive
+
+
+def main() -> None:
+    print(f"{EVENTS} events over 10 of {TOPICS} topics")
+    # The observable is timed on a sample of the events
+    print(f"{'observers':>10}{'per topic':>11}{'bus (ms)':>12}{'observable (ms)':>18}")
+    for observers in (1_000, 10_000, 100_000):
+        with_bus, naive = run(observers)
+        print(f"{observers:>10}{observers // TOPICS:>11}{with_bus * 1000:>12.1f}{naive * 1000:>18.1f}")
+
+    # Dropped observers unsubscribe themselves
+    bus = EventBus()
+    listeners = [Listener("topic") for _ in range(1_000)]
+    for listener in listeners:
+        bus.subscribe("topic", listener.update)
+    del listeners, listener
+    gc.collect()
+    assert bus.subscribers("topic") == 0 and not bus.has_subscribers("topic")
+    start = time.perf_counter()
+    for i in range(EVENTS):
+        bus.publish("topic", None, i)
+    print(f"\nevents without subscribers dropped in {(time.perf_counter() - start) / EVENTS * 1e9:.0f} ns, "
+          f"{bus.pending} queued")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Measure per-monster memory with and without the variant flyweight."""
+import tracemalloc
+
+from src.patterns.bridge.monster_bridge import Bokoblin, Moblin, Hinox
+from src.patterns.bridge.monster_variant import RedVariant, BlueVariant, WhiteVariant
+from src.patterns.flyweight.monster_flyweight import MonsterVariantFactory
+
+MONSTERS = 100_000
+KINDS = (Bokoblin, Moblin, Hinox)
+VARIANTS = (RedVariant, BlueVariant, WhiteVariant)
+
+
+def _without_flyweight(count: int) -> list:
+    return [KINDS[i % 3](VARIANTS[i % 3]()) for i in range(count)]
+
+
+def _with_flyweight(count: int) -> list:
+    return [KINDS[i % 3](MonsterVariantFactory.get(VARIANTS[i % 3])) for i in range(count)]
+
+
+def measure(build, count: int) -> float:
+    """Return the bytes allocated per monster by `build`."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    monsters = build(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list itself is not part of a monster
+    list_size = monsters.__sizeof__()
+    return (after - before - list_size) / count
+
+
+def main() -> None:
+    MonsterVariantFactory.clear()
+    before = measure(_without_flyweight, MONSTERS)
+    after = measure(_with_flyweight, MONSTERS)
+    print(f"monsters:          {MONSTERS}")
+    print(f"without flyweight: {before:.1f} bytes/monster")
+    print(f"with flyweight:    {after:.1f} bytes/monster")
+    print(f"interned variants: {MonsterVariantFactory.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Measure allocations and garbage collector work under sustained loot churn.
+
+Every encounter drops a batch of weapons and potions; the hero keeps a few
+of them and the rest is thrown away. The same churn runs with one factory
+call per item, with the batch API, and with a recycling pool. For each run
+the number of items allocated, the garbage collections and the memory blocks
+still allocated at the end are reported.
+"""
+import gc
+import sys
+import time
+
+from src.patterns.factory.item_factory import RareItemFactory
+from src.patterns.factory.item_pool import ItemPool
+
+ENCOUNTERS = 20_000
+LOOT = 40
+# One item in KEEP_EVERY is kept by the hero for the rest of the run
+KEEP_EVERY = 200
+
+
+class _GcTimer:
+    """Time spent in garbage collections, through gc callbacks."""
+
+    def __init__(self) -> None:
+        self.seconds = 0.0
+        self._start = 0.0
+
+    def __call__(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self._start = time.perf_counter()
+        else:
+            self.seconds += time.perf_counter() - self._start
+
+
+def _per_call(factory, kept: list) -> int:
+    for encounter in range(ENCOUNTERS):
+        loot = [factory.create_weapon() for _ in range(LOOT // 2)] + [factory.create_potion() for _ in range(LOOT // 2)]
+        kept.extend(loot[::KEEP_EVERY])
+    return ENCOUNTERS * LOOT
+
+
+def _batch(factory, kept: list) -> int:
+    for encounter in range(ENCOUNTERS):
+        loot = factory.create_weapons(LOOT // 2) + factory.create_potions(LOOT // 2)
+        kept.extend(loot[::KEEP_EVERY])
+    return ENCOUNTERS * LOOT
+
+
+def _pooled(factory, kept: list) -> int:
+    pool = ItemPool(factory)
+    for encounter in range(ENCOUNTERS):
+        loot = pool.acquire_weapons(LOOT // 2) + pool.acquire_potions(LOOT // 2)
+        kept.extend(loot[::KEEP_EVERY])
+        pool.release_many(item for index, item in enumerate(loot) if index % KEEP_EVERY)
+    return pool.created
+
+
+def _measure(name: str, churn) -> None:
+    factory = RareItemFactory()
+    kept: list = []
+    gc.collect()
+    timer = _GcTimer()
+    gc.callbacks.append(timer)
+    collections = [generation["collections"] for generation in gc.get_stats()]
+    blocks = sys.getallocatedblocks()
+    start = time.perf_counter()
+    allocated = churn(factory, kept)
+    elapsed = time.perf_counter() - start
+    gc.callbacks.remove(timer)
+    collections = [generation["collections"] - before for generation, before in zip(gc.get_stats(), collections)]
+    print(f"{name:<10}{elapsed * 1000:>10.0f}{allocated:>12}{timer.seconds * 1000:>10.1f}{str(collections):>16}"
+          f"{sys.getallocatedblocks() - blocks:>14}")
+
+
+def main() -> None:
+    print(f"{ENCOUNTERS} encounters dropping {LOOT} items")
+    print(f"{'strategy':<10}{'time (ms)':>10}{'items':>12}{'gc (ms)':>10}{'collections':>16}{'new blocks':>14}")
+    for name, churn in (("per call", _per_call), ("batch", _batch), ("pool", _pooled)):
+        _measure(name, churn)
+
+
+if __name__ == "__main__":
+    main()
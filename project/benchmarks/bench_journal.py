@@ -0,0 +1,80 @@
+"""Compare the cost of journaling an action with saving a full snapshot after it.
+
+A crash is also simulated, with a torn record at the end of the journal, to
+check the recovered world matches the world before the crash.
+"""
+import os
+import tempfile
+import time
+
+from src.models.player import Player
+from src.patterns.builder.map_builder import MapBuilder
+from src.patterns.builder.weapon_builder import WeaponBuilder, MasterSwordDirector, AncientBowDirector
+from src.persistence import snapshot
+from src.persistence.journal import Journal
+
+SEED = 42
+SIZE = 100
+ACTIONS = 20_000
+SNAPSHOT_SAVES = 5
+
+
+def _play(player: Player, rooms: list, actions: int) -> None:
+    """Move items between the rooms and the player, and fight."""
+    sword = player.inventory[0]
+    for step in range(actions):
+        room = rooms[(step * 7919) % len(rooms)]
+        if step % 4 == 0 and room.items:
+            item = room.items[0]
+            room.remove_item(item)
+            player.pick_weapon(item)
+        elif step % 4 == 1 and len(player.inventory) > 2:
+            item = player.inventory[-1]
+            player.drop_item(None, item)
+            room.add_item(item)
+        elif step % 4 == 2 and room.monsters:
+            monster = room.monsters[0]
+            room.remove_monster(monster)
+            rooms[(step * 31) % len(rooms)].add_monster(monster)
+        else:
+            player.attack(sword)
+
+
+def main() -> None:
+    player = Player()
+    player.pick_weapon(MasterSwordDirector.construct(WeaponBuilder()))
+    player.pick_weapon(AncientBowDirector.construct(WeaponBuilder()))
+    rooms = MapBuilder().add_generated(SEED, SIZE, SIZE).build()
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "game.journal")
+
+    start = time.perf_counter()
+    for _ in range(SNAPSHOT_SAVES):
+        snapshot.save(os.path.join(folder, "game.snapshot"), player, rooms)
+    snapshot_cost = (time.perf_counter() - start) / SNAPSHOT_SAVES
+
+    journal = Journal(path, state=lambda: (player, rooms), checkpoint_every=ACTIONS * 2)
+    journal.checkpoint(player, rooms)
+    journal.attach(player, rooms)
+    start = time.perf_counter()
+    _play(player, rooms, ACTIONS)
+    journal.flush()
+    journal_cost = (time.perf_counter() - start) / ACTIONS
+
+    # Crash: the last record is only partly written
+    with open(path, "ab") as file:
+        file.write(b"\x40\x00\x00\x00\x01")
+    recovered_player, recovered_rooms = Journal.recover(path)
+    assert [room.get_details() for room in recovered_rooms] == [room.get_details() for room in rooms]
+    assert [item.name for item in recovered_player.inventory] == [item.name for item in player.inventory]
+    assert recovered_player.inventory[0].durability == player.inventory[0].durability
+
+    print(f"{len(rooms)} rooms, {journal.sequence} journaled changes "
+          f"({os.path.getsize(path) / 1024:.1f} KiB)")
+    print(f"{'strategy':<26}{'per action (us)':>16}")
+    print(f"{'full snapshot':<26}{snapshot_cost * 1e6:>16.1f}")
+    print(f"{'journal (batched)':<26}{journal_cost * 1e6:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Sample loot tables: throughput, and statistical checks of the drops.
+
+The drops of the default table, of the table with room modifiers and of a
+nested table with an empty drop are checked with `check_drops`. The
+checks must also notice a biased table, and runs with the same seed must
+give the same items.
+"""
+import sys
+import time
+
+import numpy as np
+
+from src.loot.loot_check import SIGNIFICANCE, check_drops, chi_square_p_value
+from src.loot.loot_table import LootTable, default_loot_table, factory_table, make_rng
+from src.patterns.factory.item_factory import CommonItemFactory, LegendaryItemFactory
+from src.world.map_service import ROOM_LOOT_MODIFIERS
+
+SEED = 2024
+DROPS = 5_000_000
+ITEMS = 200_000
+
+
+def check(name: str, table: LootTable, modifiers=None) -> bool:
+    result = check_drops(table, SEED, DROPS, modifiers)
+    status = "ok" if result.passed else "FAILED: " + ", ".join(result.problems)
+    print(f"{name:<22}{result.leaves:>8}{result.max_deviation:>16.5f}{result.p_value:>10.3f}  {status}")
+    return result.passed
+
+
+def main() -> None:
+    table = default_loot_table()
+    nested = LootTable([
+        ("nothing", 50, None),
+        ("chest", 45, LootTable([("common", 9, factory_table(CommonItemFactory())), ("gold", 1, None)])),
+        ("relic", 5, factory_table(LegendaryItemFactory(), weapon=1, potion=0, key=1)),
+    ])
+
+    print(f"{'table':<22}{'leaves':>8}{'max deviation':>16}{'p-value':>10}")
+    passed = check("default", table)
+    for room, modifiers in ROOM_LOOT_MODIFIERS.items():
+        passed &= check(f"default ({room})", table, modifiers)
+    passed &= check("nested", nested)
+    if not passed:
+        sys.exit("Drops do not follow their table")
+    # The test must notice drops which do not follow the table
+    modified = table.counts(make_rng(SEED), DROPS, {"legendary": 1.05})
+    expected = np.array([probability * DROPS for _, probability in table.leaves()])
+    if chi_square_p_value(np.array([modified[path] for path, _ in table.leaves()], dtype=np.float64),
+                          expected) >= SIGNIFICANCE:
+        sys.exit("The test misses a 5% bias on legendary drops")
+
+    rng = make_rng(SEED)
+    start = time.perf_counter()
+    for _ in range(ITEMS):
+        table.roll(rng)
+    single = time.perf_counter() - start
+    start = time.perf_counter()
+    table.roll_leaves(make_rng(SEED), DROPS)
+    leaves = time.perf_counter() - start
+    start = time.perf_counter()
+    items = table.roll_many(make_rng(SEED), ITEMS)
+    batch = time.perf_counter() - start
+    if [str(item) for item in items] != [str(item) for item in table.roll_many(make_rng(SEED), ITEMS)]:
+        sys.exit("Same seed, different items")
+
+    print(f"\n{'sampling':<26}{'drops/s':>14}")
+    print(f"{'roll (one item)':<26}{ITEMS / single:>14,.0f}")
+    print(f"{'roll_many (items)':<26}{ITEMS / batch:>14,.0f}")
+    print(f"{'roll_leaves (no items)':<26}{DROPS / leaves:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
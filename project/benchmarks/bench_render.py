@@ -0,0 +1,74 @@
+"""Repeated descriptions of a big room and of a weapon, with and without the render cache."""
+import time
+
+from src.models.room import Room
+from src.patterns.bridge.monster_bridge import Bokoblin
+from src.patterns.bridge.monster_variant import RedVariant
+from src.patterns.builder.weapon_builder import MasterSwordDirector
+from src.patterns.factory.item_factory import RareItemFactory
+from src.rendering.diff_renderer import DiffRenderer
+
+ITEMS = 1_000
+MONSTERS = 200
+LOOKS = 2_000
+
+
+def uncached_details(room: Room) -> str:
+    """Description built as before the cache."""
+    details = f"🏰  {room.name}\n"
+    if room.items:
+        details += "Items in the room:\n"
+        for item in room.items:
+            details += f" - {item}\n"
+    if room.monsters:
+        details += "Monsters in the room:\n"
+        for monster in room.monsters:
+            details += f" - {monster.get_stats()}\n"
+    details += "Connections:\n"
+    for direction, other in room.connections.items():
+        details += f" - {direction}: {other.name}\n"
+    return details
+
+
+def _per_call(function, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        function()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main() -> None:
+    room = Room("Great Hall", RareItemFactory().create_weapons(ITEMS),
+                [Bokoblin(RedVariant()) for _ in range(MONSTERS)])
+    room.connect("north", Room("Courtyard", [], []))
+    assert room.get_details() == uncached_details(room)
+    potion = RareItemFactory().create_potion()
+    room.add_item(potion)
+    assert room.get_details() == uncached_details(room), "the cache missed a change"
+    room.remove_item(potion)
+
+    written = []
+    renderer = DiffRenderer(written.append)
+    renderer.render(room.key, room.detail_lines())
+    room.remove_monster(room.monsters[0])
+    assert renderer.render(room.key, room.detail_lines()) == 1 and written[-1].startswith("- ")
+
+    sword = MasterSwordDirector.construct()
+    sword.use()
+    description = sword.get_full_description()
+    sword.invalidate_stats()
+    assert sword.get_full_description() == description
+    sword.use()
+    assert sword.get_full_description() != description, "durability change not shown"
+
+    print(f"room with {ITEMS} items and {MONSTERS} monsters, {LOOKS} looks")
+    print(f"{'look':<28}{'us per look':>12}")
+    print(f"{'uncached +=':<28}{_per_call(lambda: uncached_details(room), LOOKS // 10):>12.2f}")
+    print(f"{'get_details (cached)':<28}{_per_call(room.get_details, LOOKS):>12.2f}")
+    print(f"{'diff renderer, unchanged':<28}"
+          f"{_per_call(lambda: renderer.render(room.key, room.detail_lines()), LOOKS):>12.2f}")
+    print(f"{'weapon description':<28}{_per_call(sword.get_full_description, LOOKS):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
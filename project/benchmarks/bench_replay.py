@@ -0,0 +1,71 @@
+"""Record game sessions, then replay them serially and over a process pool.
+
+Every replay must reach the recorded state hashes; a tampered recording must
+be reported as diverging.
+"""
+import os
+import random
+import time
+
+from src.models.potion import Potion
+from src.simulation.replay import Recorder, Recording, replay, replay_many
+
+SESSIONS = 32
+COMMANDS = 500
+MOVES = ("go north", "go south", "go east", "go west")
+
+
+def play(seed: int) -> Recording:
+    """A session of random but plausible commands."""
+    choices = random.Random(seed)
+    recorder = Recorder(seed, size=200)
+    session = recorder.session
+    for _ in range(COMMANDS):
+        if session.finished:
+            break
+        room = session.current_room
+        potion = next((index for index, item in enumerate(session.player.inventory) if isinstance(item, Potion)), None)
+        if potion is not None and choices.random() < 0.2:
+            command = f"drink {potion}"
+        elif room.monsters and session.player.inventory and choices.random() < 0.7:
+            command = "attack"
+        elif room.items and choices.random() < 0.5:
+            command = "take 0"
+        else:
+            command = choices.choice(MOVES + ("look", "status", "inventory"))
+        recorder.execute(command)
+    return recorder.recording
+
+
+def main() -> None:
+    start = time.perf_counter()
+    recordings = [Recording.loads(play(seed).dumps()) for seed in range(SESSIONS)]
+    recorded = time.perf_counter() - start
+    commands = sum(len(recording.commands) for recording in recordings)
+
+    start = time.perf_counter()
+    serial = [replay(recording) for recording in recordings]
+    serial_time = time.perf_counter() - start
+    start = time.perf_counter()
+    parallel = replay_many(recordings)
+    parallel_time = time.perf_counter() - start
+    assert all(result.ok for result in serial + parallel), [r for r in serial + parallel if not r.ok][:1]
+    assert [r.final_hash for r in serial] == [r.final_hash for r in parallel]
+    assert len({result.final_hash for result in serial}) == SESSIONS, "different seeds gave the same session"
+
+    tampered = Recording.loads(recordings[0].dumps())
+    position = next(i for i, command in enumerate(tampered.commands) if command.startswith("go"))
+    tampered.commands[position] = "look"
+    result = replay(tampered)
+    assert not result.ok and result.diverged_at == position + 1, result
+
+    print(f"{SESSIONS} sessions, {commands} commands")
+    print(f"{'':<22}{'time (s)':>10}{'commands/s':>14}")
+    print(f"{'record':<22}{recorded:>10.2f}{commands / recorded:>14,.0f}")
+    print(f"{'replay, serial':<22}{serial_time:>10.2f}{commands / serial_time:>14,.0f}")
+    print(f"{f'replay, {os.cpu_count()} processes':<22}{parallel_time:>10.2f}{commands / parallel_time:>14,.0f}")
+    print(f"\ntampered recording diverges at command {result.diverged_at}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Headless fast-forward of the scheduler: ticks per second.
+
+A world of many rooms where only a few have something to process, with
+monster respawns and potion buffs in the timer queue. Visiting every room on
+every tick is timed for comparison.
+"""
+import time
+
+from src.models.item import ItemRarity
+from src.models.player import Player
+from src.models.potion import Potion, PotionEffect
+from src.simulation.scheduler import MonsterRespawner, PotionBuffs, Scheduler
+from src.world.map_service import MapService
+
+ROOMS = 100_000
+ACTIVE = 100
+TICKS = 20_000
+
+
+class Burning:
+    """Room actor with something to do for a number of ticks."""
+    __slots__ = ("ticks",)
+
+    def __init__(self, ticks: int) -> None:
+        self.ticks = ticks
+
+    def update(self, scheduler: Scheduler) -> bool:
+        self.ticks -= 1
+        return self.ticks > 0
+
+
+def main() -> None:
+    scheduler = Scheduler()
+    world = MapService.build_chunked_world(7, 400, 400)
+    world.events = scheduler.events
+    # Kept referenced, the bus holds it weakly
+    respawner = MonsterRespawner(scheduler, world, delay=5.0)
+    buffs = PotionBuffs(scheduler, duration=10.0)
+    player = Player()
+    strength = Potion("Strength Potion", ItemRarity.RARE, PotionEffect.STRENGTH, 5)
+
+    removed = 0
+    for x in range(200):
+        room = world.room_at((x, 0))
+        for monster in list(room.monsters):
+            room.remove_monster(monster)
+            removed += 1
+    for i in range(ACTIVE):
+        scheduler.activate(i, Burning(TICKS // 2 + i))
+    for _ in range(50):
+        buffs.drink(player, strength)
+    assert buffs.bonus(player, PotionEffect.STRENGTH) == 250
+
+    start = time.perf_counter()
+    scheduler.fast_forward(TICKS)
+    elapsed = time.perf_counter() - start
+    assert sum(len(world.room_at((x, 0)).monsters) for x in range(200)) == removed, "monsters did not respawn"
+    assert buffs.bonus(player, PotionEffect.STRENGTH) == 0 and scheduler.active_rooms == 0
+
+    actors = [Burning(TICKS) for _ in range(ROOMS)]
+    sample = 200
+    start = time.perf_counter()
+    for _ in range(sample):
+        for actor in actors:
+            actor.update(scheduler)
+    every_room = (time.perf_counter() - start) / sample
+
+    print(f"{TICKS} ticks ({TICKS * scheduler.timestep:.0f} s simulated), {ACTIVE} active rooms, "
+          f"{removed} respawns after {respawner.delay:.0f} s, 50 buffs")
+    print(f"fast-forward      {TICKS / elapsed:>12,.0f} ticks/s")
+    print(f"every {ROOMS} rooms {1 / every_room:>10,.0f} ticks/s")
+
+
+if __name__ == "__main__":
+    main()
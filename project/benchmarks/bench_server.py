@@ -0,0 +1,83 @@
+"""Load generator for the game server.
+
+The server runs in its own process on a Unix socket. Many clients connect at
+once and each one plays a fixed sequence of commands, waiting THINK_TIME
+between two commands like a player would; the latency of every command is
+measured on the client side, the CPU time of the server once it stops. The number of sessions one core can host is the number of commands it
+processes per CPU second, for players sending one command per second.
+"""
+import asyncio
+import os
+import random
+import resource
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+SESSIONS = 1000
+COMMANDS = 20
+THINK_TIME = 0.5
+# Clients connect over this period, as players joining the server
+RAMP_UP = 2.0
+SCRIPT = ("look", "status", "go north", "go east", "take 0", "attack", "inventory", "go south", "go west", "look")
+
+
+async def _read_answer(reader: asyncio.StreamReader) -> str:
+    header = (await reader.readline()).decode()
+    if header.startswith("OK "):
+        for _ in range(int(header[3:])):
+            await reader.readline()
+    return header
+
+
+async def _client(path: str, latencies: list) -> None:
+    await asyncio.sleep(RAMP_UP * random.random())
+    reader, writer = await asyncio.open_unix_connection(path)
+    await _read_answer(reader)
+    for step in range(COMMANDS):
+        await asyncio.sleep(THINK_TIME * random.random() * 2)
+        start = time.perf_counter()
+        writer.write(f"{SCRIPT[step % len(SCRIPT)]}\n".encode())
+        header = await _read_answer(reader)
+        latencies.append(time.perf_counter() - start)
+        if not header:
+            break
+    writer.close()
+
+
+async def _load(path: str) -> list:
+    latencies: list = []
+    await asyncio.gather(*(_client(path, latencies) for _ in range(SESSIONS)))
+    return latencies
+
+
+def main() -> None:
+    path = os.path.join(tempfile.mkdtemp(), "server.sock")
+    server = subprocess.Popen([sys.executable, "-m", "src.server.game_server", "--socket", path],
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    while not os.path.exists(path):
+        time.sleep(0.01)
+    idle = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    start = time.perf_counter()
+    latencies = asyncio.run(_load(path))
+    elapsed = time.perf_counter() - start
+
+    server.send_signal(signal.SIGINT)
+    server.wait()
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = usage.ru_utime + usage.ru_stime - idle.ru_utime - idle.ru_stime
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[int(len(latencies) * 0.99)]
+    print(f"{SESSIONS} concurrent sessions, {len(latencies)} commands in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:.0f} commands/s)")
+    print(f"latency p50 {p50 * 1000:.2f} ms, p99 {p99 * 1000:.2f} ms")
+    print(f"server CPU {cpu:.2f}s, {len(latencies) / cpu:.0f} sessions per core at 1 command/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Compare binary snapshots with pickle and JSON, for size and load time.
+
+The snapshot is also checked to restore the same player and world (round
+trip): a broken weapon with gems and an enchantment, a bow with arrows
+used, a shield, potions, keys and monsters of every variant, whether the
+world is loaded at once or room by room.
+"""
+import dataclasses
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+from enum import Enum
+
+from src.models.inventory import Inventory
+from src.models.item import ItemRarity
+from src.models.key import Key
+from src.models.player import Player
+from src.models.potion import Potion, PotionEffect
+from src.models.room import Room
+from src.models.weapon import Shield, WeaponBrokenState
+from src.patterns.bridge.monster_bridge import Bokoblin, Hinox, Moblin, Monster
+from src.patterns.builder.map_builder import MapBuilder
+from src.patterns.builder.weapon_builder import MasterSwordDirector, AncientBowDirector
+from src.patterns.flyweight.monster_flyweight import MonsterVariantFactory
+from src.persistence import snapshot
+from src.persistence.state import differences, room_state
+
+SEED = 42
+SIZE = 100
+
+
+def _to_json(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Inventory):
+        return list(value)
+    if dataclasses.is_dataclass(value):
+        return {f.name: getattr(value, f.name) for f in dataclasses.fields(value) if not f.name.startswith("_")}
+    if hasattr(value, "__slots__"):
+        return {"class": type(value).__name__, "name": getattr(value, "name", None)}
+    raise TypeError(type(value))
+
+
+def _json_world(player: Player, rooms: list) -> dict:
+    indexes = {id(room): index for index, room in enumerate(rooms)}
+    return {
+        "player": player,
+        "rooms": [{
+            "name": room.name,
+            "position": room.position,
+            "items": room.items,
+            "monsters": [(monster.name, monster.variant.color) for monster in room.monsters],
+            "exits": {direction: indexes[id(target)] for direction, target in room.connections.items()},
+        } for room in rooms],
+    }
+
+
+def _fixture():
+    """A player and a world with every kind of state a snapshot must keep."""
+    broken = MasterSwordDirector.construct()
+    while not isinstance(broken.state, WeaponBrokenState):
+        broken.use()
+    bow = AncientBowDirector.construct()
+    for _ in range(3):
+        bow.use()
+    shield = Shield("Hylian Shield", 80, 30, ItemRarity.LEGENDARY)
+    shield.use()
+    player = Player(health=73)
+    for item in (broken, bow, shield, Potion("Red Potion", ItemRarity.COMMON, PotionEffect.HEAL, 20),
+                 Key("Old Key", ItemRarity.COMMON)):
+        player.pick_weapon(item)
+
+    rooms = MapBuilder().add_generated(SEED, SIZE, SIZE).build()
+    red, blue, white = (MonsterVariantFactory.get(color) for color in ("red", "blue", "white"))
+    armory = Room("Armory", [MasterSwordDirector.construct(), bow, Potion("Elixir", ItemRarity.RARE,
+                                                                          PotionEffect.STRENGTH, 50)],
+                  [Bokoblin(red), Moblin(blue), Hinox(white), Monster("Lynel", white)])
+    armory.connect("up", rooms[0])
+    rooms[0].connect("down", armory)
+    return player, rooms + [armory]
+
+
+def check_round_trip(path: str, player: Player, rooms: list) -> None:
+    loaded_player, loaded = snapshot.load(path)
+    found = differences(player, rooms, loaded_player, loaded)
+    with snapshot.Snapshot(path) as snap:
+        for index in (0, len(rooms) // 2, len(rooms) - 1):
+            if room_state(snap.room(index)) != room_state(rooms[index]):
+                found.append(f"room {index} decoded alone: {room_state(snap.room(index))}")
+    if found:
+        raise SystemExit("The snapshot does not restore the world:\n" + "\n".join(found[:10]))
+
+
+def _timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    # Pickle walks the room graph recursively
+    sys.setrecursionlimit(100_000)
+    player, rooms = _fixture()
+
+    folder = tempfile.mkdtemp()
+    paths = {name: os.path.join(folder, f"world.{name}") for name in ("snapshot", "pickle", "json")}
+    snapshot.save(paths["snapshot"], player, rooms)
+    with open(paths["pickle"], "wb") as file:
+        pickle.dump((player, rooms), file)
+    with open(paths["json"], "w") as file:
+        json.dump(_json_world(player, rooms), file, default=_to_json)
+
+    def load_pickle():
+        with open(paths["pickle"], "rb") as file:
+            return pickle.load(file)
+
+    def load_json():
+        with open(paths["json"]) as file:
+            return json.load(file)
+
+    def load_one_room():
+        with snapshot.Snapshot(paths["snapshot"]) as snap:
+            return snap.room(SIZE * SIZE // 2)
+
+    _, snapshot_time = _timed(lambda: snapshot.load(paths["snapshot"]))
+    _, lazy_time = _timed(load_one_room)
+    _, pickle_time = _timed(load_pickle)
+    _, json_time = _timed(load_json)
+    check_round_trip(paths["snapshot"], player, rooms)
+
+    print(f"{len(rooms)} rooms")
+    print(f"{'format':<22}{'size (KiB)':>12}{'load (ms)':>12}")
+    for name, path, seconds in (
+        ("snapshot (full)", paths["snapshot"], snapshot_time),
+        ("snapshot (one room)", paths["snapshot"], lazy_time),
+        ("pickle", paths["pickle"], pickle_time),
+        ("json (parse only)", paths["json"], json_time),
+    ):
+        print(f"{name:<22}{os.path.getsize(path) / 1024:>12.1f}{seconds * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
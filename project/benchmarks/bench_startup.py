@@ -0,0 +1,58 @@
+"""Cold start of the game, measured with `python -X importtime`.
+
+The headless entry point is compared with the imports `main.py` used to pull
+in: rich, NumPy (through the loot tables) and every pattern module of the demo.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RUNS = 5
+PROJECT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EAGER = "import rich.console, rich.panel, rich.prompt, rich.table, numpy, src.patterns.demo, main"
+LAZY = "import main"
+HEADLESS = [sys.executable, "main.py", "--headless", "--output", "null"]
+
+
+def import_time(statement: str) -> tuple:
+    """Total import time (ms) and imported modules of a statement, in a fresh interpreter."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=PROJECT,
+                            capture_output=True, text=True, check=True)
+    total = 0
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules.append(name.strip())
+        # Only top level imports, their cumulative time covers the nested ones
+        if not name[1:].startswith(" "):
+            total += int(cumulative)
+    return total / 1000, modules
+
+
+def main() -> None:
+    print(f"{'startup':<22}{'imports (ms)':>14}{'modules':>9}  rich  numpy")
+    for name, statement in (("eager imports", EAGER), ("lazy (import main)", LAZY)):
+        times = []
+        for _ in range(RUNS):
+            elapsed, modules = import_time(statement)
+            times.append(elapsed)
+        has = lambda prefix: "yes" if any(m == prefix or m.startswith(prefix + ".") for m in modules) else "no"
+        print(f"{name:<22}{statistics.median(times):>14.1f}{len(modules):>9}  {has('rich'):<6}{has('numpy')}")
+    _, modules = import_time(LAZY)
+    assert "rich" not in modules and "numpy" not in modules and "src.patterns.demo" not in modules
+
+    wall = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run(HEADLESS, cwd=PROJECT, input="look\ngo east\nquit\n", text=True, check=True,
+                       capture_output=True)
+        wall.append(time.perf_counter() - start)
+    print(f"\nheadless run of 3 commands: {statistics.median(wall) * 1000:.0f} ms wall clock (median of {RUNS})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Memory of unopened treasure boxes, lazy loot against items created upfront."""
+import time
+import tracemalloc
+
+from src.loot.loot_table import default_loot_table, make_rng
+from src.models.inventory import Inventory
+from src.patterns.factory.item_factory import CommonItemFactory, LegendaryItemFactory
+from src.patterns.proxy.treasure_proxy import LootDrop, TreasureProxy
+
+BOXES = 1_000_000
+EAGER_BOXES = 100_000
+ITEMS_PER_BOX = 3
+KEY = "Master Key"
+
+
+def measure(build, count: int) -> float:
+    """Return the bytes allocated per box by `build`, and keep the boxes alive while measuring."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    boxes = build(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before - boxes.__sizeof__()) / count
+
+
+def main() -> None:
+    table = default_loot_table()
+    # One loader shared by every box
+    drop = LootDrop(table, ITEMS_PER_BOX)
+    lazy = measure(lambda count: [TreasureProxy(drop, KEY, seed=seed) for seed in range(count)], BOXES)
+    rng = make_rng(0)
+    eager = measure(lambda count: [TreasureProxy(table.roll_many(rng, ITEMS_PER_BOX), KEY) for _ in range(count)],
+                    EAGER_BOXES)
+
+    start = time.perf_counter()
+    boxes = [TreasureProxy(drop, KEY, seed=seed) for seed in range(BOXES)]
+    created = time.perf_counter() - start
+
+    # The key index answers without looking at the rest of the inventory
+    inventory = Inventory(CommonItemFactory().create_weapons(10_000))
+    start = time.perf_counter()
+    assert all("need a key" in box.open(inventory) for box in boxes[:10_000])
+    refused = time.perf_counter() - start
+    inventory.append(LegendaryItemFactory().create_key())
+    start = time.perf_counter()
+    for box in boxes[:10_000]:
+        box.open(inventory)
+    opened = time.perf_counter() - start
+    assert all(box.is_loaded for box in boxes[:10_000]) and not any(box.is_loaded for box in boxes[10_000:])
+    again = TreasureProxy.from_loot(table, 0, KEY, ITEMS_PER_BOX)
+    again.open(inventory)
+    assert [str(item) for item in again.contents] == [str(item) for item in boxes[0].contents]
+
+    print(f"{ITEMS_PER_BOX} items per box")
+    print(f"{'unopened box':<24}{'bytes':>8}")
+    print(f"{'lazy loot':<24}{lazy:>8.0f}")
+    print(f"{'items created upfront':<24}{eager:>8.0f}")
+    print(f"\n{BOXES} lazy boxes created in {created * 1000:.0f} ms")
+    print(f"refused without key  {refused / 10_000 * 1e6:>6.2f} us per box (10k items carried)")
+    print(f"opened (loot rolled) {opened / 10_000 * 1e6:>6.2f} us per box")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Weapons per second: builder chain, director with a compiled recipe, build_many."""
+import time
+
+from src.models.enchantment import EnchantmentType, Gem
+from src.models.item import ItemRarity
+from src.patterns.builder.weapon_builder import WeaponBuilder, MasterSwordDirector, build, build_many
+
+COUNT = 200_000
+
+
+def _builder_chain() -> None:
+    for _ in range(COUNT):
+        (WeaponBuilder()
+         .set_name("Master Blade")
+         .set_damage(50)
+         .set_durability(100)
+         .set_rarity(ItemRarity.LEGENDARY)
+         .add_enchantment(EnchantmentType.LIGHT, 30)
+         .add_gem(Gem(name="Ruby", bonus_damage=15, bonus_durability=10))
+         .add_gem(Gem(name="Sapphire", bonus_damage=10, bonus_durability=20))
+         .set_special_ability("Shoots beams at full health")
+         .build_sword())
+
+
+def main() -> None:
+    spec = MasterSwordDirector.spec()
+    weapons = build_many(spec, 10)
+    reference = MasterSwordDirector.construct()
+    assert all(str(weapon) == str(reference) and weapon.get_total_damage() == reference.get_total_damage()
+               for weapon in weapons)
+    assert all(gem is spec_gem for weapon in weapons for gem, spec_gem in zip(weapon.gems, spec.gems)), \
+        "gems are not shared"
+
+    timings = []
+    for name, run in (("builder chain", _builder_chain),
+                      ("director construct", lambda: [MasterSwordDirector.construct() for _ in range(COUNT)]),
+                      ("build(spec)", lambda: [build(spec) for _ in range(COUNT)]),
+                      ("build_many(spec)", lambda: build_many(spec, COUNT))):
+        start = time.perf_counter()
+        run()
+        timings.append((name, time.perf_counter() - start))
+
+    print(f"{COUNT} Master Blades")
+    print(f"{'method':<22}{'weapons/s':>14}{'speedup':>10}")
+    for name, elapsed in timings:
+        print(f"{name:<22}{COUNT / elapsed:>14,.0f}{timings[0][1] / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Measure the procedural world generation throughput and memory."""
+import time
+import tracemalloc
+
+from src.patterns.builder.map_builder import MapBuilder
+
+SEED = 42
+WIDTH = 500
+HEIGHT = 400
+
+
+def stream(width: int, height: int) -> int:
+    count = 0
+    for _ in MapBuilder().generate(SEED, width, height):
+        count += 1
+    return count
+
+
+def main() -> None:
+    start = time.perf_counter()
+    count = stream(WIDTH, HEIGHT)
+    elapsed = time.perf_counter() - start
+    print(f"rooms generated:  {count}")
+    print(f"rooms per second: {count / elapsed:,.0f}")
+
+    # Peak memory must not depend on the size of the world
+    for height in (HEIGHT // 10, HEIGHT):
+        tracemalloc.start()
+        stream(WIDTH, height)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"peak memory for {WIDTH * height} rooms: {peak / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
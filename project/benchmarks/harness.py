@@ -0,0 +1,189 @@
+"""Micro benchmark harness: warmup, repetitions, statistics, memory and JSON.
+
+A case is registered with `@case(name)` on a setup function returning the
+callable to time; setup is not timed. The number of calls of a repetition
+is calibrated once so that a repetition lasts about `min_time` seconds,
+then the case is warmed up and timed `repeat` times with the garbage
+collector off, like `timeit` does.
+
+A memory case is registered with `@memory(name)` on a function creating one
+object; `tracemalloc` measures the memory held by `count` of them.
+
+Results are saved as JSON with the interpreter, platform and commit they
+were measured on, and two result files can be compared.
+"""
+import gc
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+# Registered cases, by name, in the order of registration
+CASES: Dict[str, Callable[[], Callable[[], Any]]] = {}
+MEMORY_CASES: Dict[str, Callable[[], Any]] = {}
+
+
+def case(name: str) -> Callable:
+    """Register a setup function returning the callable to time."""
+    def register(setup: Callable[[], Callable[[], Any]]) -> Callable[[], Callable[[], Any]]:
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def memory(name: str) -> Callable:
+    """Register a function creating the object to measure."""
+    def register(factory: Callable[[], Any]) -> Callable[[], Any]:
+        MEMORY_CASES[name] = factory
+        return factory
+    return register
+
+
+@dataclass
+class Timing:
+    """Seconds per call of a case, over its repetitions."""
+    number: int
+    repeat: int
+    min: float
+    median: float
+    mean: float
+    stdev: float
+    max: float
+
+    @property
+    def ops_per_second(self) -> float:
+        return 1 / self.median if self.median else float("inf")
+
+
+def _timed(function: Callable[[], Any], number: int) -> float:
+    calls = range(number)
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in calls:
+            function()
+        return time.perf_counter() - start
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def calibrate(function: Callable[[], Any], min_time: float) -> int:
+    """Number of calls lasting at least `min_time` seconds, in steps of 1, 2, 5, 10, ..."""
+    number = 1
+    while True:
+        for factor in (1, 2, 5):
+            if _timed(function, number * factor) >= min_time:
+                return number * factor
+        number *= 10
+
+
+def measure(function: Callable[[], Any], repeat: int = 7, warmup: int = 1, min_time: float = 0.05,
+            number: Optional[int] = None) -> Timing:
+    """Time a callable: calibrate, warm up, then `repeat` repetitions of `number` calls."""
+    if number is None:
+        number = calibrate(function, min_time)
+    for _ in range(warmup):
+        _timed(function, number)
+    times = [_timed(function, number) / number for _ in range(repeat)]
+    return Timing(number, repeat, min(times), statistics.median(times), statistics.fmean(times),
+                  statistics.stdev(times) if repeat > 1 else 0.0, max(times))
+
+
+def measure_memory(factory: Callable[[], Any], count: int = 10_000) -> float:
+    """Bytes allocated per object, with `count` of them alive at once."""
+    objects: List[Any] = [None] * count
+    factory()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for index in range(count):
+            objects[index] = factory()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (after - before) / count
+
+
+def environment() -> Dict[str, Optional[str]]:
+    """What the results depend on besides the code."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"python": sys.version.split()[0], "implementation": platform.python_implementation(),
+            "platform": platform.platform(), "machine": platform.machine(), "commit": commit,
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def run(names: Optional[List[str]] = None, repeat: int = 7, warmup: int = 1, min_time: float = 0.05,
+        count: int = 10_000, report: Optional[Callable[[str], None]] = None, seed: int = 0) -> Dict[str, Any]:
+    """Run timing and memory cases, all of them by default, and return the results.
+
+    `random` is seeded before every case, so cases building random content
+    build the same on every run.
+    """
+    timings: Dict[str, Dict[str, float]] = {}
+    sizes: Dict[str, float] = {}
+    for name, setup in CASES.items():
+        if names is None or name in names:
+            random.seed(seed)
+            timing = measure(setup(), repeat, warmup, min_time)
+            timings[name] = asdict(timing)
+            if report is not None:
+                report(f"{name:<46}{timing.median * 1e6:>12.3f} us{timing.stdev / timing.median:>8.1%}")
+    for name, factory in MEMORY_CASES.items():
+        if names is None or name in names:
+            random.seed(seed)
+            sizes[name] = measure_memory(factory, count)
+            if report is not None:
+                report(f"{name:<46}{sizes[name]:>12.0f} bytes")
+    return {"environment": environment(), "settings": {"repeat": repeat, "warmup": warmup, "min_time": min_time,
+                                                       "count": count, "seed": seed},
+            "timings": timings, "memory": sizes}
+
+
+def save(results: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _verdict(ratio: float, threshold: float, worse: str, better: str) -> str:
+    if ratio > 1 + threshold:
+        return worse
+    if ratio < 1 - threshold:
+        return better
+    return ""
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float = 0.05) -> List[str]:
+    """Lines comparing the medians and memory of two results, changes above `threshold` are flagged."""
+    lines = [f"old: {old['environment'].get('commit')}, new: {new['environment'].get('commit')}",
+             f"{'case':<46}{'old':>14}{'new':>14}{'ratio':>8}"]
+    for name, timing in new["timings"].items():
+        if name in old["timings"]:
+            before, after = old["timings"][name]["median"], timing["median"]
+            ratio = after / before
+            lines.append(f"{name:<46}{before * 1e6:>11.3f} us{after * 1e6:>11.3f} us{ratio:>8.2f} "
+                         f"{_verdict(ratio, threshold, 'slower', 'faster')}".rstrip())
+    for name, after in new["memory"].items():
+        if name in old["memory"]:
+            before = old["memory"][name]
+            ratio = after / before if before else 1.0
+            lines.append(f"{name:<46}{before:>8.0f} bytes{after:>8.0f} bytes{ratio:>8.2f} "
+                         f"{_verdict(ratio, threshold, 'bigger', 'smaller')}".rstrip())
+    return lines
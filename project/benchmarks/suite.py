@@ -0,0 +1,255 @@
+"""Benchmark suite of the hot paths of the models and patterns.
+
+Every case is timed with warmup and repetitions, memory cases report the
+bytes held by one object. Save the results of a commit, then compare:
+
+    python -m benchmarks.suite --json before.json
+    python -m benchmarks.suite --json after.json --compare before.json
+    python -m benchmarks.suite --list
+    python -m benchmarks.suite weapon. room.
+"""
+import argparse
+import sys
+
+from benchmarks import harness
+from benchmarks.harness import case, memory
+from src.models.enchantment import EnchantmentType, Gem
+from src.models.inventory import Inventory
+from src.models.item import ItemRarity
+from src.models.key import Key
+from src.models.player import Player
+from src.models.potion import Potion, PotionEffect
+from src.models.room import Room
+from src.models.weapon import Bow, Shield, Sword
+from src.patterns.bridge.monster_bridge import Bokoblin, Hinox, Moblin
+from src.patterns.bridge.monster_variant import BlueVariant, RedVariant, WhiteVariant
+from src.patterns.builder.weapon_builder import MasterSwordDirector, WeaponBuilder
+from src.patterns.composite.enemy_group import EnemyGroup
+from src.patterns.decorator.weapon_decorator import ROCK, WOOD, RockFusion, WeaponDecorator, WoodFusion
+from src.patterns.factory.item_factory import CommonItemFactory, LegendaryItemFactory, RareItemFactory, WeaponFactory
+from src.patterns.flyweight.monster_flyweight import MonsterVariantFactory
+from src.patterns.prototype.potion_prototype import Potion as PotionPrototype
+from src.patterns.prototype.prototype_registry import PrototypeRegistry
+from src.world.map_service import MapService
+
+# Durability large enough for a weapon to never break while it is timed
+UNBREAKABLE = 10 ** 12
+INVENTORY = 10_000
+GROUP = 1_000
+
+
+def _sword(durability: int = 100) -> Sword:
+    return Sword("Knight's Sword", 20, durability, ItemRarity.RARE, gems=[Gem("Ruby", 15, 10)])
+
+
+def _builder() -> WeaponBuilder:
+    return (WeaponBuilder().set_name("Forged Blade").set_damage(30).set_durability(60)
+            .set_rarity(ItemRarity.RARE).add_enchantment(EnchantmentType.FIRE, 10).add_gem(Gem("Ruby", 15, 10)))
+
+
+def _monsters(count: int):
+    kinds, variants = (Bokoblin, Moblin, Hinox), (RedVariant, BlueVariant, WhiteVariant)
+    return [kinds[i % 3](MonsterVariantFactory.get(variants[(i // 3) % 3])) for i in range(count)]
+
+
+def _room() -> Room:
+    return Room("Great Plateau", [_sword(), Potion("Red Potion", ItemRarity.COMMON, PotionEffect.HEAL, 20)],
+                _monsters(3))
+
+
+# Models
+
+@case("weapon.use")
+def weapon_use():
+    return _sword(UNBREAKABLE).use
+
+
+@case("weapon.use.bow")
+def bow_use():
+    bow = Bow("Royal Bow", 15, UNBREAKABLE, ItemRarity.RARE)
+    bow.arrow_count = UNBREAKABLE
+    return bow.use
+
+
+@case("weapon.get_total_damage")
+def weapon_total_damage():
+    return _sword().get_total_damage
+
+
+@case("weapon.get_total_damage.changed")
+def weapon_total_damage_changed():
+    sword = _sword()
+
+    def changed():
+        sword.damage = 20
+        return sword.get_total_damage()
+    return changed
+
+
+@case("room.get_details")
+def room_details():
+    return _room().get_details
+
+
+@case("room.get_details.changed")
+def room_details_changed():
+    room = _room()
+
+    def changed():
+        room.touch()
+        return room.get_details()
+    return changed
+
+
+@case("player.attack.large_inventory")
+def player_attack():
+    player = Player(inventory=Inventory(_sword() for _ in range(INVENTORY)))
+    weapon = _sword(UNBREAKABLE)
+    player.pick_weapon(weapon)
+    return lambda: player.attack(weapon)
+
+
+@case("map_service.build_world")
+def build_world():
+    return lambda: MapService.build_world(42)
+
+
+# Builder, factories and prototype
+
+@case("builder.build_sword")
+def build_sword():
+    return _builder().build_sword
+
+
+@case("builder.build_bow")
+def build_bow():
+    return _builder().build_bow
+
+
+@case("builder.build_shield")
+def build_shield():
+    builder = _builder()
+    return lambda: builder.build_shield(40)
+
+
+@case("director.construct")
+def director_construct():
+    return MasterSwordDirector.construct
+
+
+for _factory in (CommonItemFactory(), RareItemFactory(), LegendaryItemFactory()):
+    _prefix = f"factory.{type(_factory).__name__}"
+    case(f"{_prefix}.create_weapon")(lambda factory=_factory: factory.create_weapon)
+    case(f"{_prefix}.create_potion")(lambda factory=_factory: factory.create_potion)
+    case(f"{_prefix}.create_key")(lambda factory=_factory: factory.create_key)
+
+
+@case("factory.WeaponFactory.create_sword")
+def create_sword():
+    return lambda: WeaponFactory.create_sword("Soldier's Sword", 12, 30, ItemRarity.COMMON)
+
+
+@case("factory.WeaponFactory.create_bow")
+def create_bow():
+    return lambda: WeaponFactory.create_bow("Soldier's Bow", 10, 30, ItemRarity.COMMON)
+
+
+@case("factory.WeaponFactory.create_shield")
+def create_shield():
+    return lambda: WeaponFactory.create_shield("Soldier's Shield", 30, 8, ItemRarity.COMMON)
+
+
+@case("prototype.clone")
+def prototype_clone():
+    return PotionPrototype("Healing Potion", "heal", 50).clone
+
+
+@case("prototype.registry.clone")
+def registry_clone():
+    registry = PrototypeRegistry()
+    registry.register("master sword", MasterSwordDirector.construct())
+    return lambda: registry.clone("master sword")
+
+
+# Composite and decorator
+
+@case("composite.build")
+def group_build():
+    monsters = _monsters(GROUP)
+    return lambda: EnemyGroup("Horde", [EnemyGroup("Squad", monsters[i:i + 10]) for i in range(0, GROUP, 10)])
+
+
+@case("composite.fight_round")
+def group_fight_round():
+    first, second = EnemyGroup("Horde", _monsters(GROUP)), EnemyGroup("Legion", _monsters(GROUP))
+
+    def fight_round():
+        first.heal()
+        second.heal()
+        return first.fight_round(second)
+    return fight_round
+
+
+@case("composite.damage")
+def group_damage():
+    return EnemyGroup("Horde", _monsters(GROUP)).damage
+
+
+@case("decorator.wrap")
+def decorator_wrap():
+    sword = _sword()
+    return lambda: WoodFusion(RockFusion(sword))
+
+
+@case("decorator.get_total_damage")
+def decorator_total_damage():
+    return WeaponDecorator(_sword(), ROCK, WOOD, ROCK).get_total_damage
+
+
+# Memory held by one object
+
+memory("memory.sword")(_sword)
+memory("memory.bow")(lambda: Bow("Royal Bow", 15, 35, ItemRarity.RARE))
+memory("memory.shield")(lambda: Shield("Hylian Shield", 80, 30, ItemRarity.LEGENDARY))
+memory("memory.potion")(lambda: Potion("Red Potion", ItemRarity.COMMON, PotionEffect.HEAL, 20))
+memory("memory.key")(lambda: Key("Old Key", ItemRarity.COMMON))
+memory("memory.built_sword")(MasterSwordDirector.construct)
+memory("memory.monster")(lambda: Bokoblin(MonsterVariantFactory.get(RedVariant)))
+memory("memory.room")(_room)
+memory("memory.decorated_sword")(lambda: WoodFusion(RockFusion(_sword())))
+memory("memory.enemy_group.10")(lambda: EnemyGroup("Squad", _monsters(10)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time the hot paths of the models and patterns")
+    parser.add_argument("prefixes", nargs="*", help="only run the cases starting with one of these prefixes")
+    parser.add_argument("--repeat", type=int, default=7, help="timed repetitions of every case")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed repetitions before")
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds of a repetition at least")
+    parser.add_argument("--count", type=int, default=10_000, help="objects alive at once in memory cases")
+    parser.add_argument("--json", help="save the results to this file")
+    parser.add_argument("--compare", help="compare with the results saved in this file")
+    parser.add_argument("--threshold", type=float, default=0.05, help="relative change flagged by --compare")
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    args = parser.parse_args()
+
+    names = [*harness.CASES, *harness.MEMORY_CASES]
+    if args.prefixes:
+        names = [name for name in names if name.startswith(tuple(args.prefixes))]
+    if args.list:
+        print("\n".join(names))
+        return
+    if not names:
+        sys.exit(f"No case starts with {', '.join(args.prefixes)}")
+
+    print(f"{'case':<46}{'median':>15}{'stdev':>8}")
+    results = harness.run(names, args.repeat, args.warmup, args.min_time, args.count, report=print)
+    if args.json:
+        harness.save(results, args.json)
+    if args.compare:
+        print()
+        print("\n".join(harness.compare(harness.load(args.compare), results, args.threshold)))
+
+
+if __name__ == "__main__":
+    main()
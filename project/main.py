@@ -1,18 +1,48 @@
 """Entry point for the Zelda-like game."""
+import argparse
+import sys
+from typing import List, Optional
+
 from src.game import Game
+from src.rendering.output import OUTPUTS, make_output
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     """Launch a game session."""
-    """This implements the Singleton pattern for the Game class."""
+    parser = argparse.ArgumentParser(description="Play the game, or run a script of commands headless")
+    parser.add_argument("--headless", action="store_true", help="run the commands of --script (or stdin) and exit")
+    parser.add_argument("--script", help="file of commands, one per line, for headless runs")
+    parser.add_argument("--output", choices=sorted(OUTPUTS), help="output backend (default: rich, plain headless)")
+    parser.add_argument("--ticks", type=int, default=Game.TICKS_PER_COMMAND, help="simulation ticks between commands")
+    parser.add_argument("--record", help="save the recording of the game to this file, to replay it")
+    parser.add_argument("--demo", action="store_true", help="show the design patterns demo")
+    arguments = parser.parse_args(argv)
+
+    output = make_output(arguments.output or ("plain" if arguments.headless else "rich"))
+    # This implements the Singleton pattern for the Game class.
     # We call get_instance() to ensure only one instance is created instead of calling the constructor directly
     # it ensures there is only one Game state and provides a global access point to it
-    game = Game.get_instance()
+    game = Game.get_instance(output)
     # game1 = Game.get_instance()
     # game2 = Game.get_instance()
     # print(game1 is game2) 
-    game.start()
+    if arguments.demo:
+        game.demo()
+    elif arguments.headless:
+        if arguments.script:
+            with open(arguments.script, encoding="utf-8") as script:
+                game.new_game(arguments.ticks)
+                game.play(script)
+        else:
+            # Standard input is not ours to close
+            game.new_game(arguments.ticks)
+            game.play(sys.stdin)
+    else:
+        game.start(arguments.ticks)
+    if arguments.record and game.recording is not None:
+        with open(arguments.record, "w", encoding="utf-8") as file:
+            file.write(game.recording.dumps())
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
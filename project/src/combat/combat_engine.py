@@ -0,0 +1,190 @@
+"""Batched combat resolution engine.
+
+Resolving a hit through `Weapon.use()` and `Monster.attack()` touches every
+object and formats a string on every swing. For balance simulations the engine
+packs attacker/defender pairs once into NumPy columns and resolves a whole
+tick in a few vectorized operations. The outcome of a tick is the same as the
+per-object path:
+
+    if monster hp > 0:
+        weapon.use()
+        monster.attack()
+
+Messages are only formatted when `CombatRound.messages()` is called.
+"""
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from ..models.weapon import Weapon, Bow, Shield, WeaponBrokenState, WeaponUsableState
+
+# Weapon kinds, each kind follows its own `use()` implementation
+MELEE = 0
+BOW = 1
+SHIELD = 2
+
+
+def _weapon_kind(weapon: Weapon) -> int:
+    if isinstance(weapon, Bow):
+        return BOW
+    if isinstance(weapon, Shield):
+        return SHIELD
+    return MELEE
+
+
+class CombatRound:
+    """Result of one resolved tick, messages are built on demand."""
+
+    def __init__(self, batch: "CombatBatch", active: np.ndarray, fired: np.ndarray, damage_dealt: np.ndarray,
+                 damage_received: np.ndarray, newly_broken: np.ndarray, killed: np.ndarray) -> None:
+        self._batch = batch
+        self.active = active
+        self.fired = fired
+        self.damage_dealt = damage_dealt
+        self.damage_received = damage_received
+        self.newly_broken = newly_broken
+        self.killed = killed
+        # Snapshots needed to format the messages of this tick later on
+        self._broken_before = batch.broken & ~newly_broken
+        self._durability = batch.durability.copy()
+        self._arrows = batch.arrows.copy()
+        self._messages: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self.active)
+
+    @property
+    def total_damage_dealt(self) -> int:
+        return int(self.damage_dealt.sum())
+
+    @property
+    def total_damage_received(self) -> int:
+        return int(self.damage_received.sum())
+
+    def message(self, index: int) -> str:
+        """Build the message of one pair, as `weapon.use()` and `monster.attack()` would."""
+        if not self.active[index]:
+            return ""
+        batch = self._batch
+        weapon = batch.weapons[index]
+        monster = batch.monsters[index]
+        return f"{self._weapon_message(index, weapon)}\n{monster.attack()}"
+
+    def messages(self) -> List[str]:
+        """Build the messages of every active pair."""
+        if self._messages is None:
+            self._messages = [self.message(int(i)) for i in np.flatnonzero(self.active)]
+        return self._messages
+
+    def _weapon_message(self, index: int, weapon: Weapon) -> str:
+        batch = self._batch
+        kind = batch.kind[index]
+        durability = int(self._durability[index])
+        enchant_text = f" [{weapon.enchantment.type.value}]" if weapon.enchantment else ""
+        if kind == SHIELD:
+            return f"🛡️  {weapon.name} blocks! (Defense: {weapon.defense}, Durability: {durability})"
+        total_damage = int(batch.total_damage[index])
+        if kind == BOW:
+            if not self.fired[index]:
+                return f"🏹 {weapon.name} has no arrows left!"
+            return f"🏹 {weapon.name}{enchant_text} shoots! {total_damage} damage. (Arrows: {int(self._arrows[index])})"
+        if self._broken_before[index]:
+            return "Weapon is broken"
+        total_durability = durability + int(batch.gem_durability[index])
+        return f"⚔️  {weapon.name}{enchant_text} deals {total_damage} damage! (Durability: {durability}/{total_durability})"
+
+
+class CombatBatch:
+    """Columnar snapshot of attacker/defender pairs.
+
+    Pair `i` is `weapons[i]` attacking `monsters[i]`. Weapons are only written
+    back when `sync()` is called, so many ticks can be resolved on arrays only.
+    """
+
+    def __init__(self, weapons: Sequence[Weapon], monsters: Sequence) -> None:
+        if len(weapons) != len(monsters):
+            raise ValueError("Each weapon needs exactly one monster to attack")
+        self.weapons = list(weapons)
+        self.monsters = list(monsters)
+        count = len(self.weapons)
+
+        self.kind = np.empty(count, dtype=np.int8)
+        self.damage = np.empty(count, dtype=np.int64)
+        self.enchantment_power = np.zeros(count, dtype=np.int64)
+        self.gem_damage = np.zeros(count, dtype=np.int64)
+        self.gem_durability = np.zeros(count, dtype=np.int64)
+        self.durability = np.empty(count, dtype=np.int64)
+        self.arrows = np.zeros(count, dtype=np.int64)
+        self.broken = np.zeros(count, dtype=bool)
+        for i, weapon in enumerate(self.weapons):
+            kind = _weapon_kind(weapon)
+            self.kind[i] = kind
+            self.damage[i] = weapon.damage
+            if weapon.enchantment:
+                self.enchantment_power[i] = weapon.enchantment.power
+            self.gem_damage[i] = sum(gem.bonus_damage for gem in weapon.gems)
+            self.gem_durability[i] = sum(gem.bonus_durability for gem in weapon.gems)
+            self.durability[i] = weapon.durability
+            if kind == BOW:
+                self.arrows[i] = weapon.arrow_count
+            elif kind == MELEE:
+                self.broken[i] = isinstance(weapon.state, WeaponBrokenState)
+        self.total_damage = self.damage + self.enchantment_power + self.gem_damage
+
+        self.hp = np.fromiter((monster.variant.hp() for monster in self.monsters), dtype=np.int64, count=count)
+        self.attack_power = np.fromiter(
+            (monster.variant.attack_power() for monster in self.monsters), dtype=np.int64, count=count
+        )
+
+    def __len__(self) -> int:
+        return len(self.weapons)
+
+    def tick(self) -> CombatRound:
+        """Resolve one swing for every pair whose monster is still alive."""
+        active = self.hp > 0
+        melee_swing = active & (self.kind == MELEE) & ~self.broken
+        bow_shot = active & (self.kind == BOW) & (self.arrows > 0)
+        shield_block = active & (self.kind == SHIELD)
+
+        self.durability -= melee_swing | bow_shot | shield_block
+        self.arrows -= bow_shot
+        newly_broken = melee_swing & (self.durability == 0)
+        self.broken |= newly_broken
+
+        fired = melee_swing | bow_shot
+        damage_dealt = np.where(fired, self.total_damage, 0)
+        self.hp -= damage_dealt
+        killed = active & (self.hp <= 0)
+        damage_received = np.where(active, self.attack_power, 0)
+        return CombatRound(self, active, fired, damage_dealt, damage_received, newly_broken, killed)
+
+    def run(self, ticks: int) -> List[CombatRound]:
+        """Resolve several ticks in a row."""
+        return [self.tick() for _ in range(ticks)]
+
+    def sync(self) -> None:
+        """Write durability, arrows and weapon states back to the weapons."""
+        for i, weapon in enumerate(self.weapons):
+            weapon.durability = int(self.durability[i])
+            kind = self.kind[i]
+            if kind == BOW:
+                weapon.arrow_count = int(self.arrows[i])
+            elif kind == MELEE and self.broken[i] != isinstance(weapon.state, WeaponBrokenState):
+                weapon.state = WeaponBrokenState() if self.broken[i] else WeaponUsableState()
+
+
+class CombatEngine:
+    """Facade resolving combat ticks for many attacker/defender pairs at once."""
+
+    @staticmethod
+    def prepare(weapons: Sequence[Weapon], monsters: Sequence) -> CombatBatch:
+        """Pack the pairs once, to resolve many ticks on arrays."""
+        return CombatBatch(weapons, monsters)
+
+    @staticmethod
+    def resolve(weapons: Sequence[Weapon], monsters: Sequence) -> CombatRound:
+        """Resolve a single tick and write the result back to the weapons."""
+        batch = CombatBatch(weapons, monsters)
+        combat_round = batch.tick()
+        batch.sync()
+        return combat_round
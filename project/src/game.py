@@ -1,75 +1,140 @@
 """Singleton Game - manages global game state."""
-from typing import Optional
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Prompt
-from rich.table import Table
-from typing import List
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
 
 from .models.player import Player
-from .patterns.demo import Demo
-from .world.map_service import MapService
-from .models.room import Room
+from .world.chunked_world import ChunkedWorld
+from .world.world_generator import WORLD_SEED
+from .server.session import GameSession
+from .simulation.scheduler import Scheduler
+from .rendering.diff_renderer import DiffRenderer
+from .rendering.output import Output, RichOutput
+
+if TYPE_CHECKING:
+    from .simulation.replay import Recorder, Recording
 
 class Game:
     """Singleton Game class managing global game state."""
     #Singleton representing the current game session.
     # private instance that stores the single Game instance
     _instance: Optional["Game"] = None
-    world: List[Room] = []
+    # Procedural world, its rooms are only loaded when the hero enters them
+    WORLD_SEED = WORLD_SEED
+    WORLD_SIZE = 1000
+    # Simulated time between two commands, 1 s
+    TICKS_PER_COMMAND = 20
     
     # private constructor that checks if an instance already exists
     # and redirect to use get_instance() method 
-    def __init__(self) -> None:
+    def __init__(self, output: Optional[Output] = None) -> None:
         """Initialize the game (do not call directly init)."""
         if Game._instance is not None:
             raise RuntimeError("Use Game.get_instance() to get the instance.")
-        self.console = Console()
+        # rich is only loaded when the game is played in a terminal
+        self.output = output if output is not None else RichOutput()
         self.player = Player()
-        #self.map = 
+        # State of the game played in the console, see GameServer to host several games
+        self.world: Optional[ChunkedWorld] = None
+        self.session: Optional[GameSession] = None
+        self.scheduler: Optional[Scheduler] = None
+        # Every game is recorded, it can be replayed exactly
+        self.recorder: Optional["Recorder"] = None
+        # Looking around again only shows what changed in the current room
+        self.renderer = DiffRenderer(self.output.write)
             
     # decorated with @classmethod which means it can be called on the class itself
     # implements the Singleton pattern
     # if no instance exists, create one and store it in _instance
     # else return the existing instance
     @classmethod
-    def get_instance(cls) -> "Game":
-        """Return the unique game instance."""
+    def get_instance(cls, output: Optional[Output] = None) -> "Game":
+        """Return the unique game instance, `output` is only used when it is created."""
         if cls._instance is None:
-            cls._instance = cls()
+            cls._instance = cls(output)
         return cls._instance
     
-    def start(self) -> None:
+    def start(self, ticks_per_command: int = TICKS_PER_COMMAND) -> None:
         """Start the game with main menu."""
-        self.console.print(Panel.fit(
-            "[bold cyan]🗡️  HYRULE LEGEND  🗡️[/bold cyan]\n"
-            "[dim]A Design Patterns Adventure[/dim]",
-            border_style="green"
-        ))
+        self.output.banner("🗡️  HYRULE LEGEND  🗡️", "A Design Patterns Adventure")
         
-        choice = Prompt.ask(
-            "\n[yellow]Menu[/yellow]",
-            choices=["start", "quit"],
-            default="start"
-        )
+        try:
+            choice = self.output.ask("\nMenu", choices=["start", "quit"], default="start")
+        except EOFError:
+            choice = "quit"
         
         if choice == "start":
-            self._start_game()
+            self._start_game(ticks_per_command)
         else:
-            self.console.print("[red]Farewell, hero![/red]")
+            self.output.print("Farewell, hero!", "red")
+
+    def demo(self) -> None:
+        """Show the design patterns demo, it loads every pattern module."""
+        from .patterns.demo import Demo
+        Demo().call_demo()
     
-    def _start_game(self) -> None:
+    def _start_game(self, ticks_per_command: int) -> None:
         """Initialize and run the game loop."""
         self.is_running = True
-        self.console.print(f"\n[green]Welcome, {self.player.name}![/green]\n")
-        # demo = Demo()
-        # demo.call_demo()
+        self.output.print(f"\nWelcome, {self.player.name}!\n", "green")
+        self.new_game(ticks_per_command)
+        self.play(self._prompt())
+
+    def new_game(self, ticks_per_command: int = TICKS_PER_COMMAND) -> None:
+        """Build the world and show the room the hero starts in.
+
+        The world, the loot and the combat draw from the seeded streams of a
+        recording, as a replay does.
+        """
         # TODO: Implement a facade for game with world building and interactions
-        self.world = MapService.build_world()
-        self.console.print("[bold magenta]Your adventure begins now...[/bold magenta]")
-        self.console.print(f"[dim]You find yourself in the {self.world[0].name}.[/dim]")
-        self.console.print(self.world[0].get_details())
-        
-       
-        
-    
+        # NumPy is only loaded once a game starts
+        from .simulation.replay import Recorder
+        self.recorder = Recorder(self.WORLD_SEED, self.WORLD_SIZE, ticks_per_command, chunk_size=16, max_chunks=64,
+                                 player=self.player)
+        self.world = self.recorder.world
+        self.session = self.recorder.session
+        # The world keeps living between commands, the scheduler advances before each one
+        self.scheduler = self.recorder.scheduler
+        self.current_room = self.session.current_room
+        self.output.print("Your adventure begins now...", "bold magenta")
+        self.output.print(f"You find yourself in the {self.current_room.name}.", "dim")
+        # The room is shown in full, the first look around shows it in full too
+        self.renderer.clear()
+        self.output.write("\n".join(self.current_room.detail_lines()) + "\n")
+
+    def _prompt(self) -> Iterator[str]:
+        while True:
+            try:
+                yield self.output.ask("\n>")
+            except EOFError:
+                return
+
+    @property
+    def recording(self) -> Optional["Recording"]:
+        """Recording of the current game."""
+        return self.recorder.recording if self.recorder is not None else None
+
+    def play(self, commands: Iterable[str]) -> None:
+        """Run commands until the game is over.
+
+        The simulation advances by the same number of ticks before each
+        command, whether the game is played in a terminal or scripted, so the
+        recording replays this very game.
+        """
+        for line in commands:
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            try:
+                lines = self.recorder.run(line.strip())
+            except ValueError as error:
+                self.output.print(str(error), "red")
+                continue
+            command = line.strip().partition(" ")[0].lower()
+            if command == "look":
+                if not self.renderer.render(self.session.current_room.key, lines):
+                    self.output.print("Nothing has changed.", "dim")
+            else:
+                if command == "go":
+                    # Only the view of the current room is kept
+                    self.renderer.clear()
+                self.output.write("\n".join(lines) + "\n")
+            if self.session.finished:
+                break
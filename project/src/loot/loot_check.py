@@ -0,0 +1,59 @@
+"""Statistical checks of the drops of a loot table.
+
+Sampled leaf counts are compared with the table probabilities with a
+chi-square goodness of fit test, and a second run with the same seed must
+give the same counts. Checks report their result instead of asserting, so
+they hold under `python -O` too.
+"""
+import math
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+
+from .loot_table import LootTable, Modifiers, make_rng
+
+# Checks fail below this p-value
+SIGNIFICANCE = 0.001
+
+
+def chi_square_p_value(observed: np.ndarray, expected: np.ndarray) -> float:
+    """p-value of a chi-square goodness of fit (Wilson-Hilferty approximation).
+
+    With fewer than two categories every sample fits, the p-value is 1.
+    """
+    freedom = len(observed) - 1
+    if freedom < 1:
+        return 1.0
+    statistic = float(((observed - expected) ** 2 / expected).sum())
+    z = ((statistic / freedom) ** (1 / 3) - (1 - 2 / (9 * freedom))) / math.sqrt(2 / (9 * freedom))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+@dataclass
+class LootCheck:
+    """Result of the checks of a table."""
+    leaves: int
+    max_deviation: float
+    p_value: float
+    problems: List[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.problems
+
+
+def check_drops(table: LootTable, seed: int, drops: int, modifiers: Optional[Modifiers] = None,
+                significance: float = SIGNIFICANCE) -> LootCheck:
+    """Sample `drops` drops and check they follow the table and the seed."""
+    leaves = table.leaves(modifiers)
+    probabilities = np.array([probability for _, probability in leaves])
+    counts = table.counts(make_rng(seed), drops, modifiers)
+    observed = np.array([counts[path] for path, _ in leaves], dtype=np.float64)
+    p_value = chi_square_p_value(observed, probabilities * drops)
+    result = LootCheck(len(leaves), float(np.abs(observed / drops - probabilities).max()), p_value)
+    if p_value <= significance:
+        result.problems.append(f"drops do not follow the table (p-value {p_value:.3g})")
+    if counts != table.counts(make_rng(seed), drops, modifiers):
+        result.problems.append("same seed, different drops")
+    return result
@@ -0,0 +1,178 @@
+"""Weighted loot tables with O(1) sampling.
+
+A loot table lists weighted entries; an entry drops an item (from a factory
+method or any callable), nothing, or rolls a nested table. Nested tables are
+flattened into their leaves when the table is built, and the leaves are
+sampled with Vose's alias method: O(n) to build, O(1) per drop.
+
+Per-room modifiers multiply the weight of the entries with a given name, at
+any depth; the modified tables are cached. Drops are drawn from a NumPy
+random generator, so a seed always gives the same loot, and millions of
+drops can be sampled in one vectorized call.
+"""
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..models.item import Item
+from ..patterns.factory.item_factory import ItemFactory, CommonItemFactory, RareItemFactory, LegendaryItemFactory
+from ..patterns.prototype.prototype_registry import clone_many
+
+Source = Union[Callable[[], Item], "LootTable", None]
+Modifiers = Mapping[str, float]
+
+
+def make_rng(seed: Optional[int] = None) -> np.random.Generator:
+    """Random generator for the drops, reproducible when a seed is given."""
+    return np.random.default_rng(seed)
+
+
+class AliasTable:
+    """Vose's alias method over a list of weights."""
+    __slots__ = ("probabilities", "aliases", "_probabilities", "_aliases")
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim != 1 or len(weights) == 0 or (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("Weights must be non-negative with a positive sum")
+        count = len(weights)
+        scaled = weights * (count / weights.sum())
+        probabilities = np.ones(count, dtype=np.float64)
+        aliases = np.arange(count, dtype=np.int64)
+        small = [i for i in range(count) if scaled[i] < 1.0]
+        large = [i for i in range(count) if scaled[i] >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            probabilities[less] = scaled[less]
+            aliases[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Leftovers only differ from 1 by rounding errors
+        self.probabilities = probabilities
+        self.aliases = aliases
+        # Python lists are faster than arrays to read one value at a time
+        self._probabilities = probabilities.tolist()
+        self._aliases = aliases.tolist()
+
+    def __len__(self) -> int:
+        return len(self._aliases)
+
+    def sample(self, rng: np.random.Generator) -> int:
+        """Draw one index."""
+        position = rng.random() * len(self._aliases)
+        # Rounding may reach the last bound
+        column = min(int(position), len(self._aliases) - 1)
+        return column if position - column < self._probabilities[column] else self._aliases[column]
+
+    def sample_many(self, rng: np.random.Generator, count: int) -> np.ndarray:
+        """Draw `count` indexes at once."""
+        positions = rng.random(count) * len(self._aliases)
+        columns = np.minimum(positions.astype(np.int64), len(self._aliases) - 1)
+        return np.where(positions - columns < self.probabilities[columns], columns, self.aliases[columns])
+
+
+class LootTable:
+    """Weighted entries `(name, weight, source)`, a source being an item maker, a nested table or None."""
+
+    def __init__(self, entries: Sequence[Tuple[str, float, Source]]) -> None:
+        if not entries:
+            raise ValueError("A loot table needs at least one entry")
+        self.entries = tuple(entries)
+        self._compiled: Dict[Tuple[Tuple[str, float], ...], "_CompiledTable"] = {}
+
+    def leaves(self, modifiers: Optional[Modifiers] = None) -> List[Tuple[str, float]]:
+        """Path and probability of every leaf, e.g. ("rare/weapon", 0.1)."""
+        compiled = self._compile(modifiers)
+        return list(zip(compiled.paths, compiled.probabilities.tolist()))
+
+    def roll(self, rng: np.random.Generator, modifiers: Optional[Modifiers] = None) -> Optional[Item]:
+        """Draw one drop, None when the drop is empty."""
+        compiled = self._compile(modifiers)
+        source = compiled.sources[compiled.alias.sample(rng)]
+        return source() if source is not None else None
+
+    def roll_leaves(self, rng: np.random.Generator, count: int, modifiers: Optional[Modifiers] = None) -> np.ndarray:
+        """Draw the leaf index of `count` drops, see `leaves()`."""
+        return self._compile(modifiers).alias.sample_many(rng, count)
+
+    def counts(self, rng: np.random.Generator, count: int, modifiers: Optional[Modifiers] = None) -> Dict[str, int]:
+        """Number of drops of every leaf among `count` drops, without creating the items."""
+        compiled = self._compile(modifiers)
+        totals = np.bincount(compiled.alias.sample_many(rng, count), minlength=len(compiled.paths))
+        return dict(zip(compiled.paths, totals.tolist()))
+
+    def roll_many(self, rng: np.random.Generator, count: int, modifiers: Optional[Modifiers] = None) -> List[Item]:
+        """Draw `count` drops and create their items, empty drops are left out.
+
+        The drops of a leaf are clones of a single item of its source.
+        """
+        compiled = self._compile(modifiers)
+        leaves = compiled.alias.sample_many(rng, count)
+        drops: List[Optional[Item]] = [None] * count
+        for leaf in np.unique(leaves).tolist():
+            source = compiled.sources[leaf]
+            if source is None:
+                continue
+            positions = np.flatnonzero(leaves == leaf).tolist()
+            prototype = source()
+            for position, item in zip(positions, [prototype] + clone_many(prototype, len(positions) - 1)):
+                drops[position] = item
+        return [item for item in drops if item is not None]
+
+    def _compile(self, modifiers: Optional[Modifiers]) -> "_CompiledTable":
+        key = tuple(sorted(modifiers.items())) if modifiers else ()
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            paths: List[str] = []
+            sources: List[Optional[Callable[[], Item]]] = []
+            probabilities: List[float] = []
+            self._flatten(modifiers or {}, "", 1.0, paths, sources, probabilities)
+            compiled = self._compiled[key] = _CompiledTable(paths, sources, probabilities)
+        return compiled
+
+    def _flatten(self, modifiers: Modifiers, prefix: str, probability: float, paths: List[str],
+                 sources: List[Optional[Callable[[], Item]]], probabilities: List[float]) -> None:
+        weights = [weight * modifiers.get(name, 1.0) for name, weight, _ in self.entries]
+        total = sum(weights)
+        if total <= 0:
+            raise ValueError("Modifiers left no entry with a positive weight")
+        for (name, _, source), weight in zip(self.entries, weights):
+            if weight <= 0:
+                continue
+            share = probability * weight / total
+            if isinstance(source, LootTable):
+                source._flatten(modifiers, f"{prefix}{name}/", share, paths, sources, probabilities)
+            else:
+                paths.append(prefix + name)
+                sources.append(source)
+                probabilities.append(share)
+
+
+class _CompiledTable:
+    """Leaves of a table for a set of modifiers, with their alias table."""
+    __slots__ = ("paths", "sources", "probabilities", "alias")
+
+    def __init__(self, paths: List[str], sources: List[Optional[Callable[[], Item]]],
+                 probabilities: List[float]) -> None:
+        self.paths = paths
+        self.sources = sources
+        self.probabilities = np.asarray(probabilities, dtype=np.float64)
+        self.alias = AliasTable(self.probabilities)
+
+
+def factory_table(factory: ItemFactory, weapon: float = 10, potion: float = 7, key: float = 3) -> LootTable:
+    """Items of a rarity factory."""
+    return LootTable([
+        ("weapon", weapon, factory.create_weapon),
+        ("potion", potion, factory.create_potion),
+        ("key", key, factory.create_key),
+    ])
+
+
+def default_loot_table() -> LootTable:
+    """Loot of the world: 70% common, 25% rare and 5% legendary items."""
+    return LootTable([
+        ("common", 70, factory_table(CommonItemFactory())),
+        ("rare", 25, factory_table(RareItemFactory())),
+        ("legendary", 5, factory_table(LegendaryItemFactory())),
+    ])
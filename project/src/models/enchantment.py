@@ -12,9 +12,12 @@ class EnchantmentType(Enum):
     DARKNESS = "darkness"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Enchantment:
-    """Enchantment that can be applied to weapons."""
+    """Enchantment that can be applied to weapons.
+
+    Frozen, since weapons cache their bonus: assign a new one to change it.
+    """
     type: EnchantmentType
     power: int
     
@@ -23,9 +26,9 @@ class Enchantment:
         return f"[{self.type.value.upper()}] +{self.power} elemental damage"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Gem:
-    """Gem that can be socketed into weapons."""
+    """Gem that can be socketed into weapons, frozen like `Enchantment`."""
     name: str
     bonus_damage: int
     bonus_durability: int
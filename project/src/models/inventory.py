@@ -0,0 +1,213 @@
+"""Inventory container indexed for constant time operations.
+
+Items are kept in a list with the position of every item, by identity, and
+indexes by name, rarity, weapon type and lock opened by keys. Removing an item moves the last item
+to its position, so every operation is O(1) but removals do not keep the
+pick-up order.
+
+Items are indexed by the name, rarity, weapon type and lock they have when
+they are added, and removed from the indexes with those same values. After
+changing one of them on a carried item, call `reindex()` to look it up by the
+new value.
+
+The best weapons by total damage are kept in heaps. Weapons notify the
+inventory when their stats change; entries of removed weapons or outdated
+stats versions are skipped when they reach the top.
+"""
+import heapq
+from itertools import count
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .item import Item, ItemRarity
+from .key import Key
+from .weapon import Weapon, WeaponType, watch_stats, unwatch_stats
+
+# (-total damage, insertion order, stats version, weapon)
+_HeapEntry = Tuple[int, int, int, Weapon]
+# (name, rarity, weapon type, lock) an item is indexed by
+_IndexKeys = Tuple[str, ItemRarity, Optional[WeaponType], Optional[str]]
+
+
+class Inventory:
+    """Items carried by a player."""
+    __slots__ = ("_items", "_positions", "_indexed", "_by_name", "_by_rarity", "_by_type", "_keys", "_heaps", "_order", "__weakref__")
+
+    def __init__(self, items: Iterable[Item] = ()) -> None:
+        self._items: List[Item] = []
+        self._positions: Dict[int, int] = {}
+        self._indexed: Dict[int, _IndexKeys] = {}
+        # Dicts keyed by item id are used as insertion ordered sets
+        self._by_name: Dict[str, Dict[int, Item]] = {}
+        self._by_rarity: Dict[ItemRarity, Dict[int, Item]] = {}
+        self._by_type: Dict[WeaponType, Dict[int, Weapon]] = {}
+        self._keys: Dict[str, Dict[int, Key]] = {}
+        # Heap of every weapon (None key) and of every weapon type
+        self._heaps: Dict[Optional[WeaponType], List[_HeapEntry]] = {None: []}
+        self._order = count()
+        for item in items:
+            self.append(item)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Item]:
+        return iter(self._items)
+
+    def __getitem__(self, index: int) -> Item:
+        return self._items[index]
+
+    def __delitem__(self, index: int) -> None:
+        self.remove(self._items[index])
+
+    def __contains__(self, value: Union[Item, str]) -> bool:
+        """Whether the item is carried, or an item of that name when given a string."""
+        if isinstance(value, str):
+            return value in self._by_name
+        return id(value) in self._positions
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Inventory):
+            return self._items == other._items
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Inventory({self._items!r})"
+
+    def __reduce__(self):
+        # Indexes are rebuilt rather than pickled
+        return Inventory, (self._items,)
+
+    def append(self, item: Item) -> None:
+        """Add an item, adding an item already carried does nothing."""
+        key = id(item)
+        if key in self._positions:
+            return
+        self._positions[key] = len(self._items)
+        self._items.append(item)
+        self._index(item)
+        if isinstance(item, Weapon):
+            watch_stats(item, self)
+            self._push(item)
+
+    add = append
+
+    def remove(self, item: Item) -> int:
+        """Remove an item, return the position it had. Raise ValueError when it is not carried."""
+        key = id(item)
+        position = self._positions.pop(key, None)
+        if position is None:
+            raise ValueError(f"{item.name} is not in the inventory")
+        last = self._items.pop()
+        if last is not item:
+            self._items[position] = last
+            self._positions[id(last)] = position
+        self._unindex(key)
+        if isinstance(item, Weapon):
+            unwatch_stats(item, self)
+        return position
+
+    def reindex(self, item: Item) -> None:
+        """Index a carried item by its current name, rarity, weapon type and lock."""
+        key = id(item)
+        if key not in self._positions:
+            raise ValueError(f"{item.name} is not in the inventory")
+        weapon_type = self._indexed[key][2]
+        self._unindex(key)
+        self._index(item)
+        if isinstance(item, Weapon) and item.weapon_type != weapon_type:
+            # Outdates the heap entries under the former type, and pushes new ones
+            item.invalidate_stats()
+
+    def index(self, item: Item) -> int:
+        """Position of a carried item. Raise ValueError when it is not carried."""
+        position = self._positions.get(id(item))
+        if position is None:
+            raise ValueError(f"{item.name} is not in the inventory")
+        return position
+
+    def named(self, name: str) -> List[Item]:
+        """Items with a name."""
+        return list(self._by_name.get(name, {}).values())
+
+    def first_named(self, name: str) -> Optional[Item]:
+        """First item picked with a name, None when there is none."""
+        items = self._by_name.get(name)
+        return next(iter(items.values())) if items else None
+
+    def has_key(self, lock: str) -> bool:
+        """Whether a carried key opens the lock."""
+        return lock in self._keys
+
+    def key_for(self, lock: str) -> Optional[Key]:
+        """First key picked opening the lock, None when there is none."""
+        keys = self._keys.get(lock)
+        return next(iter(keys.values())) if keys else None
+
+    def of_rarity(self, rarity: ItemRarity) -> List[Item]:
+        """Items of a rarity."""
+        return list(self._by_rarity.get(rarity, {}).values())
+
+    def weapons(self, weapon_type: Optional[WeaponType] = None) -> List[Weapon]:
+        """Weapons, of a type when one is given."""
+        if weapon_type is not None:
+            return list(self._by_type.get(weapon_type, {}).values())
+        return [weapon for weapons in self._by_type.values() for weapon in weapons.values()]
+
+    def best_weapon(self, weapon_type: Optional[WeaponType] = None) -> Optional[Weapon]:
+        """Weapon with the highest total damage, of a type when one is given."""
+        heap = self._heaps.get(weapon_type)
+        while heap:
+            if self._is_current(heap[0]):
+                return heap[0][3]
+            heapq.heappop(heap)
+        return None
+
+    def stats_changed(self, weapon: Weapon) -> None:
+        """Index the new total damage of a carried weapon."""
+        if id(weapon) in self._positions:
+            self._push(weapon)
+
+    def _index(self, item: Item) -> None:
+        key = id(item)
+        weapon_type = item.weapon_type if isinstance(item, Weapon) else None
+        lock = item.opens if isinstance(item, Key) else None
+        self._indexed[key] = (item.name, item.rarity, weapon_type, lock)
+        self._by_name.setdefault(item.name, {})[key] = item
+        self._by_rarity.setdefault(item.rarity, {})[key] = item
+        if weapon_type is not None:
+            self._by_type.setdefault(weapon_type, {})[key] = item
+        if lock is not None:
+            self._keys.setdefault(lock, {})[key] = item
+
+    def _unindex(self, key: int) -> None:
+        name, rarity, weapon_type, lock = self._indexed.pop(key)
+        self._discard(self._by_name, name, key)
+        self._discard(self._by_rarity, rarity, key)
+        if weapon_type is not None:
+            self._discard(self._by_type, weapon_type, key)
+        if lock is not None:
+            self._discard(self._keys, lock, key)
+
+    def _push(self, weapon: Weapon) -> None:
+        entry = (-weapon.get_total_damage(), next(self._order), weapon.stats_version, weapon)
+        for weapon_type in (None, self._indexed[id(weapon)][2]):
+            heap = self._heaps.setdefault(weapon_type, [])
+            heapq.heappush(heap, entry)
+            # Drop outdated entries once they outnumber the weapons
+            if len(heap) > 2 * len(self._items) + 16:
+                heap[:] = [current for current in heap if self._is_current(current)]
+                heapq.heapify(heap)
+
+    def _is_current(self, entry: _HeapEntry) -> bool:
+        _, _, version, weapon = entry
+        position = self._positions.get(id(weapon))
+        return position is not None and self._items[position] is weapon and version == weapon.stats_version
+
+    @staticmethod
+    def _discard(index: dict, key, item_id: int) -> None:
+        items = index[key]
+        del items[item_id]
+        if not items:
+            del index[key]
@@ -11,9 +11,12 @@ class ItemRarity(Enum):
     LEGENDARY = "legendary"
 
 
-@dataclass
+@dataclass(slots=True)
 class Item(ABC):
-    """Abstract base class for all game items."""
+    """Abstract base class for all game items.
+
+    Items are slotted: they cannot hold attributes other than their fields.
+    """
     name: str
     rarity: ItemRarity
     
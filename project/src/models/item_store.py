@@ -0,0 +1,259 @@
+"""Columnar storage for large loot tables and inventories.
+
+Item models are slotted dataclasses, which makes them smaller than instances
+carrying a `__dict__` (measured with tracemalloc on CPython 3.11):
+
+    Sword / Bow    208 -> 160 / 168 bytes
+    Potion         104 -> 64 bytes
+    Key             88 -> 48 bytes
+
+Weapons pay 56 bytes for their cached stats, the inventory watching them
+and their event bus (see `Weapon`), and a weapon only allocates a gem list
+once it has gems: a sword with one gem takes 296 bytes.
+
+`ItemStore` goes further and keeps every field in a typed `array` column.
+Names, enchantments, gem tuples and special abilities are deduplicated in
+side tables, so a stored item costs 32 bytes whatever its type. Items are
+read back through `ItemView`, a two-slot view exposing the usual `name`,
+`rarity`, `use()` and `__str__` API. Treasures found in boxes (see
+`TreasureProxy`) are stored like keys.
+"""
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .item import Item, ItemRarity
+from .enchantment import Gem
+from .key import Key
+from .potion import Potion, PotionEffect
+from .treasure import Treasure
+from .weapon import Weapon, Sword, Bow, Shield, WeaponType, WeaponBrokenState
+
+# Item kinds stored in the `kind` column
+POTION = 0
+KEY = 1
+WEAPON = 2
+SWORD = 3
+BOW = 4
+SHIELD = 5
+TREASURE = 6
+
+_RARITIES = list(ItemRarity)
+_EFFECTS = list(PotionEffect)
+_WEAPON_TYPES = list(WeaponType)
+_RARITY_CODES = {rarity: code for code, rarity in enumerate(_RARITIES)}
+_EFFECT_CODES = {effect: code for code, effect in enumerate(_EFFECTS)}
+_WEAPON_TYPE_CODES = {weapon_type: code for code, weapon_type in enumerate(_WEAPON_TYPES)}
+
+
+def item_kind(item: Item) -> int:
+    """Return the kind code of an item."""
+    if isinstance(item, Potion):
+        return POTION
+    if isinstance(item, Key):
+        return KEY
+    if isinstance(item, Treasure):
+        return TREASURE
+    if isinstance(item, Bow):
+        return BOW
+    if isinstance(item, Shield):
+        return SHIELD
+    if isinstance(item, Sword):
+        return SWORD
+    # Not the fused weapons, only registered as virtual weapons
+    if Weapon in type(item).__mro__:
+        return WEAPON
+    raise TypeError(f"Cannot store item of type {type(item).__name__}")
+
+
+class ItemView:
+    """Lightweight view over one item of an `ItemStore`."""
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: "ItemStore", index: int) -> None:
+        self._store = store
+        self._index = index
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def name(self) -> str:
+        return self._store._names[self._store.name[self._index]]
+
+    @property
+    def rarity(self) -> ItemRarity:
+        return _RARITIES[self._store.rarity[self._index]]
+
+    def materialize(self) -> Item:
+        """Build the full item model."""
+        return self._store.materialize(self._index)
+
+    def use(self) -> str:
+        """Use the item, mutable fields are written back to the store."""
+        item = self._store.materialize(self._index)
+        message = item.use()
+        self._store._write_back(self._index, item)
+        return message
+
+    def __str__(self) -> str:
+        return f"[{self.rarity.value}] {self.name}"
+
+    def __repr__(self) -> str:
+        return f"ItemView({self._index}, {self})"
+
+
+class ItemStore:
+    """Column store keeping item fields in typed arrays."""
+
+    def __init__(self, items: Optional[Iterable[Item]] = None) -> None:
+        self.kind = array("b")
+        self.name = array("I")
+        self.rarity = array("b")
+        # Potion effect or weapon type
+        self.category = array("b")
+        # Potion power or weapon damage
+        self.power = array("i")
+        self.durability = array("i")
+        # Bow arrows or shield defense
+        self.extra = array("i")
+        self.broken = array("b")
+        self.enchantment = array("I")
+        self.gems = array("I")
+        self.special_ability = array("I")
+
+        self._names: List[str] = []
+        self._name_codes: Dict[str, int] = {}
+        # Shared objects (enchantments, gem tuples, abilities), code 0 is None
+        self._objects: List[Any] = [None]
+        # Enchantments are frozen and abilities are strings, equal ones share a code
+        self._object_codes: Dict[Any, int] = {}
+        # Every weapon owns its gem list, gems are deduplicated by value
+        self._gem_codes: Dict[Tuple[Gem, ...], int] = {}
+        if items is not None:
+            self.extend(items)
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def __getitem__(self, index: int) -> ItemView:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ItemStore index out of range")
+        return ItemView(self, index)
+
+    def __iter__(self) -> Iterator[ItemView]:
+        return (ItemView(self, index) for index in range(len(self)))
+
+    def add(self, item: Item) -> ItemView:
+        """Store an item and return its view."""
+        kind = item_kind(item)
+        self.kind.append(kind)
+        self.name.append(self._name_code(item.name))
+        self.rarity.append(_RARITY_CODES[item.rarity])
+        if kind == POTION:
+            self.category.append(_EFFECT_CODES[item.effect])
+            self.power.append(item.power)
+            self.durability.append(0)
+            self.extra.append(0)
+            self.broken.append(0)
+            self.enchantment.append(0)
+            self.gems.append(0)
+            self.special_ability.append(0)
+        elif kind == KEY or kind == TREASURE:
+            self.category.append(0)
+            self.power.append(0)
+            self.durability.append(0)
+            self.extra.append(0)
+            self.broken.append(0)
+            self.enchantment.append(0)
+            self.gems.append(0)
+            self.special_ability.append(0)
+        else:
+            self.category.append(_WEAPON_TYPE_CODES[item.weapon_type])
+            self.power.append(item.damage)
+            self.durability.append(item.durability)
+            self.extra.append(item.arrow_count if kind == BOW else item.defense if kind == SHIELD else 0)
+            self.broken.append(isinstance(item.state, WeaponBrokenState))
+            self.enchantment.append(self._object_code(item.enchantment))
+            self.gems.append(self._gems_code(item.gems))
+            self.special_ability.append(self._object_code(item.special_ability))
+        return ItemView(self, len(self.kind) - 1)
+
+    def extend(self, items: Iterable[Item]) -> None:
+        """Store several items."""
+        for item in items:
+            self.add(item)
+
+    def materialize(self, index: int) -> Item:
+        """Build the full item model stored at `index`."""
+        kind = self.kind[index]
+        name = self._names[self.name[index]]
+        rarity = _RARITIES[self.rarity[index]]
+        if kind == POTION:
+            return Potion(name=name, rarity=rarity, effect=_EFFECTS[self.category[index]], power=self.power[index])
+        if kind == KEY:
+            return Key(name=name, rarity=rarity)
+        if kind == TREASURE:
+            return Treasure(name=name, rarity=rarity)
+        objects = self._objects
+        enchantment = objects[self.enchantment[index]]
+        gems = objects[self.gems[index]] or ()
+        special_ability = objects[self.special_ability[index]]
+        if kind == SHIELD:
+            weapon = Shield(name=name, durability=self.durability[index], defense=self.extra[index], rarity=rarity,
+                            enchantment=enchantment, gems=gems, special_ability=special_ability)
+        elif kind == BOW:
+            weapon = Bow(name=name, damage=self.power[index], durability=self.durability[index], rarity=rarity,
+                         enchantment=enchantment, gems=gems, special_ability=special_ability,
+                         arrow_count=self.extra[index])
+        elif kind == SWORD:
+            weapon = Sword(name=name, damage=self.power[index], durability=self.durability[index], rarity=rarity,
+                           enchantment=enchantment, gems=gems, special_ability=special_ability)
+        else:
+            weapon = Weapon(name=name, rarity=rarity, damage=self.power[index], durability=self.durability[index],
+                            weapon_type=_WEAPON_TYPES[self.category[index]], enchantment=enchantment, gems=gems,
+                            special_ability=special_ability)
+        if self.broken[index]:
+            weapon.state = WeaponBrokenState()
+        return weapon
+
+    def nbytes(self) -> int:
+        """Bytes used by the columns (side tables excluded)."""
+        columns = (self.kind, self.name, self.rarity, self.category, self.power, self.durability, self.extra,
+                   self.broken, self.enchantment, self.gems, self.special_ability)
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def _write_back(self, index: int, item: Item) -> None:
+        if isinstance(item, Weapon):
+            self.durability[index] = item.durability
+            if isinstance(item, Bow):
+                self.extra[index] = item.arrow_count
+            self.broken[index] = isinstance(item.state, WeaponBrokenState)
+
+    def _name_code(self, name: str) -> int:
+        code = self._name_codes.get(name)
+        if code is None:
+            code = self._name_codes[name] = len(self._names)
+            self._names.append(name)
+        return code
+
+    def _object_code(self, obj: Any) -> int:
+        if obj is None:
+            return 0
+        code = self._object_codes.get(obj)
+        if code is None:
+            code = self._object_codes[obj] = len(self._objects)
+            self._objects.append(obj)
+        return code
+
+    def _gems_code(self, gems: Iterable[Gem]) -> int:
+        gems = tuple(gems)
+        if not gems:
+            return 0
+        code = self._gem_codes.get(gems)
+        if code is None:
+            code = self._gem_codes[gems] = len(self._objects)
+            self._objects.append(gems)
+        return code
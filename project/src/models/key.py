@@ -4,12 +4,17 @@ from enum import Enum
 from .item import Item, ItemRarity
 
 
-@dataclass
+@dataclass(slots=True)
 class Key(Item):
     """Key item"""
     name: str
     rarity: ItemRarity
     
+    @property
+    def opens(self) -> str:
+        """Lock opened by the key, keys open the locks named after them."""
+        return self.name
+
     def use(self) -> str:
         """Use the item and return a description of the effect."""
         return f"✨ What can this {self.name} do ?"
@@ -1,31 +1,70 @@
 """Player class representing the game protagonist."""
 
 from dataclasses import dataclass, field
-from typing import List
+from typing import Optional, TYPE_CHECKING
 from .weapon import Weapon
 from .item import Item
+from .inventory import Inventory
+from ..patterns.observer.event_bus import EventBus, WEAPON_USED, ITEM_PICKED, ITEM_DROPPED
+
+if TYPE_CHECKING:
+    from ..persistence.journal import Journal
 
 @dataclass
 class Player:
     """Player class representing the game protagonist."""
     name: str = "Link"
     health: int = 100
-    inventory: List[Weapon] = field(default_factory=list)
+    inventory: Inventory = field(default_factory=Inventory)
+    # Journal recording every change of the player
+    journal: Optional["Journal"] = field(default=None, init=False, repr=False, compare=False)
+    _events: Optional[EventBus] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def events(self) -> Optional[EventBus]:
+        """Bus publishing the events of the player, and the state transitions of the carried weapons."""
+        return self._events
+
+    @events.setter
+    def events(self, events: Optional[EventBus]) -> None:
+        self._events = events
+        for item in self.inventory:
+            if isinstance(item, Weapon):
+                item.events = events
     
-    def attack(self, weapon: Weapon) -> str:
-        """Player attacks using a specified weapon."""
+    def attack(self, weapon: Weapon, bonus_damage: int = 0) -> str:
+        """Player attacks using a specified weapon, `bonus_damage` comes from buffs."""
         if weapon in self.inventory:
-            return weapon.use()
+            message = weapon.use(bonus_damage)
+            if self.journal is not None:
+                self.journal.weapon_used(self.inventory.index(weapon), weapon)
+            if self._events is not None:
+                self._events.publish(WEAPON_USED, self, weapon)
+            return message
         return f"{self.name} does not have {weapon.name} in inventory."
     
     def pick_weapon(self, weapon: Weapon) -> None:
         """Add a weapon to the player's inventory."""
+        if weapon in self.inventory:
+            return
         self.inventory.append(weapon)
+        if isinstance(weapon, Weapon):
+            weapon.events = self._events
+        if self.journal is not None:
+            self.journal.item_picked(weapon)
+        if self._events is not None:
+            self._events.publish(ITEM_PICKED, self, weapon)
 
     def drop_item(self, observable, item: Item) -> None:
         """Remove a weapon from the player's inventory."""
         if item in self.inventory:
-            self.inventory.remove(item)
+            index = self.inventory.remove(item)
+            if isinstance(item, Weapon):
+                item.events = None
+            if self.journal is not None:
+                self.journal.item_dropped(index)
+            if self._events is not None:
+                self._events.publish(ITEM_DROPPED, self, item)
     
     def get_status(self) -> str:
         """Get current status of the player."""
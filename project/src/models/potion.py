@@ -11,7 +11,7 @@ class PotionEffect(Enum):
     STRENGTH = "strength"
 
 
-@dataclass
+@dataclass(slots=True)
 class Potion(Item):
     """Potion consumable item."""
     effect: PotionEffect
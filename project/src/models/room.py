@@ -1,33 +1,134 @@
 """Room class representing game rooms."""
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union, TYPE_CHECKING
 from .monster import Monster
 from .item import Item
+from ..patterns.observer.event_bus import EventBus, ROOM_ITEM_ADDED, ROOM_ITEM_REMOVED, ROOM_MONSTER_ADDED, ROOM_MONSTER_REMOVED
+
+if TYPE_CHECKING:
+    from ..persistence.journal import Journal
+    from ..world.world_graph import WorldGraph
+
+class RoomRef:
+    """Lightweight reference to a room which is not loaded, resolved on demand.
+
+    `key` identifies the room for its resolver: its position in a procedural
+    world, its index in a snapshot.
+    """
+    __slots__ = ("name", "key", "_resolver")
+
+    def __init__(self, name: str, key: Hashable, resolver: Callable[[Any], "Room"]) -> None:
+        self.name = name
+        self.key = key
+        self._resolver = resolver
+
+    def resolve(self) -> "Room":
+        """Return the referenced room."""
+        return self._resolver(self.key)
+
+    def __repr__(self) -> str:
+        return f"RoomRef({self.name!r}, {self.key!r})"
 
 @dataclass
 class Room:
-    """Room class representing game rooms."""
+    """Room class representing game rooms.
+
+    The description is cached until the content changes: the methods below
+    bump the version of the room, code changing `items`, `monsters` or
+    `connections` directly must call `touch()`.
+    """
     name: str
     items: List[Item] 
     monsters: List[Monster] 
-    connections: Dict[str, "Room"] = field(default_factory=dict)
+    connections: Dict[str, Union["Room", RoomRef]] = field(default_factory=dict)
+    # (x, y) position of procedurally generated rooms
+    position: Optional[Tuple[int, int]] = None
+    # World graph indexing this room, kept up to date on every connect()
+    graph: Optional["WorldGraph"] = field(default=None, init=False, repr=False, compare=False)
+    # Journal recording the changes of the room content
+    journal: Optional["Journal"] = field(default=None, init=False, repr=False, compare=False)
+    # Bus publishing the changes of the room content
+    events: Optional[EventBus] = field(default=None, init=False, repr=False, compare=False)
+    version: int = field(default=0, init=False, repr=False, compare=False)
+    # (version, lines, text) of the last description, the text is joined on demand
+    _details: Optional[list] = field(default=None, init=False, repr=False, compare=False)
+
+    def touch(self) -> None:
+        """Mark the content as changed."""
+        self.version += 1
     
-    def connect(self, direction: str, room: "Room") -> None:
+    def connect(self, direction: str, room: Union["Room", RoomRef]) -> None:
         """Connect this room to another room in a given direction."""
         self.connections[direction] = room
+        self.version += 1
+        if self.graph is not None:
+            self.graph.on_connect(self)
+
+    @property
+    def key(self):
+        """Identifier of the room in its world: its position, or its name for hand-made rooms."""
+        return self.position if self.position is not None else self.name
+
+    def add_item(self, item: Item) -> None:
+        """Drop an item in the room."""
+        self.items.append(item)
+        self.version += 1
+        if self.journal is not None:
+            self.journal.room_item_added(self, item)
+        if self.events is not None:
+            self.events.publish(ROOM_ITEM_ADDED, self, item)
+
+    def remove_item(self, item: Item) -> None:
+        """Take an item from the room."""
+        index = self.items.index(item)
+        del self.items[index]
+        self.version += 1
+        if self.journal is not None:
+            self.journal.room_item_removed(self, index)
+        if self.events is not None:
+            self.events.publish(ROOM_ITEM_REMOVED, self, item)
+
+    def add_monster(self, monster: Monster) -> None:
+        """Spawn a monster in the room."""
+        self.monsters.append(monster)
+        self.version += 1
+        if self.journal is not None:
+            self.journal.room_monster_added(self, monster)
+        if self.events is not None:
+            self.events.publish(ROOM_MONSTER_ADDED, self, monster)
+
+    def remove_monster(self, monster: Monster) -> None:
+        """Remove a defeated monster from the room."""
+        index = next(i for i, other in enumerate(self.monsters) if other is monster)
+        del self.monsters[index]
+        self.version += 1
+        if self.journal is not None:
+            self.journal.room_monster_removed(self, index)
+        if self.events is not None:
+            self.events.publish(ROOM_MONSTER_REMOVED, self, monster)
     
-    def get_details(self) -> str:
-        """Get detailed description of the room."""
-        details = f"🏰  {self.name}\n"
+    def detail_lines(self) -> Tuple[str, ...]:
+        """Lines of the description, rebuilt only when the room changed."""
+        cached = self._details
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+        lines = [f"🏰  {self.name}"]
         if self.items:
-            details += "Items in the room:\n"
-            for item in self.items:
-                details += f" - {item}\n"
+            lines.append("Items in the room:")
+            lines.extend([f" - {item}" for item in self.items])
         if self.monsters:
-            details += "Monsters in the room:\n"
-            for monster in self.monsters:
-                details += f" - {monster.get_stats()}\n"
-        details += "Connections:\n"
-        for direction, room in self.connections.items():
-            details += f" - {direction}: {room.name}\n"
-        return details
\ No newline at end of file
+            lines.append("Monsters in the room:")
+            lines.extend([f" - {monster.get_stats()}" for monster in self.monsters])
+        lines.append("Connections:")
+        lines.extend([f" - {direction}: {room.name}" for direction, room in self.connections.items()])
+        lines = tuple(lines)
+        self._details = [self.version, lines, None]
+        return lines
+
+    def get_details(self) -> str:
+        """Get detailed description of the room."""
+        lines = self.detail_lines()
+        cached = self._details
+        if cached[2] is None:
+            cached[2] = "\n".join(lines) + "\n"
+        return cached[2]
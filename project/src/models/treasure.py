@@ -0,0 +1,13 @@
+"""Treasure item found in the boxes of the game."""
+from dataclasses import dataclass
+
+from .item import Item, ItemRarity
+
+
+@dataclass(slots=True)
+class Treasure(Item):
+    """Treasure only known by its name, found in a box described by a string."""
+    rarity: ItemRarity = ItemRarity.COMMON
+
+    def use(self) -> str:
+        return f"💰 {self.name} is worth keeping."
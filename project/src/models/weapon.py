@@ -1,9 +1,26 @@
 """Weapon types and classes."""
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from enum import Enum
-from typing import Optional, List
+from itertools import count
+from typing import Any, Callable, Dict, Iterable, Optional, List, Tuple
+from weakref import ref
 from .item import Item, ItemRarity
 from .enchantment import Enchantment, Gem
+from ..patterns.observer.event_bus import EventBus, WEAPON_BROKEN, WEAPON_REPAIRED
+
+# Stamps marking a change of the stats a weapon derives its totals from
+_stats_versions = count(1)
+
+
+def watch_stats(weapon: "Weapon", watcher: Any) -> None:
+    """Call `watcher.stats_changed(weapon)` whenever the stats of the weapon change."""
+    weapon.watch_stats(watcher)
+
+
+def unwatch_stats(weapon: "Weapon", watcher: Any) -> None:
+    """Stop notifying a watcher of the weapon."""
+    weapon.unwatch_stats(watcher)
+
 
 class WeaponType(Enum):
     """Types of weapons available."""
@@ -12,78 +29,295 @@ class WeaponType(Enum):
     SHIELD = "shield"
 
 class WeaponState:
-    def use(self) -> str:
+    __slots__ = ()
+
+    # States hold no data, two states of the same class are interchangeable
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other)
+
+    def __hash__(self) -> int:
+        return hash(type(self))
+
+    def use(self, weapon: "Weapon", bonus_damage: int = 0) -> str:
        pass
 
 #TODO: Have a medium state where weapon is damaged and deals less damage and breaks faster
 class WeaponUsableState(WeaponState):
-    def use(self) -> str:
+    __slots__ = ()
+
+    def use(self, weapon: "Weapon", bonus_damage: int = 0) -> str:
         """Attack with the weapon."""
-        self.durability -= 1
-        enchant_text = f" [{self.enchantment.type.value}]" if self.enchantment else ""
-        if self.durability == 0:
-            self.state = WeaponBrokenState()
-        else:
-            return f"⚔️  {self.name}{enchant_text} deals {self.get_total_damage()} damage! (Durability: {self.durability}/{self.get_total_durability()})"
+        weapon.durability -= 1
+        enchant_text = f" [{weapon.enchantment.type.value}]" if weapon.enchantment else ""
+        message = f"⚔️  {weapon.name}{enchant_text} deals {weapon.get_total_damage() + bonus_damage} damage! (Durability: {weapon.durability}/{weapon.get_total_durability()})"
+        if weapon.durability == 0:
+            weapon.state = WeaponBrokenState()
+        return message
     
 class WeaponBrokenState(WeaponState):
-    def use(self):
+    __slots__ = ()
+
+    def use(self, weapon: "Weapon", bonus_damage: int = 0) -> str:
         return "Weapon is broken"
 
-@dataclass
+class GemList(list):
+    """Gems socketed into a weapon, changing the list invalidates the stats of the weapon.
+
+    A weapon without gems stores the shared empty tuple instead of a list,
+    reading its `gems` returns a new empty `GemList` which the weapon adopts
+    once a gem is added to it.
+    """
+    __slots__ = ("weapon",)
+
+    def __init__(self, gems: Iterable[Gem] = (), weapon: Optional["Weapon"] = None) -> None:
+        super().__init__(gems)
+        self.weapon = weapon
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Copied and pickled as a plain list, bound again when assigned to a weapon
+        return list, (list(self),)
+
+
+def _invalidating(name: str) -> Callable[..., Any]:
+    method = getattr(list, name)
+
+    def mutate(self: GemList, *args: Any, **kwargs: Any) -> Any:
+        result = method(self, *args, **kwargs)
+        weapon = self.weapon
+        if weapon is not None:
+            # The weapon holds the list while it has gems, the shared empty tuple otherwise
+            _gems_slot.__set__(weapon, self if self else ())
+            weapon.invalidate_stats()
+        return result
+    mutate.__name__ = name
+    return mutate
+
+
+for _name in ("append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse",
+              "__setitem__", "__delitem__", "__iadd__", "__imul__"):
+    setattr(GemList, _name, _invalidating(_name))
+
+
+class StateSlot(property):
+    """Slot of the weapon state, a transition between usable and broken is published.
+
+    The event (`WEAPON_BROKEN` or `WEAPON_REPAIRED`) has the weapon as source
+    and the new state as value, it is published on the bus of the weapon when
+    it has one. `slot` is the underlying slot.
+    """
+
+    def __init__(self, slot: Any) -> None:
+        def transition(weapon: "Weapon", state: "WeaponState") -> None:
+            events = weapon.events
+            if events is not None:
+                broken = isinstance(state, WeaponBrokenState)
+                if broken != isinstance(slot.__get__(weapon), WeaponBrokenState):
+                    events.publish(WEAPON_BROKEN if broken else WEAPON_REPAIRED, weapon, state)
+            slot.__set__(weapon, state)
+        super().__init__(slot.__get__, transition)
+        self.slot = slot
+
+
+class StatSlot(property):
+    """Slot of a weapon stat, assigning it stamps a new stats version.
+
+    Installed over the slots of `damage`, `enchantment` and `gems` only, so
+    other writes such as `durability -= 1` stay plain slot writes, and reads
+    go straight to the slot. `slot` is the underlying slot, to copy a value
+    without stamping it. `convert(weapon, value)` builds the stored value,
+    `read(weapon)` the value returned from it.
+    """
+
+    def __init__(self, slot: Any, convert: Optional[Callable[[Any, Any], Any]] = None,
+                 read: Optional[Callable[[Any], Any]] = None) -> None:
+        def stamp(weapon: "Weapon", value: Any) -> None:
+            slot.__set__(weapon, value if convert is None else convert(weapon, value))
+            weapon.invalidate_stats()
+        super().__init__(slot.__get__ if read is None else read, stamp)
+        self.slot = slot
+        self.convert = convert
+
+
+@dataclass(slots=True)
 class Weapon(Item):
-    """Base weapon class."""
+    """Base weapon class.
+
+    Bonuses from the enchantment and the gems are cached, assigning `damage`,
+    `enchantment` or `gems` stamps a new stats version which invalidates them.
+    A weapon being built writes the slots directly and is stamped once, when
+    its fields are all set.
+    `gems` is a `GemList` owned by the weapon, changing it in place stamps a
+    new version too; it is only allocated once the weapon has gems. Gems and enchantments are frozen, replace them to change
+    a bonus.
+    """
     damage: int
     durability: int
     state: WeaponState = WeaponUsableState()
     weapon_type: WeaponType = WeaponType.SWORD
     enchantment: Optional[Enchantment] = None
-    gems: List[Gem] = field(default_factory=list)
+    gems: List[Gem] = ()
     special_ability: Optional[str] = None
-    
-    def get_total_damage(self) -> int:
-        """Calculate total damage including bonuses."""
+    _stats_version: int = field(default=0, init=False, repr=False, compare=False)
+    # Container indexing the weapon by its stats (an Inventory), weakly referenced.
+    # Copies and pickles of the weapon are not watched
+    _stats_watcher: Optional["ref[Any]"] = field(default=None, init=False, repr=False, compare=False)
+    # Bus publishing the state transitions of the weapon, the one of the player carrying it
+    events: Optional[EventBus] = field(default=None, init=False, repr=False, compare=False)
+    _cached_version: int = field(default=-1, init=False, repr=False, compare=False)
+    _total_damage: int = field(default=0, init=False, repr=False, compare=False)
+    _bonus_durability: int = field(default=0, init=False, repr=False, compare=False)
+    # (state of the weapon it describes, text) of the last full description
+    _description: Optional[Tuple[tuple, str]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __init__(
+        self,
+        name: str,
+        rarity: ItemRarity,
+        damage: int,
+        durability: int,
+        state: WeaponState = WeaponUsableState(),
+        weapon_type: WeaponType = WeaponType.SWORD,
+        enchantment: Optional[Enchantment] = None,
+        gems: List[Gem] = (),
+        special_ability: Optional[str] = None
+    ):
+        self.name = name
+        self.rarity = rarity
+        self.events = None
+        # The stats slots are written directly, the weapon is stamped once below
+        _damage_slot.__set__(self, damage)
+        self.durability = durability
+        _state_slot.__set__(self, state)
+        self.weapon_type = weapon_type
+        _enchantment_slot.__set__(self, enchantment)
+        _gems_slot.__set__(self, GemList(gems, self) if gems else ())
+        self.special_ability = special_ability
+        self._stats_watcher = None
+        self._cached_version = -1
+        self._total_damage = 0
+        self._bonus_durability = 0
+        self._description = None
+        self._stats_version = next(_stats_versions)
+
+    def __getstate__(self) -> Tuple[None, Dict[str, Any]]:
+        # A weak reference cannot be pickled, and the copy is neither in the container nor on the bus.
+        # Set first, restoring the stats stamps the copy
+        state: Dict[str, Any] = {"_stats_watcher": None, "events": None}
+        state.update((item.name, getattr(self, item.name)) for item in fields(self) if item.name not in state)
+        return None, state
+
+    @property
+    def stats_version(self) -> int:
+        """Version of the stats, changes whenever the bonuses must be recomputed."""
+        return self._stats_version
+
+    def watch_stats(self, watcher: Any) -> None:
+        """Call `watcher.stats_changed(self)` whenever the stats change."""
+        self._stats_watcher = ref(watcher)
+
+    def unwatch_stats(self, watcher: Any) -> None:
+        """Stop notifying a watcher."""
+        current = self._stats_watcher
+        if current is not None and (current() is watcher or current() is None):
+            self._stats_watcher = None
+
+    def invalidate_stats(self) -> None:
+        """Force the cached bonuses to be recomputed."""
+        self._stats_version = next(_stats_versions)
+        current = self._stats_watcher
+        if current is not None:
+            watcher = current()
+            if watcher is not None:
+                watcher.stats_changed(self)
+            else:
+                # Left behind by a dropped inventory
+                self._stats_watcher = None
+
+    def add_gem(self, gem: Gem) -> None:
+        """Socket a gem into the weapon."""
+        self.gems.append(gem)
+
+    def remove_gem(self, gem: Gem) -> None:
+        """Remove a socketed gem from the weapon."""
+        self.gems.remove(gem)
+
+    def _refresh_stats(self) -> None:
         total = self.damage
         if self.enchantment:
             total += self.enchantment.power
-        for gem in self.gems:
+        bonus_durability = 0
+        for gem in _gems_slot.__get__(self):
             total += gem.bonus_damage
-        return total
+            bonus_durability += gem.bonus_durability
+        self._total_damage = total
+        self._bonus_durability = bonus_durability
+        self._cached_version = self._stats_version
+    
+    def get_total_damage(self) -> int:
+        """Calculate total damage including bonuses."""
+        if self._cached_version != self._stats_version:
+            self._refresh_stats()
+        return self._total_damage
     
     def get_total_durability(self) -> int:
         """Calculate total durability including bonuses."""
-        total = self.durability
-        for gem in self.gems:
-            total += gem.bonus_durability
-        return total
+        if self._cached_version != self._stats_version:
+            self._refresh_stats()
+        return self.durability + self._bonus_durability
     
-    def use(self):
-        return self.state.use(self,)
+    def use(self, bonus_damage: int = 0) -> str:
+        """Use the weapon, `bonus_damage` is added by fusions (see `WeaponDecorator`)."""
+        return self.state.use(self, bonus_damage)
     
-    def get_full_description(self) -> str:
-        """Get detailed weapon description."""
+    def get_full_description(self, bonus_damage: int = 0) -> str:
+        """Get detailed weapon description, rebuilt only when the weapon changed."""
+        key = (self._stats_version, self.durability, self.name, self.rarity, self.special_ability, bonus_damage)
+        cached = self._description
+        if cached is not None and cached[0] == key:
+            return cached[1]
         lines = [
             f"🗡️  {self.name}",
             f"   Rarity: {self.rarity.value}",
-            f"   Damage: {self.get_total_damage()} (Base: {self.damage})",
+            f"   Damage: {self.get_total_damage() + bonus_damage} (Base: {self.damage})",
             f"   Durability: {self.get_total_durability()}"
         ]
         
         if self.enchantment:
             lines.append(f"   ✨ {self.enchantment.get_description()}")
         
-        if self.gems:
+        gems = _gems_slot.__get__(self)
+        if gems:
             lines.append(f"   💎 Gems:")
-            for gem in self.gems:
+            for gem in gems:
                 lines.append(f"      • {gem.get_description()}")
         
         if self.special_ability:
             lines.append(f"   🌟 Special: {self.special_ability}")
         
-        return "\n".join(lines)
+        description = "\n".join(lines)
+        self._description = (key, description)
+        return description
 
 
-@dataclass
+
+_damage_slot = Weapon.damage
+_enchantment_slot = Weapon.enchantment
+_gems_slot = Weapon.gems
+_state_slot = Weapon.state
+Weapon.state = StateSlot(_state_slot)
+Weapon.damage = StatSlot(_damage_slot)
+Weapon.enchantment = StatSlot(_enchantment_slot)
+
+
+def _read_gems(weapon: Weapon) -> GemList:
+    gems = _gems_slot.__get__(weapon)
+    return gems if gems else GemList((), weapon)
+
+
+Weapon.gems = StatSlot(_gems_slot, lambda weapon, gems: GemList(gems, weapon) if gems else (), _read_gems)
+
+
+@dataclass(slots=True)
 class Sword(Weapon):
     """Sword weapon type."""
     
@@ -97,19 +331,20 @@ class Sword(Weapon):
         gems: Optional[List[Gem]] = None,
         special_ability: Optional[str] = None
     ):
-        super().__init__(
+        Weapon.__init__(
+            self,
             name=name,
             rarity=rarity,
             damage=damage,
             durability=durability,
             weapon_type=WeaponType.SWORD,
             enchantment=enchantment,
-            gems=gems or [],
+            gems=gems or (),
             special_ability=special_ability
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Bow(Weapon):
     """Bow weapon type."""
     arrow_count: int = 30
@@ -122,30 +357,33 @@ class Bow(Weapon):
         rarity: ItemRarity,
         enchantment: Optional[Enchantment] = None,
         gems: Optional[List[Gem]] = None,
-        special_ability: Optional[str] = None
+        special_ability: Optional[str] = None,
+        arrow_count: int = 30
     ):
-        super().__init__(
+        Weapon.__init__(
+            self,
             name=name,
             rarity=rarity,
             damage=damage,
             durability=durability,
             weapon_type=WeaponType.BOW,
             enchantment=enchantment,
-            gems=gems or [],
+            gems=gems or (),
             special_ability=special_ability
         )
+        self.arrow_count = arrow_count
     
-    def use(self) -> str:
+    def use(self, bonus_damage: int = 0) -> str:
         """Shoot an arrow."""
         if self.arrow_count <= 0:
             return f"🏹 {self.name} has no arrows left!"
         self.arrow_count -= 1
         self.durability -= 1
         enchant_text = f" [{self.enchantment.type.value}]" if self.enchantment else ""
-        return f"🏹 {self.name}{enchant_text} shoots! {self.get_total_damage()} damage. (Arrows: {self.arrow_count})"
+        return f"🏹 {self.name}{enchant_text} shoots! {self.get_total_damage() + bonus_damage} damage. (Arrows: {self.arrow_count})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Shield(Weapon):
     """Shield weapon type."""
     defense: int = 0
@@ -160,19 +398,20 @@ class Shield(Weapon):
         gems: Optional[List[Gem]] = None,
         special_ability: Optional[str] = None
     ):
-        super().__init__(
+        Weapon.__init__(
+            self,
             name=name,
             rarity=rarity,
             damage=0,
             durability=durability,
             weapon_type=WeaponType.SHIELD,
             enchantment=enchantment,
-            gems=gems or [],
+            gems=gems or (),
             special_ability=special_ability
         )
         self.defense = defense
     
-    def use(self) -> str:
-        """Block with the shield."""
+    def use(self, bonus_damage: int = 0) -> str:
+        """Block with the shield, it deals no damage."""
         self.durability -= 1
         return f"🛡️  {self.name} blocks! (Defense: {self.defense}, Durability: {self.durability})"
\ No newline at end of file
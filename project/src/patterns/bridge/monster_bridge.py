@@ -10,6 +10,8 @@ Without bridge pattern, we would need to create a class for each combination of
 from .monster_variant import MonsterVariant
 
 class Monster:
+    __slots__ = ("name", "variant")
+
     def __init__(self, name: str, variant: MonsterVariant):
         self.name = name
         self.variant = variant
@@ -21,13 +23,19 @@ class Monster:
         return f"{self.name} ({self.variant.color}) - HP: {self.variant.hp()}"
 
 class Bokoblin(Monster):
+    __slots__ = ()
+
     def __init__(self, variant: MonsterVariant):
         super().__init__("Bokoblin", variant)
 
 class Moblin(Monster):
+    __slots__ = ()
+
     def __init__(self, variant: MonsterVariant):
         super().__init__("Moblin", variant)
 
 class Hinox(Monster):
+    __slots__ = ()
+
     def __init__(self, variant: MonsterVariant):
         super().__init__("Hinox", variant)
@@ -3,27 +3,40 @@ from abc import ABC, abstractmethod
 
 Each variant defines specific attributes and behaviors for monsters.
 They are more or less powerfull and resistant depending on their color.
+
+Variants hold no per-monster state, so they are immutable and meant to be
+shared between monsters (see patterns/flyweight/monster_flyweight.py).
 """
 class MonsterVariant(ABC):
+    __slots__ = ("color",)
+
     def __init__(self, color: str):
         self.color = color
 
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError(f"{type(self).__name__} is immutable")
+        super().__setattr__(name, value)
+
     @abstractmethod
     def hp(self) -> int: ...
     @abstractmethod
     def attack_power(self) -> int: ...
 
 class RedVariant(MonsterVariant):
+    __slots__ = ()
     def __init__(self): super().__init__("red")
     def hp(self): return 50
     def attack_power(self): return 10
 
 class BlueVariant(MonsterVariant):
+    __slots__ = ()
     def __init__(self): super().__init__("blue")
     def hp(self): return 15
     def attack_power(self): return 50
 
 class WhiteVariant(MonsterVariant):
+    __slots__ = ()
     def __init__(self): super().__init__("white")
     def hp(self): return 120
     def attack_power(self): return 25
@@ -1,8 +1,12 @@
 """Builder pattern for creating complex map with rooms."""
-from typing import List, Optional
+from typing import TYPE_CHECKING, Iterator, List, Optional
 from ...models.room import Room
 from ...models.monster import Monster
 from ...models.item import Item
+from ...world.world_generator import WorldGenerator
+
+if TYPE_CHECKING:
+    from ...world.world_graph import WorldGraph
 
 class MapBuilder:
     """Builder for creating complex map with rooms step by step."""
@@ -21,6 +25,26 @@ class MapBuilder:
         room1.connect(direction, room2)
         return self
     
+    def generate(self, seed: int, width: int, height: int) -> Iterator[Room]:
+        """Stream a procedural world of width x height connected rooms.
+
+        Rooms are not kept by the builder and reference their neighbours
+        lazily, so huge worlds can be consumed in bounded memory. The same
+        seed always gives the same world.
+        """
+        return WorldGenerator(seed, width, height).rooms()
+
+    def add_generated(self, seed: int, width: int, height: int) -> 'MapBuilder':
+        """Add a procedural world to the map, its rooms directly connected."""
+        self._rooms.extend(WorldGenerator(seed, width, height).build())
+        return self
+
     def build(self) -> List[Room]:
         """Build and return the list of rooms in the map."""
-        return self._rooms
\ No newline at end of file
+        return self._rooms
+
+    def build_graph(self) -> "WorldGraph":
+        """Build the map and index it for pathfinding."""
+        # NumPy is only loaded by the maps indexed for pathfinding
+        from ...world.world_graph import WorldGraph
+        return WorldGraph.from_rooms(self._rooms)
\ No newline at end of file
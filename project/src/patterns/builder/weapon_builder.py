@@ -1,10 +1,60 @@
-"""Builder pattern for creating complex weapons."""
-from typing import Optional, List
+"""Builder pattern for creating complex weapons.
+
+A recipe set up on the builder can be compiled into an immutable
+`WeaponSpec`. The spec is validated once, weapons are then built from it
+(`build`, `build_many`), sharing their frozen gems and enchantment, instead
+of going through the builder again. Building a weapon writes its slots
+directly, which is cheaper than cloning a prototype of it. Directors
+compile their recipe on first use, unless they are given a builder to use.
+"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import ClassVar, Optional, List, Tuple, Type
 from ...models.weapon import Weapon, Sword, Bow, Shield
 from ...models.item import ItemRarity
 from ...models.enchantment import Enchantment, Gem, EnchantmentType
 
 
+@dataclass(frozen=True, slots=True)
+class WeaponSpec:
+    """Compiled weapon recipe."""
+    weapon_class: Type[Weapon]
+    name: str
+    damage: int
+    durability: int
+    rarity: ItemRarity
+    enchantment: Optional[Enchantment] = None
+    gems: Tuple[Gem, ...] = ()
+    special_ability: Optional[str] = None
+    defense: int = 0
+
+    def __post_init__(self) -> None:
+        if not issubclass(self.weapon_class, (Sword, Bow, Shield)):
+            raise ValueError(f"Cannot build a {self.weapon_class.__name__}")
+        _check(self.name, self.damage, self.durability, self.defense)
+
+
+def _check(name: Optional[str], damage: int, durability: int, defense: int = 0) -> None:
+    if not name:
+        raise ValueError("Weapon name is required")
+    if damage < 0 or durability <= 0 or defense < 0:
+        raise ValueError("Damage and defense must not be negative, durability must be positive")
+
+
+def build(spec: WeaponSpec) -> Weapon:
+    """Create a weapon from a compiled recipe."""
+    if spec.weapon_class is Shield:
+        return Shield(name=spec.name, durability=spec.durability, defense=spec.defense, rarity=spec.rarity,
+                      enchantment=spec.enchantment, gems=spec.gems, special_ability=spec.special_ability)
+    return spec.weapon_class(name=spec.name, damage=spec.damage, durability=spec.durability, rarity=spec.rarity,
+                             enchantment=spec.enchantment, gems=spec.gems, special_ability=spec.special_ability)
+
+
+def build_many(spec: WeaponSpec, count: int) -> List[Weapon]:
+    """Create `count` weapons from a compiled recipe."""
+    return [build(spec) for _ in range(count)]
+
+
 class WeaponBuilder:
     """Builder for creating complex weapons step by step."""
     
@@ -53,45 +103,56 @@ class WeaponBuilder:
         self._special_ability = ability
         return self
     
+    def compile(self, weapon_class: Type[Weapon], defense: int = 0) -> WeaponSpec:
+        """Compile the current configuration into an immutable recipe."""
+        return WeaponSpec(
+            weapon_class=weapon_class,
+            name=self._name,
+            damage=0 if weapon_class is Shield else self._damage,
+            durability=self._durability,
+            rarity=self._rarity,
+            enchantment=self._enchantment,
+            gems=tuple(self._gems),
+            special_ability=self._special_ability,
+            defense=defense
+        )
+
     def build_sword(self) -> Sword:
         """Build a sword with current configuration."""
-        if not self._name:
-            raise ValueError("Weapon name is required")
+        _check(self._name, self._damage, self._durability)
         return Sword(
             name=self._name,
             damage=self._damage,
             durability=self._durability,
             rarity=self._rarity,
             enchantment=self._enchantment,
-            gems=self._gems.copy(),
+            gems=self._gems,
             special_ability=self._special_ability
         )
     
     def build_bow(self) -> Bow:
         """Build a bow with current configuration."""
-        if not self._name:
-            raise ValueError("Weapon name is required")
+        _check(self._name, self._damage, self._durability)
         return Bow(
             name=self._name,
             damage=self._damage,
             durability=self._durability,
             rarity=self._rarity,
             enchantment=self._enchantment,
-            gems=self._gems.copy(),
+            gems=self._gems,
             special_ability=self._special_ability
         )
     
     def build_shield(self, defense: int) -> Shield:
         """Build a shield with current configuration."""
-        if not self._name:
-            raise ValueError("Weapon name is required")
+        _check(self._name, 0, self._durability, defense)
         return Shield(
             name=self._name,
             durability=self._durability,
             defense=defense,
             rarity=self._rarity,
             enchantment=self._enchantment,
-            gems=self._gems.copy(),
+            gems=self._gems,
             special_ability=self._special_ability
         )
     
@@ -101,12 +162,51 @@ class WeaponBuilder:
         return self
 
 
-class MasterSwordDirector:
+class WeaponDirector(ABC):
+    """Director building a weapon from a recipe compiled on first use.
+
+    Directors are used through their class, a director whose recipe is still
+    abstract cannot construct weapons. The compiled recipe is cached on the
+    class; a builder given to `spec` or `construct` compiles the recipe again
+    with that builder, without touching the cache.
+    """
+    _spec: ClassVar[Optional[WeaponSpec]] = None
+
+    @staticmethod
+    @abstractmethod
+    def recipe(builder: WeaponBuilder) -> WeaponSpec:
+        """Configure the builder and compile the recipe."""
+
+    @classmethod
+    def spec(cls, builder: Optional[WeaponBuilder] = None) -> WeaponSpec:
+        """Compiled recipe of the director, compiled with `builder` when one is given."""
+        if cls.__abstractmethods__:
+            raise TypeError(f"{cls.__name__} has no recipe")
+        if builder is not None:
+            return cls.recipe(builder)
+        # Looked up on the class itself, a subclass must not reuse the spec of its parent
+        spec = cls.__dict__.get("_spec")
+        if spec is None:
+            spec = cls._spec = cls.recipe(WeaponBuilder())
+        return spec
+
+    @classmethod
+    def construct(cls, builder: Optional[WeaponBuilder] = None) -> Weapon:
+        """Construct the weapon, with the recipe compiled by `builder` when one is given."""
+        return build(cls.spec(builder))
+
+    @classmethod
+    def construct_many(cls, count: int) -> List[Weapon]:
+        """Construct `count` weapons at once."""
+        return build_many(cls.spec(), count)
+
+
+class MasterSwordDirector(WeaponDirector):
     """Director for building the legendary Master Blade."""
     
     @staticmethod
-    def construct(builder: WeaponBuilder) -> Sword:
-        """Construct the Master Blade using the builder."""
+    def recipe(builder: WeaponBuilder) -> WeaponSpec:
+        """Recipe of the Master Blade."""
         ruby = Gem(name="Ruby", bonus_damage=15, bonus_durability=10)
         sapphire = Gem(name="Sapphire", bonus_damage=10, bonus_durability=20)
         
@@ -119,15 +219,15 @@ class MasterSwordDirector:
                 .add_gem(ruby)
                 .add_gem(sapphire)
                 .set_special_ability("Shoots beams at full health")
-                .build_sword())
+                .compile(Sword))
 
 
-class AncientBowDirector:
+class AncientBowDirector(WeaponDirector):
     """Director for building the Ancient Bow."""
     
     @staticmethod
-    def construct(builder: WeaponBuilder) -> Bow:
-        """Construct the Ancient Bow using the builder."""
+    def recipe(builder: WeaponBuilder) -> WeaponSpec:
+        """Recipe of the Ancient Bow."""
         diamond = Gem(name="Diamond", bonus_damage=20, bonus_durability=15)
         
         return (builder
@@ -138,4 +238,4 @@ class AncientBowDirector:
                 .add_enchantment(EnchantmentType.LIGHTNING, 25)
                 .add_gem(diamond)
                 .set_special_ability("Infinite arrows when charged")
-                .build_bow())
\ No newline at end of file
+                .compile(Bow))
\ No newline at end of file
@@ -1,14 +1,163 @@
-#TODO: implement with real monster entity 
-class Entity:
-    def attack(self): pass
-
-class Monster(Entity):
-    def __init__(self, name): self.name = name
-    def attack(self): print(f"{self.name} attack !")
-
-class Group(Entity):
-    def __init__(self): self.members = []
-    def add(self, entity): self.members.append(entity)
-    def attack(self):
-        for e in self.members:
-            e.attack()
+"""Composite pattern for groups of monsters.
+
+An `EnemyGroup` is a monster party made of monsters and of other groups. The
+group does not keep a tree of its subgroups: their members are merged into
+flat NumPy columns (hp, max hp, attack power), so the damage of a whole
+horde, its hp pool and a round of group against group are each computed in
+one vectorized pass instead of a call per member.
+
+Members are any monster with a `name` and a `variant` (bridge monsters or
+`models.monster.Monster`). Adding a group copies its members and their
+current hp, later changes to the added group do not affect this one.
+"""
+from typing import Any, Iterable, List, Tuple, Union
+
+import numpy as np
+
+Member = Any
+
+
+class EnemyGroup:
+    """Monsters fighting together, stored as columns."""
+    __slots__ = ("name", "_monsters", "_hp", "_max_hp", "_attack", "_size")
+
+    def __init__(self, name: str = "Group", members: Iterable[Union[Member, "EnemyGroup"]] = ()) -> None:
+        self.name = name
+        self._monsters: List[Member] = []
+        self._hp = np.zeros(0, dtype=np.int64)
+        self._max_hp = np.zeros(0, dtype=np.int64)
+        self._attack = np.zeros(0, dtype=np.int64)
+        self._size = 0
+        self.add_many(members)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, entity: Union[Member, "EnemyGroup"]) -> None:
+        """Add a monster, or every member of a group."""
+        self.add_many((entity,))
+
+    def add_many(self, entities: Iterable[Union[Member, "EnemyGroup"]]) -> None:
+        hp: List[int] = []
+        attack: List[int] = []
+        monsters: List[Member] = []
+        # Variants are shared, their stats are read once per variant
+        stats = {}
+        groups = []
+        for entity in entities:
+            if isinstance(entity, EnemyGroup):
+                groups.append(entity)
+                continue
+            variant = entity.variant
+            values = stats.get(id(variant))
+            if values is None:
+                values = stats[id(variant)] = (variant.hp(), variant.attack_power())
+            monsters.append(entity)
+            hp.append(values[0])
+            attack.append(values[1])
+        if monsters:
+            self._extend(monsters, np.array(hp, dtype=np.int64), np.array(hp, dtype=np.int64),
+                         np.array(attack, dtype=np.int64))
+        for group in groups:
+            size = group._size
+            self._extend(group._monsters, group._hp[:size], group._max_hp[:size], group._attack[:size])
+
+    def remove(self, monster: Member) -> None:
+        """Remove a member, raise ValueError when it is not in the group."""
+        size = self._size
+        index = next((i for i, member in enumerate(self._monsters) if member is monster), None)
+        if index is None:
+            raise ValueError(f"{monster.name} is not in {self.name}")
+        for name in ("_hp", "_max_hp", "_attack"):
+            column = getattr(self, name)
+            column[index:size - 1] = column[index + 1:size]
+        del self._monsters[index]
+        self._size = size - 1
+
+    def _extend(self, monsters: List[Member], hp: np.ndarray, max_hp: np.ndarray, attack: np.ndarray) -> None:
+        start, end = self._size, self._size + len(monsters)
+        if end > len(self._hp):
+            # Grown by doubling, adding members one by one stays linear overall
+            capacity = max(end, 2 * len(self._hp), 16)
+            for name in ("_hp", "_max_hp", "_attack"):
+                column = np.zeros(capacity, dtype=np.int64)
+                column[:start] = getattr(self, name)[:start]
+                setattr(self, name, column)
+        self._hp[start:end] = hp
+        self._max_hp[start:end] = max_hp
+        self._attack[start:end] = attack
+        self._monsters.extend(monsters)
+        self._size = end
+
+    @property
+    def hp(self) -> np.ndarray:
+        """Remaining hp of every member, a read-only view."""
+        view = self._hp[:self._size]
+        view.flags.writeable = False
+        return view
+
+    def members(self) -> List[Member]:
+        """Monsters still alive."""
+        return [self._monsters[i] for i in np.flatnonzero(self._hp[:self._size] > 0).tolist()]
+
+    def alive(self) -> int:
+        return int(np.count_nonzero(self._hp[:self._size] > 0))
+
+    def is_defeated(self) -> bool:
+        return not (self._hp[:self._size] > 0).any()
+
+    def total_hp(self) -> int:
+        """Hp pool of the group."""
+        return int(self._hp[:self._size].sum())
+
+    def max_hp(self) -> int:
+        return int(self._max_hp[:self._size].sum())
+
+    def damage(self) -> int:
+        """Damage dealt by the members still alive in one round."""
+        size = self._size
+        return int(self._attack[:size][self._hp[:size] > 0].sum())
+
+    def attack(self) -> str:
+        return f"{self.name} ({self.alive()} monsters) attacks with {self.damage()} points !"
+
+    def get_stats(self) -> str:
+        return f"{self.name} - {self.alive()}/{self._size} monsters - HP: {self.total_hp()}/{self.max_hp()}"
+
+    def take_damage(self, amount: int) -> int:
+        """Deal damage to the front members first, returns the number of members killed."""
+        if amount <= 0:
+            return 0
+        hp = self._hp[:self._size]
+        before = np.count_nonzero(hp)
+        # A member is left with what the damage did not reach of the hp pool up to it
+        reached = np.cumsum(hp) - amount
+        np.minimum(hp, np.maximum(reached, 0), out=hp)
+        return int(before - np.count_nonzero(hp))
+
+    def fight_round(self, other: "EnemyGroup") -> Tuple[int, int]:
+        """Both groups attack at once, returns the members killed on each side (self, other)."""
+        dealt, taken = self.damage(), other.damage()
+        return self.take_damage(taken), other.take_damage(dealt)
+
+    def fight(self, other: "EnemyGroup", max_rounds: int = 10_000) -> int:
+        """Fight until a group is defeated, returns the number of rounds."""
+        rounds = 0
+        while rounds < max_rounds and not self.is_defeated() and not other.is_defeated():
+            self.fight_round(other)
+            rounds += 1
+        return rounds
+
+    def remove_dead(self) -> None:
+        """Drop the defeated members."""
+        size = self._size
+        alive = np.flatnonzero(self._hp[:size] > 0)
+        self._monsters = [self._monsters[i] for i in alive.tolist()]
+        for name in ("_hp", "_max_hp", "_attack"):
+            column = getattr(self, name)
+            column[:len(alive)] = column[:size][alive]
+        self._size = len(alive)
+
+    def heal(self) -> None:
+        """Restore every member to full hp."""
+        self._hp[:self._size] = self._max_hp[:self._size]
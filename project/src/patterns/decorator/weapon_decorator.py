@@ -1,19 +1,142 @@
-#TODO: implement with real item weapon
-class Weapon:
-    def attack(self):
-        return 10
+"""Decorator pattern for fusing materials into weapons.
 
-class WeaponDecorator(Weapon):
-    def __init__(self, weapon):
+Fusions decorate a real `Weapon`. Wrapping a decorated weapon again does not
+nest a new wrapper: the stack is flattened into one decorator holding the
+fusions and their precomputed bonus, so `RockFusion(WoodFusion(sword))` is a
+single level and an attack costs the same whatever the number of fusions.
+
+Anything reporting damage (`use`, `get_full_description`) includes the
+bonus of the fusions. Decorators are registered as virtual `Weapon`s, so a
+fused weapon can be carried, ranked by the inventory and attacked with like
+any other weapon.
+"""
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple, Union
+from weakref import ref
+
+from ...models.weapon import Weapon
+
+
+@dataclass(frozen=True, slots=True)
+class Fusion:
+    """Material fused into a weapon."""
+    name: str
+    bonus_damage: int
+
+
+ROCK = Fusion("Rock", 5)
+WOOD = Fusion("Wood", 3)
+
+
+class WeaponDecorator:
+    """Weapon with fusions, anything else is read from the decorated weapon.
+
+    The decorator watches the stats of the decorated weapon on behalf of its
+    own watcher (an Inventory), which is told about the decorator.
+    """
+    __slots__ = ("weapon", "fusions", "bonus_damage", "_watcher", "__weakref__")
+
+    def __init__(self, weapon: Union[Weapon, "WeaponDecorator"], *fusions: Fusion) -> None:
+        bonus_damage = sum(fusion.bonus_damage for fusion in fusions)
+        if isinstance(weapon, WeaponDecorator):
+            fusions = weapon.fusions + fusions
+            bonus_damage += weapon.bonus_damage
+            weapon = weapon.weapon
         self.weapon = weapon
+        self.fusions: Tuple[Fusion, ...] = fusions
+        self.bonus_damage = bonus_damage
+        self._watcher: Optional["ref[Any]"] = None
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for missing attributes: `weapon` is unset on an instance being copied or
+        # unpickled, and special or private names must not be taken from the weapon
+        if name == "weapon" or name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.weapon, name)
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return self.weapon, self.fusions, self.bonus_damage
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        self.weapon, self.fusions, self.bonus_damage = state
+        self._watcher = None
+
+    @property
+    def events(self) -> Any:
+        """Bus of the decorated weapon, which publishes its state transitions."""
+        return self.weapon.events
+
+    @events.setter
+    def events(self, events: Any) -> None:
+        self.weapon.events = events
+
+    def watch_stats(self, watcher: Any) -> None:
+        """Call `watcher.stats_changed(self)` whenever the stats change."""
+        self._watcher = ref(watcher)
+        self.weapon.watch_stats(self)
+
+    def unwatch_stats(self, watcher: Any) -> None:
+        """Stop notifying a watcher."""
+        current = self._watcher
+        if current is not None and (current() is watcher or current() is None):
+            self._watcher = None
+            self.weapon.unwatch_stats(self)
+
+    def stats_changed(self, weapon: Weapon) -> None:
+        watcher = self._watcher() if self._watcher is not None else None
+        if watcher is not None:
+            watcher.stats_changed(self)
+
+    def add_fusion(self, fusion: Fusion) -> None:
+        self.fusions = self.fusions + (fusion,)
+        self.bonus_damage += fusion.bonus_damage
+        self.weapon.invalidate_stats()
+
+    def remove_fusion(self, fusion: Fusion) -> None:
+        """Remove one occurrence of a fusion."""
+        fusions = list(self.fusions)
+        fusions.remove(fusion)
+        self.fusions = tuple(fusions)
+        self.bonus_damage -= fusion.bonus_damage
+        self.weapon.invalidate_stats()
+
+    def get_total_damage(self) -> int:
+        return self.weapon.get_total_damage() + self.bonus_damage
+
+    def attack(self) -> int:
+        """Damage dealt by a hit."""
+        return self.get_total_damage()
+
+    def use(self, bonus_damage: int = 0) -> str:
+        """Use the weapon, `bonus_damage` (from buffs) is added to the bonus of the fusions."""
+        return self.weapon.use(self.bonus_damage + bonus_damage)
+
+    def get_full_description(self) -> str:
+        description = self.weapon.get_full_description(self.bonus_damage)
+        if not self.fusions:
+            return description
+        return f"{description}\n   🪨 Fusions: {' + '.join(fusion.name for fusion in self.fusions)}"
+
+    def __str__(self) -> str:
+        if not self.fusions:
+            return str(self.weapon)
+        return f"{self.weapon} ({' + '.join(fusion.name for fusion in self.fusions)})"
+
+
+Weapon.register(WeaponDecorator)
+
 
 class RockFusion(WeaponDecorator):
-    def attack(self):
-        return self.weapon.attack() + 5
+    """Fuse rock into a weapon."""
+    __slots__ = ()
+
+    def __init__(self, weapon: Union[Weapon, WeaponDecorator]) -> None:
+        super().__init__(weapon, ROCK)
+
 
 class WoodFusion(WeaponDecorator):
-    def attack(self):
-        return self.weapon.attack() + 3
+    """Fuse wood into a weapon."""
+    __slots__ = ()
 
-weapon = RockFusion(WoodFusion(Weapon()))
-print(weapon.attack())  
+    def __init__(self, weapon: Union[Weapon, WeaponDecorator]) -> None:
+        super().__init__(weapon, WOOD)
@@ -10,6 +10,7 @@ from ..models.player import Player
 
 from .bridge.monster_bridge import Bokoblin, Moblin
 from .bridge.monster_variant import BlueVariant, RedVariant
+from .flyweight.monster_flyweight import MonsterVariantFactory
 from .factory.item_factory import CommonItemFactory, RareItemFactory, LegendaryItemFactory, WeaponFactory
 from .builder.weapon_builder import WeaponBuilder, MasterSwordDirector, AncientBowDirector
 from ..models.item import ItemRarity
@@ -97,8 +98,8 @@ class Demo :
 
     def _demo_bridge(self) -> None:
         """Demonstrate bridge pattern."""
-        red_variant = RedVariant()
-        blue_variant = BlueVariant()
+        red_variant = MonsterVariantFactory.get(RedVariant)
+        blue_variant = MonsterVariantFactory.get(BlueVariant)
 
         bokoblin_red = Bokoblin(red_variant)
         moblin_blue = Moblin(blue_variant)
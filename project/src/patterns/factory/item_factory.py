@@ -5,13 +5,25 @@ This module implements both the Factory Method and Abstract Factory patterns:
 1. Abstract Factory (ItemFactory): Creates families of related items (weapons and potions)
    of different rarities (Common, Rare, Legendary)
 2. Factory Method (WeaponFactory): Creates specific types of weapons
+
+Batch methods (`create_weapons(n)`, ...) build one item and clone it, which
+is much cheaper than running the constructors n times. `ItemPool` can also
+recycle released items instead of allocating new ones.
 """
 from abc import ABC, abstractmethod
-from typing import Type
+from typing import List, Type
 from ...models.item import Item, ItemRarity
 from ...models.weapon import Weapon, Sword, Bow, Shield
 from ...models.potion import Potion, PotionEffect
 from ...models.key import Key
+from ..prototype.prototype_registry import clone_many
+
+
+def _batch(item: Item, count: int) -> List[Item]:
+    """The item and `count - 1` clones of it."""
+    if count <= 0:
+        return []
+    return [item] + clone_many(item, count - 1)
 
 
 class ItemFactory(ABC):
@@ -31,6 +43,23 @@ class ItemFactory(ABC):
     def create_potion(self) -> Potion:
         """Create a potion."""
         pass
+    
+    @abstractmethod
+    def create_key(self) -> Key:
+        """Create a key."""
+        pass
+
+    def create_weapons(self, count: int) -> List[Weapon]:
+        """Create `count` weapons at once."""
+        return _batch(self.create_weapon(), count)
+
+    def create_potions(self, count: int) -> List[Potion]:
+        """Create `count` potions at once."""
+        return _batch(self.create_potion(), count)
+
+    def create_keys(self, count: int) -> List[Key]:
+        """Create `count` keys at once."""
+        return _batch(self.create_key(), count)
 
 
 class CommonItemFactory(ItemFactory):
@@ -134,6 +163,11 @@ class WeaponFactory:
     def create_weapon(weapon_class: Type[Weapon], name: str, **kwargs) -> Weapon:
         """Create a weapon of the specified type."""
         return weapon_class(name=name, **kwargs)
+
+    @staticmethod
+    def create_weapons(weapon_class: Type[Weapon], count: int, name: str, **kwargs) -> List[Weapon]:
+        """Create `count` identical weapons of the specified type."""
+        return _batch(weapon_class(name=name, **kwargs), count)
     
     @staticmethod
     def create_sword(name: str, damage: int, durability: int, rarity: ItemRarity) -> Sword:
@@ -0,0 +1,104 @@
+"""Recycling pool for the items of a factory.
+
+Loot-heavy encounters create items that are thrown away soon after. A pool
+keeps released items and hands them out again after resetting them to the
+item the factory would create, so sustained loot churn stops allocating new
+objects (and stops feeding the garbage collector).
+
+Only release items nothing else refers to anymore: a released item is
+overwritten the next time it is acquired. Items whose clone strategy cannot
+reset instances (not a `ReusableStrategy`) are never pooled.
+"""
+from typing import Dict, Iterable, List
+
+from ...models.item import Item
+from ...models.key import Key
+from ...models.potion import Potion
+from ...models.weapon import Weapon
+from ..prototype.prototype_registry import PrototypeRegistry, ReusableStrategy
+from .item_factory import ItemFactory
+
+WEAPON = "weapon"
+POTION = "potion"
+KEY = "key"
+
+
+class ItemPool:
+    """Pool of the weapons, potions and keys of a factory."""
+
+    def __init__(self, factory: ItemFactory, max_size: int = 4096) -> None:
+        self.factory = factory
+        self.max_size = max_size
+        # Item every acquired instance is reset to, by kind
+        self._templates: Dict[str, Item] = {
+            WEAPON: factory.create_weapon(),
+            POTION: factory.create_potion(),
+            KEY: factory.create_key(),
+        }
+        self._kinds = {type(template): kind for kind, template in self._templates.items()}
+        # Released items of the kinds whose instances can be reset
+        self._free: Dict[str, List[Item]] = {
+            kind: [] for kind, template in self._templates.items()
+            if isinstance(PrototypeRegistry.strategy_for(type(template)), ReusableStrategy)
+        }
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def __len__(self) -> int:
+        """Number of items waiting to be reused."""
+        return sum(len(free) for free in self._free.values())
+
+    def acquire_weapon(self) -> Weapon:
+        return self._acquire(WEAPON, 1)[0]
+
+    def acquire_potion(self) -> Potion:
+        return self._acquire(POTION, 1)[0]
+
+    def acquire_key(self) -> Key:
+        return self._acquire(KEY, 1)[0]
+
+    def acquire_weapons(self, count: int) -> List[Weapon]:
+        return self._acquire(WEAPON, count)
+
+    def acquire_potions(self, count: int) -> List[Potion]:
+        return self._acquire(POTION, count)
+
+    def acquire_keys(self, count: int) -> List[Key]:
+        return self._acquire(KEY, count)
+
+    def release(self, item: Item) -> None:
+        """Give an item back, it is kept only if the pool can hand it out again."""
+        kind = self._kinds.get(type(item))
+        free = self._free.get(kind) if kind is not None else None
+        if free is None or len(free) >= self.max_size:
+            self.discarded += 1
+            return
+        free.append(item)
+
+    def release_many(self, items: Iterable[Item]) -> None:
+        for item in items:
+            self.release(item)
+
+    def clear(self) -> None:
+        """Forget every pooled item."""
+        for free in self._free.values():
+            free.clear()
+
+    def _acquire(self, kind: str, count: int) -> List[Item]:
+        template = self._templates[kind]
+        free = self._free.get(kind, [])
+        reused = min(count, len(free))
+        items: List[Item] = []
+        if reused:
+            items = free[-reused:]
+            del free[-reused:]
+            PrototypeRegistry.strategy_for(type(template)).copy_into_many(items, template)
+            self.reused += reused
+        if count > reused:
+            items.extend(PrototypeRegistry.strategy_for(type(template)).clone_many(template, count - reused))
+            self.created += count - reused
+        return items
+
+    def stats(self) -> Dict[str, int]:
+        return {"created": self.created, "reused": self.reused, "discarded": self.discarded, "pooled": len(self)}
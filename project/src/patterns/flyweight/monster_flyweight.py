@@ -0,0 +1,56 @@
+"""Flyweight pattern for monster variants.
+
+A variant only describes the shared, intrinsic state of a monster (color, HP,
+attack power). Instead of creating a new `RedVariant()` for every Bokoblin,
+every monster of the same variant references the single instance kept in
+cache by the factory below. The extrinsic state (the monster name, its room)
+stays on the monster itself.
+"""
+from typing import Dict, Type, TypeVar, Union
+
+from ..bridge.monster_variant import MonsterVariant, RedVariant, BlueVariant, WhiteVariant
+
+V = TypeVar("V", bound=MonsterVariant)
+
+
+class MonsterVariantFactory:
+    """Flyweight factory keeping one shared instance per variant class."""
+
+    _variants: Dict[Type[MonsterVariant], MonsterVariant] = {}
+    _colors: Dict[str, Type[MonsterVariant]] = {
+        "red": RedVariant,
+        "blue": BlueVariant,
+        "white": WhiteVariant,
+    }
+    _requests: int = 0
+
+    @classmethod
+    def get(cls, variant: Union[Type[V], str]) -> V:
+        """Return the shared variant, given its class or its color."""
+        variant_class = cls._colors[variant] if isinstance(variant, str) else variant
+        cls._requests += 1
+        shared = cls._variants.get(variant_class)
+        if shared is None:
+            shared = cls._variants[variant_class] = variant_class()
+            cls._colors.setdefault(shared.color, variant_class)
+        return shared
+
+    @classmethod
+    def interned_count(cls) -> int:
+        """Number of distinct variant instances held in cache."""
+        return len(cls._variants)
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """Report how many variants are interned and how many times they were shared."""
+        return {
+            "interned": len(cls._variants),
+            "requests": cls._requests,
+            "saved_instances": cls._requests - len(cls._variants),
+        }
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop the cached variants and reset the counters."""
+        cls._variants.clear()
+        cls._requests = 0
@@ -0,0 +1,148 @@
+"""Event bus publishing game events to the subscribers of their topic.
+
+Subscribers are indexed by topic, so publishing an event only touches the
+subscribers of its topic, and an event nobody listens to is dropped at once.
+Events are queued and delivered together by `dispatch()`, called at the end of
+a tick; batch subscribers receive every event of their topic in one call.
+
+Bound methods are held through weak references: an observer which is not
+referenced anymore is unsubscribed instead of being kept alive by the bus.
+Plain functions are held strongly, a lambda would die right away otherwise.
+"""
+from itertools import count
+from typing import Any, Callable, Dict, List, Tuple
+from weakref import WeakMethod
+
+WEAPON_USED = "weapon.used"
+WEAPON_BROKEN = "weapon.broken"
+WEAPON_REPAIRED = "weapon.repaired"
+ITEM_PICKED = "item.picked"
+ITEM_DROPPED = "item.dropped"
+ROOM_ITEM_ADDED = "room.item_added"
+ROOM_ITEM_REMOVED = "room.item_removed"
+ROOM_MONSTER_ADDED = "room.monster_added"
+ROOM_MONSTER_REMOVED = "room.monster_removed"
+
+
+class Event:
+    """Something that happened to `source`, e.g. a weapon (`value`) picked by a player."""
+    __slots__ = ("topic", "source", "value")
+
+    def __init__(self, topic: str, source: Any, value: Any = None) -> None:
+        self.topic = topic
+        self.source = source
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f"Event({self.topic!r}, {self.source!r}, {self.value!r})"
+
+
+# (callback or weak reference to it, weak, batch)
+_Subscription = Tuple[Any, bool, bool]
+
+
+class EventBus:
+    """Topics and their subscribers, with the events waiting for dispatch."""
+    __slots__ = ("_topics", "_ids", "_pending", "__weakref__")
+
+    def __init__(self) -> None:
+        # Subscriptions of every topic, by id, in subscription order
+        self._topics: Dict[str, Dict[int, _Subscription]] = {}
+        self._ids = count()
+        self._pending: List[Event] = []
+
+    def subscribe(self, topic: str, callback: Callable, batch: bool = False) -> int:
+        """Call `callback(event)`, or `callback(events)` for a batch subscriber, on the events of a topic.
+
+        Return an id to unsubscribe with.
+        """
+        subscription_id = next(self._ids)
+        if hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+            subscriptions = self._topics.setdefault(topic, {})
+
+            def forget(_, topic=topic, subscription_id=subscription_id) -> None:
+                self._discard(topic, subscription_id)
+
+            subscriptions[subscription_id] = (WeakMethod(callback, forget), True, batch)
+        else:
+            self._topics.setdefault(topic, {})[subscription_id] = (callback, False, batch)
+        return subscription_id
+
+    def unsubscribe(self, topic: str, subscription_id: int) -> None:
+        self._discard(topic, subscription_id)
+
+    def _discard(self, topic: str, subscription_id: int) -> None:
+        subscriptions = self._topics.get(topic)
+        if subscriptions is not None and subscriptions.pop(subscription_id, None) is not None and not subscriptions:
+            del self._topics[topic]
+
+    def has_subscribers(self, topic: str) -> bool:
+        return topic in self._topics
+
+    def subscribers(self, topic: str) -> int:
+        return len(self._topics.get(topic, ()))
+
+    @property
+    def pending(self) -> int:
+        """Number of events waiting for dispatch."""
+        return len(self._pending)
+
+    def publish(self, topic: str, source: Any, value: Any = None) -> None:
+        """Queue an event until the next dispatch, dropped when nobody listens to its topic."""
+        if topic in self._topics:
+            self._pending.append(Event(topic, source, value))
+
+    def emit(self, topic: str, source: Any, value: Any = None) -> None:
+        """Deliver an event right away."""
+        if topic in self._topics:
+            self._deliver(topic, [Event(topic, source, value)])
+
+    def dispatch(self) -> int:
+        """Deliver the queued events, return their number.
+
+        Events of a topic are delivered in publication order; events published
+        by subscribers wait for the next dispatch.
+        """
+        events, self._pending = self._pending, []
+        by_topic: Dict[str, List[Event]] = {}
+        for event in events:
+            topic_events = by_topic.get(event.topic)
+            if topic_events is None:
+                by_topic[event.topic] = [event]
+            else:
+                topic_events.append(event)
+        for topic, topic_events in by_topic.items():
+            self._deliver(topic, topic_events)
+        return len(events)
+
+    def _deliver(self, topic: str, events: List[Event]) -> None:
+        subscriptions = self._topics.get(topic)
+        if not subscriptions:
+            return
+        # Subscribers may unsubscribe while being called
+        for callback, weak, batch in list(subscriptions.values()):
+            if weak:
+                callback = callback()
+                if callback is None:
+                    continue
+            if batch:
+                callback(events)
+            else:
+                for event in events:
+                    callback(event)
+
+    def clear(self) -> None:
+        """Drop the queued events."""
+        self._pending.clear()
+
+
+class Observer:
+    """Observer subscribing its `update` method to topics of a bus."""
+
+    def observe(self, bus: EventBus, *topics: str) -> Dict[str, int]:
+        """Subscribe to topics, return the subscription id of each topic."""
+        return {topic: bus.subscribe(topic, self.update) for topic in topics}
+
+    def update(self, event: Event) -> None:
+        pass
+
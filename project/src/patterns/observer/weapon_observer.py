@@ -1,61 +1,45 @@
-# class Observable:
-#     def __init__(self):
-#         self.observers = []
-
-#     def add_observer(self, observer):
-#         if observer not in self.observers:
-#             self.observers.append(observer)
-
-#     def remove_observer(self, observer):
-#         if observer in self.observers:
-#             self.observers.remove(observer)
-
-#     def notify_observers(self, *args, **kwargs):
-#         for observer in self.observers:
-#             observer.update(self, *args, **kwargs)
-
-# class Observer:
-#     def update(self, observable, *args, **kwargs):
-#         pass
-
-# class Player(Observer): 
-#     """Player class representing the game protagonist."""
-#     name: str = "Link"
-#     health: int = 100
-#     inventory: List[Weapon] = field(default_factory=list)
-
-#     def drop_item(self, observable, item: Item) -> None:
-#         """Remove a weapon from the player's inventory."""
-#         if item in self.inventory:
-#             self.inventory.remove(item)
-
-# @dataclass
-# class Weapon(Item):
-#     """Base weapon class."""
-#     damage: int
-#     durability: int
-
-#     def use(self) -> str:
-#         """Attack with the weapon."""
-#         self.durability -= 1
-#         if self.durability <= 0:
-            
-#         enchant_text = f" [{self.enchantment.type.value}]" if self.enchantment else ""
-#         return f"⚔️  {self.name}{enchant_text} deals {self.get_total_damage()} damage! (Durability: {self.durability}/{self.get_total_durability()})"
-    
-# # class WeatherStation(Observable):
-# #     def set_temperature(self, temperature):
-# #         self.temperature = temperature
-# #         self.notify_observers()
-
-# # class PhoneDisplay(Observer):
-# #     def update(self, observable, *args, **kwargs):
-# #         if isinstance(observable, WeatherStation):
-# #             temperature = observable.temperature
-# #             print(f"Temperature is {temperature} degrees Celsius")
-
-# # weather_station = WeatherStation()
-# # phone_display = PhoneDisplay()
-
-# # weather_station.add_observer(phone_display)
-# # weather_station.set_temperature(25)
\ No newline at end of file
+"""Observers of the weapon and inventory events of a player.
+
+Players and the weapons they carry publish their events on an event bus (see
+event_bus.py); these observers react to them.
+"""
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, List
+
+from .event_bus import Event, EventBus, Observer, WEAPON_BROKEN, ITEM_PICKED, ITEM_DROPPED
+
+if TYPE_CHECKING:
+    from ...models.player import Player
+
+
+class BrokenWeaponObserver(Observer):
+    """Drop the weapons breaking in the hands of a player."""
+
+    def __init__(self, bus: EventBus, player: "Player") -> None:
+        self.bus = bus
+        self.player = player
+        self.subscriptions = self.observe(bus, WEAPON_BROKEN)
+
+    def update(self, event: Event) -> None:
+        weapon, inventory = event.source, self.player.inventory
+        if weapon not in inventory:
+            # A fused weapon is carried in its decorator
+            weapon = next((item for item in inventory.weapons() if getattr(item, "weapon", None) is weapon), None)
+        if weapon is not None:
+            self.player.drop_item(self.bus, weapon)
+
+
+class InventoryLog(Observer):
+    """Count the items picked and dropped, by name."""
+
+    def __init__(self, bus: EventBus) -> None:
+        self.picked: Dict[str, int] = Counter()
+        self.dropped: Dict[str, int] = Counter()
+        bus.subscribe(ITEM_PICKED, self.on_picked, batch=True)
+        bus.subscribe(ITEM_DROPPED, self.on_dropped, batch=True)
+
+    def on_picked(self, events: List[Event]) -> None:
+        self.picked.update(event.value.name for event in events)
+
+    def on_dropped(self, events: List[Event]) -> None:
+        self.dropped.update(event.value.name for event in events)
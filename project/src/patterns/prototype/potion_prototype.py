@@ -1,9 +1,9 @@
-import copy
-
 class Prototype:
     """Base Prototype class with clone method."""
     def clone(self):
-        return copy.deepcopy(self)
+        # The registry imports the prototypes to register their strategies
+        from .prototype_registry import clone
+        return clone(self)
 
 class Potion(Prototype):
     def __init__(self, name, effect, potency):
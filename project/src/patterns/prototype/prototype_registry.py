@@ -0,0 +1,246 @@
+"""Prototype registry with a clone strategy per class.
+
+`copy.deepcopy` walks every attribute and keeps a memo of what it copied,
+which makes stamping out many items from a template slow. Each class gets a
+strategy instead:
+
+- slotted items (Potion, Key, Weapon and its subclasses) copy their slots
+  directly. Their fields are immutable or shared on purpose: `Gem` and
+  `Enchantment` are frozen and weapon states hold no data, so they are shared
+  by the clones. Each clone gets its own list of gems. Fields holding other
+  mutable values can be listed to be copied structurally, fields which must
+  not follow the prototype (the container watching a weapon) to be reset;
+- the demo `Potion` prototype only holds strings and numbers, a shallow copy
+  of its attributes is enough;
+- any other class falls back to `copy.deepcopy`.
+
+`clone_many()` reads the prototype once and builds the clones in one loop.
+"""
+import copy
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ...models.item import Item
+from ...models.key import Key
+from ...models.potion import Potion as ItemPotion
+from ...models.weapon import Weapon
+from .potion_prototype import Potion
+
+
+def _slot_names(cls: type) -> Tuple[str, ...]:
+    """Every slot of a class and of its bases."""
+    names: List[str] = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name not in ("__weakref__", "__dict__") and name not in names:
+                names.append(name)
+    return tuple(names)
+
+
+def _slot_setter(cls: type, name: str) -> Any:
+    """Setter of the slot itself, bypassing descriptors over it such as the Weapon stats stamps.
+
+    Stamps converting their value (the weapon gems) are kept, they give each
+    copy a value of its own.
+    """
+    descriptor = getattr(cls, name)
+    if getattr(descriptor, "convert", None) is not None:
+        return descriptor.__set__
+    return getattr(descriptor, "slot", descriptor).__set__
+
+
+class CloneStrategy(ABC):
+    """How to copy the instances of a class."""
+
+    @abstractmethod
+    def clone(self, prototype: Any) -> Any:
+        """Return a copy of the prototype."""
+
+    def clone_many(self, prototype: Any, count: int) -> List[Any]:
+        return [self.clone(prototype) for _ in range(count)]
+
+
+class ReusableStrategy(CloneStrategy):
+    """Strategy which can also reset existing instances, so that they can be pooled."""
+
+    @abstractmethod
+    def copy_into(self, target: Any, prototype: Any) -> None:
+        """Overwrite an existing instance with the state of the prototype."""
+
+    def copy_into_many(self, targets: List[Any], prototype: Any) -> None:
+        """Overwrite existing instances with the state of the prototype."""
+        for target in targets:
+            self.copy_into(target, prototype)
+
+
+class DeepCopyStrategy(CloneStrategy):
+    """Copy every reachable object, for classes nothing is known about.
+
+    What an instance refers to is unknown, so instances cannot be reset and
+    reused.
+    """
+
+    def clone(self, prototype: Any) -> Any:
+        return copy.deepcopy(prototype)
+
+
+class ShallowCopyStrategy(ReusableStrategy):
+    """Share the attribute values, for classes holding immutable values only."""
+
+    def clone(self, prototype: Any) -> Any:
+        clone = object.__new__(type(prototype))
+        clone.__dict__.update(prototype.__dict__)
+        return clone
+
+    def clone_many(self, prototype: Any, count: int) -> List[Any]:
+        cls, attributes = type(prototype), prototype.__dict__
+        clones = [object.__new__(cls) for _ in range(count)]
+        for clone in clones:
+            clone.__dict__.update(attributes)
+        return clones
+
+    def copy_into(self, target: Any, prototype: Any) -> None:
+        target.__dict__.clear()
+        target.__dict__.update(prototype.__dict__)
+
+
+class SlotCopyStrategy(ReusableStrategy):
+    """Copy the slots of a slotted class.
+
+    `copied` slots get a copy of their value, `reset` slots get the value they
+    are mapped to instead of the value of the prototype.
+    """
+
+    def __init__(self, cls: type, copied: Iterable[str] = (), reset: Optional[Dict[str, Any]] = None) -> None:
+        self.cls = cls
+        self.copied = frozenset(copied)
+        self.reset = dict(reset or {})
+        self._shared = tuple((name, _slot_setter(cls, name)) for name in _slot_names(cls)
+                             if name not in self.copied and name not in self.reset)
+        self._copied = tuple((name, _slot_setter(cls, name)) for name in self.copied)
+        self._reset = tuple((_slot_setter(cls, name), value) for name, value in self.reset.items())
+
+    def clone(self, prototype: Any) -> Any:
+        clone = object.__new__(self.cls)
+        for setter, value in self._reset:
+            setter(clone, value)
+        for name, setter in self._shared:
+            setter(clone, getattr(prototype, name))
+        for name, setter in self._copied:
+            setter(clone, copy.copy(getattr(prototype, name)))
+        return clone
+
+    def clone_many(self, prototype: Any, count: int) -> List[Any]:
+        new, cls = object.__new__, self.cls
+        clones = [new(cls) for _ in range(count)]
+        # Reset first, the other slots may be stamps reading them
+        for setter, value in self._reset:
+            for clone in clones:
+                setter(clone, value)
+        # Slot by slot, every value is read once for the whole batch
+        for name, setter in self._shared:
+            value = getattr(prototype, name)
+            for clone in clones:
+                setter(clone, value)
+        for name, setter in self._copied:
+            value = getattr(prototype, name)
+            for clone in clones:
+                setter(clone, copy.copy(value))
+        return clones
+
+    def copy_into(self, target: Any, prototype: Any) -> None:
+        for setter, value in self._reset:
+            setter(target, value)
+        for name, setter in self._shared:
+            setter(target, getattr(prototype, name))
+        for name, setter in self._copied:
+            setter(target, copy.copy(getattr(prototype, name)))
+
+    def copy_into_many(self, targets: List[Any], prototype: Any) -> None:
+        for setter, value in self._reset:
+            for target in targets:
+                setter(target, value)
+        for name, setter in self._shared:
+            value = getattr(prototype, name)
+            for target in targets:
+                setter(target, value)
+        for name, setter in self._copied:
+            value = getattr(prototype, name)
+            for target in targets:
+                setter(target, copy.copy(value))
+
+
+class PrototypeRegistry:
+    """Named prototypes, cloned with the strategy registered for their class."""
+
+    _strategies: Dict[type, CloneStrategy] = {}
+    # Strategy of every class cloned so far, found along its bases
+    _resolved: Dict[type, CloneStrategy] = {}
+
+    def __init__(self) -> None:
+        self._prototypes: Dict[str, Any] = {}
+
+    @classmethod
+    def register_strategy(cls, item_class: type, strategy: CloneStrategy) -> None:
+        """Use a strategy for a class and its subclasses without a strategy of their own."""
+        cls._strategies[item_class] = strategy
+        cls._resolved.clear()
+
+    @classmethod
+    def strategy_for(cls, item_class: type) -> CloneStrategy:
+        """Strategy of a class, found along its bases."""
+        strategy = cls._resolved.get(item_class)
+        if strategy is not None:
+            return strategy
+        for base in item_class.__mro__:
+            strategy = cls._strategies.get(base)
+            if strategy is None:
+                continue
+            if base is not item_class and isinstance(strategy, SlotCopyStrategy):
+                # Subclasses may add slots of their own
+                strategy = SlotCopyStrategy(item_class, strategy.copied, strategy.reset)
+            break
+        else:
+            strategy = DeepCopyStrategy()
+        cls._resolved[item_class] = strategy
+        return strategy
+
+    def register(self, name: str, prototype: Any) -> None:
+        """Store a prototype under a name."""
+        self._prototypes[name] = prototype
+
+    def unregister(self, name: str) -> None:
+        del self._prototypes[name]
+
+    def get(self, name: str) -> Any:
+        """Return the prototype itself, not a clone."""
+        return self._prototypes[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._prototypes
+
+    def clone(self, name: str) -> Any:
+        """Clone a registered prototype."""
+        return clone(self._prototypes[name])
+
+    def clone_many(self, name: str, count: int) -> List[Any]:
+        """Clone a registered prototype `count` times."""
+        return clone_many(self._prototypes[name], count)
+
+
+def clone(prototype: Any) -> Any:
+    """Copy an object with the strategy of its class."""
+    return PrototypeRegistry.strategy_for(type(prototype)).clone(prototype)
+
+
+def clone_many(prototype: Any, count: int) -> List[Any]:
+    """Copy an object `count` times with the strategy of its class."""
+    return PrototypeRegistry.strategy_for(type(prototype)).clone_many(prototype, count)
+
+
+for _item_class in (Item, ItemPotion, Key):
+    PrototypeRegistry.register_strategy(_item_class, SlotCopyStrategy(_item_class))
+# A clone is neither in the inventory nor on the bus of its prototype
+PrototypeRegistry.register_strategy(Weapon, SlotCopyStrategy(Weapon, reset={"_stats_watcher": None, "events": None}))
+PrototypeRegistry.register_strategy(Potion, ShallowCopyStrategy())
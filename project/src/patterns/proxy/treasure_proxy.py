@@ -2,22 +2,114 @@
 
 This could be directly integrated into the Item class hierarchy, but is separated here
 for demonstrating the Proxy pattern.
+
+The items of a box are only created on its first successful opening, by a
+loader called with the seed of the box: a `LootDrop` rolling a loot table, or
+e.g. a function reading them from storage. A loader is meant to be shared by
+many boxes, so an unopened box only holds a few references and its seed. Keys
+are found through the key index of the inventory instead of scanning it.
+
+A box may still be described by the name of its treasure, and opened with
+a list of key names: `TreasureProxy("Gold", "Old Key").open(["Old Key"])`.
 """
+from typing import TYPE_CHECKING, Callable, Hashable, List, Mapping, Optional, Sequence, Union
+
+from ...models.item import Item
+from ...models.key import Key
+from ...models.treasure import Treasure
+
+if TYPE_CHECKING:
+    from ...loot.loot_table import LootTable
+    from ...models.inventory import Inventory
+    from ...persistence.journal import Journal
+
+Loader = Callable[[Optional[int]], Sequence[Item]]
+
+
+class LootDrop:
+    """Loader rolling `count` drops of a loot table with the seed of the box."""
+    __slots__ = ("table", "count", "modifiers")
+
+    def __init__(self, table: "LootTable", count: int = 1, modifiers: Optional[Mapping[str, float]] = None) -> None:
+        self.table = table
+        self.count = count
+        self.modifiers = modifiers
+
+    def __call__(self, seed: Optional[int]) -> List[Item]:
+        from ...loot.loot_table import make_rng
+        return self.table.roll_many(make_rng(seed), self.count, self.modifiers)
+
 
 class TreasureProxy:
     """Proxy class for a treasure box that requires a key to open."""
-    def __init__(self, treasure: str, required_key: str) -> None:
-        self._treasure = treasure
+    __slots__ = ("_contents", "_seed", "_required_key", "_is_opened", "key", "journal")
+
+    def __init__(self, contents: Union[str, Sequence[Item], Loader], required_key: str,
+                 key: Optional[Hashable] = None, journal: Optional["Journal"] = None,
+                 seed: Optional[int] = None) -> None:
+        """`contents` are the items of the box, the name of its treasure, or a loader creating them from
+        `seed` when the box is opened."""
+        if isinstance(contents, str):
+            contents = [Treasure(contents)]
+        # Items once loaded, the loader before
+        self._contents: Union[List[Item], Loader] = contents if callable(contents) else list(contents)
+        self._seed = seed
         self._required_key = required_key
         self._is_opened = False
-    
-    def open(self, player_inventory: list) -> str:
-        """Attempt to open the treasure box with the player's keys."""
+        # Identifier of the box in the journal recording its opening
+        self.key = key
+        self.journal = journal
+
+    @classmethod
+    def from_loot(cls, table: "LootTable", seed: int, required_key: str, count: int = 1,
+                  modifiers: Optional[Mapping[str, float]] = None, key: Optional[Hashable] = None,
+                  journal: Optional["Journal"] = None) -> "TreasureProxy":
+        """Box holding `count` drops of a loot table, rolled with the seed when it is opened."""
+        return cls(LootDrop(table, count, modifiers), required_key, key, journal, seed)
+
+    @property
+    def is_opened(self) -> bool:
+        return self._is_opened
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the items of the box were created."""
+        return isinstance(self._contents, list)
+
+    @property
+    def contents(self) -> List[Item]:
+        """Items of an opened box, nothing is shown while it is closed."""
+        if not self._is_opened:
+            return []
+        return self._load()
+
+    def restore(self, opened: bool) -> None:
+        """Set the state of the box, when recovering a saved game."""
+        self._is_opened = opened
+
+    def _load(self) -> List[Item]:
+        if not isinstance(self._contents, list):
+            self._contents = list(self._contents(self._seed))
+        return self._contents
+
+    def open(self, player_inventory: Union["Inventory", Sequence[Union[Item, str]]]) -> str:
+        """Attempt to open the treasure box with the player's keys, given as items or key names."""
         if self._is_opened:
             return "The treasure box is already opened."
-        
-        if self._required_key in player_inventory:
-            self._is_opened = True
-            return f"You opened the treasure box and found: {self._treasure}"
+
+        has_key = getattr(player_inventory, "has_key", None)
+        if has_key is not None:
+            found = has_key(self._required_key)
         else:
+            found = any(item == self._required_key or isinstance(item, Key) and item.opens == self._required_key
+                        for item in player_inventory)
+        if not found:
             return "You need a key to open this treasure box."
+
+        self._is_opened = True
+        if self.journal is not None and self.key is not None:
+            self.journal.treasure_opened(self.key)
+        items = self._load()
+        if not items:
+            return "You opened the treasure box, it is empty."
+        return f"You opened the treasure box and found: {', '.join(item.name for item in items)}"
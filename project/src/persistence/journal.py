@@ -0,0 +1,260 @@
+"""Append-only journal of the game state changes.
+
+Instead of saving the whole world after every action, each change (item
+picked or dropped, weapon used, room content changed, treasure opened) is
+appended to a journal file. Records are buffered and written in batches, so
+recording an action costs O(1).
+
+Once enough records are written, a checkpoint (a snapshot of the player and
+the world) is saved and the journal is truncated. After a crash the state is
+recovered from the latest checkpoint plus the records written after it.
+
+Every record is numbered: a checkpoint file carries the number of the last
+record it includes, so a crash between saving a checkpoint and truncating
+the journal never replays a record twice.
+
+    record     length (u32), sequence number (u64), operation (u8), pickled arguments
+"""
+import glob
+import os
+import pickle
+import struct
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from ..models.item import Item
+from ..models.player import Player
+from ..models.room import Room
+from ..models.weapon import Weapon, WeaponBrokenState, WeaponUsableState
+from ..patterns.bridge.monster_bridge import Monster, Bokoblin, Moblin, Hinox
+from ..patterns.flyweight.monster_flyweight import MonsterVariantFactory
+from ..world.chunked_world import ChunkedWorld
+from . import snapshot
+
+ITEM_PICKED = 0
+ITEM_DROPPED = 1
+WEAPON_USED = 2
+ROOM_ITEM_ADDED = 3
+ROOM_ITEM_REMOVED = 4
+ROOM_MONSTER_ADDED = 5
+ROOM_MONSTER_REMOVED = 6
+TREASURE_OPENED = 7
+
+_HEADER = struct.Struct("<IQB")
+_MONSTER_CLASSES = {cls.__name__: cls for cls in (Monster, Bokoblin, Moblin, Hinox)}
+
+State = Callable[[], Tuple[Player, snapshot.World]]
+
+
+def _checkpoints(path: str) -> List[Tuple[int, str]]:
+    """Checkpoints of a journal with the last sequence number they include, oldest first."""
+    found = []
+    for name in glob.glob(glob.escape(path) + ".*.checkpoint"):
+        sequence = name[len(path) + 1:-len(".checkpoint")]
+        if sequence.isdigit():
+            found.append((int(sequence), name))
+    return sorted(found)
+
+
+def _read_records(path: str) -> List[Tuple[int, int, tuple]]:
+    """Read the complete records of a journal, a torn record at the end is ignored."""
+    if not os.path.exists(path):
+        return []
+    with open(path, "rb") as file:
+        data = file.read()
+    records = []
+    offset = 0
+    while offset + _HEADER.size <= len(data):
+        length, sequence, operation = _HEADER.unpack_from(data, offset)
+        start = offset + _HEADER.size
+        if start + length > len(data):
+            break
+        records.append((sequence, operation, pickle.loads(data[start:start + length])))
+        offset = start + length
+    return records
+
+
+class Journal:
+    """Batched, append-only journal with periodic checkpoints."""
+
+    def __init__(self, path: str, state: Optional[State] = None, batch_size: int = 64,
+                 checkpoint_every: int = 10_000, durable: bool = False) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.checkpoint_every = checkpoint_every
+        self.durable = durable
+        self._state = state
+        self._buffer: List[bytes] = []
+        self._opened_treasures: Set[Hashable] = set()
+        records = _read_records(path)
+        checkpoints = _checkpoints(path)
+        last_checkpoint = checkpoints[-1][0] if checkpoints else 0
+        self._sequence = max([last_checkpoint] + [sequence for sequence, _, _ in records])
+        self._since_checkpoint = sum(1 for sequence, _, _ in records if sequence > last_checkpoint)
+        for _, operation, arguments in records:
+            if operation == TREASURE_OPENED:
+                self._opened_treasures.add(arguments[0])
+        self._file = open(path, "ab")
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def sequence(self) -> int:
+        """Number of the last recorded change."""
+        return self._sequence
+
+    def attach(self, player: Player, world: snapshot.World) -> None:
+        """Record the changes of the player and of the rooms of the world."""
+        player.journal = self
+        if isinstance(world, ChunkedWorld):
+            world.journal = self
+        else:
+            for room in world:
+                room.journal = self
+
+    def item_picked(self, item: Item) -> None:
+        self.record(ITEM_PICKED, item)
+
+    def item_dropped(self, index: int) -> None:
+        self.record(ITEM_DROPPED, index)
+
+    def weapon_used(self, index: int, weapon: Weapon) -> None:
+        # Read through fusions too
+        arrows = getattr(weapon, "arrow_count", None)
+        self.record(WEAPON_USED, index, weapon.durability, arrows, isinstance(weapon.state, WeaponBrokenState))
+
+    def room_item_added(self, room: Room, item: Item) -> None:
+        self.record(ROOM_ITEM_ADDED, room.key, item)
+
+    def room_item_removed(self, room: Room, index: int) -> None:
+        self.record(ROOM_ITEM_REMOVED, room.key, index)
+
+    def room_monster_added(self, room: Room, monster: Monster) -> None:
+        self.record(ROOM_MONSTER_ADDED, room.key, type(monster).__name__, monster.name, monster.variant.color)
+
+    def room_monster_removed(self, room: Room, index: int) -> None:
+        self.record(ROOM_MONSTER_REMOVED, room.key, index)
+
+    def treasure_opened(self, key: Hashable) -> None:
+        self._opened_treasures.add(key)
+        self.record(TREASURE_OPENED, key)
+
+    def record(self, operation: int, *arguments) -> None:
+        """Append a change to the journal."""
+        self._buffer.append(self._encode(operation, arguments))
+        self._since_checkpoint += 1
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def _encode(self, operation: int, arguments: tuple) -> bytes:
+        """Number a record and serialize it."""
+        self._sequence += 1
+        payload = pickle.dumps(arguments, pickle.HIGHEST_PROTOCOL)
+        return _HEADER.pack(len(payload), self._sequence, operation) + payload
+
+    def flush(self) -> None:
+        """Write the buffered records, then checkpoint if enough records were written."""
+        if self._buffer:
+            self._file.write(b"".join(self._buffer))
+            self._buffer.clear()
+            self._file.flush()
+            if self.durable:
+                os.fsync(self._file.fileno())
+        if self._state is not None and self._since_checkpoint >= self.checkpoint_every:
+            self.checkpoint()
+
+    def checkpoint(self, player: Optional[Player] = None, world: Optional[snapshot.World] = None) -> str:
+        """Save a snapshot of the state and truncate the journal, return the checkpoint path."""
+        if player is None or world is None:
+            if self._state is None:
+                raise ValueError("No state to checkpoint")
+            player, world = self._state()
+        self._file.write(b"".join(self._buffer))
+        self._buffer.clear()
+        self._file.flush()
+
+        checkpoint_path = f"{self.path}.{self._sequence:020d}.checkpoint"
+        snapshot.save(checkpoint_path + ".tmp", player, world)
+        os.replace(checkpoint_path + ".tmp", checkpoint_path)
+        self._file.close()
+        self._file = open(self.path, "wb")
+        for sequence, name in _checkpoints(self.path):
+            if name != checkpoint_path:
+                os.remove(name)
+        self._since_checkpoint = 0
+        # Treasures are not part of the snapshot, their state is carried over.
+        # The records are written directly: they do not count towards the next
+        # checkpoint, so they can never trigger one.
+        self._file.write(b"".join(self._encode(TREASURE_OPENED, (key,))
+                                  for key in sorted(self._opened_treasures, key=repr)))
+        self._file.flush()
+        if self.durable:
+            os.fsync(self._file.fileno())
+        return checkpoint_path
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+
+    @staticmethod
+    def recover(path: str, treasures: Optional[Dict[Hashable, object]] = None) -> Tuple[Player, snapshot.World]:
+        """Rebuild the state from the latest checkpoint and the records written after it.
+
+        Treasure proxies given in `treasures`, by key, are reopened when the
+        journal says so.
+        """
+        checkpoints = _checkpoints(path)
+        if not checkpoints:
+            raise FileNotFoundError(f"No checkpoint for journal {path}")
+        last_checkpoint, checkpoint_path = checkpoints[-1]
+        player, world = snapshot.load(checkpoint_path)
+        if isinstance(world, ChunkedWorld):
+            room_at = world.room_at
+        else:
+            rooms = {room.key: room for room in world}
+            room_at = rooms.__getitem__
+        for sequence, operation, arguments in _read_records(path):
+            if sequence > last_checkpoint:
+                _apply(operation, arguments, player, room_at, treasures or {})
+        return player, world
+
+
+def _apply(operation: int, arguments: tuple, player: Player, room_at: Callable[[Hashable], Room],
+           treasures: Dict[Hashable, object]) -> None:
+    if operation == ITEM_PICKED:
+        player.inventory.append(arguments[0])
+    elif operation == ITEM_DROPPED:
+        del player.inventory[arguments[0]]
+    elif operation == WEAPON_USED:
+        index, durability, arrows, broken = arguments
+        weapon = player.inventory[index]
+        weapon.durability = durability
+        if arrows is not None:
+            weapon.arrow_count = arrows
+        weapon.state = WeaponBrokenState() if broken else WeaponUsableState()
+    elif operation == ROOM_ITEM_ADDED:
+        room = room_at(arguments[0])
+        room.items.append(arguments[1])
+        room.touch()
+    elif operation == ROOM_ITEM_REMOVED:
+        room = room_at(arguments[0])
+        del room.items[arguments[1]]
+        room.touch()
+    elif operation == ROOM_MONSTER_ADDED:
+        key, class_name, name, color = arguments
+        cls = _MONSTER_CLASSES.get(class_name, Monster)
+        variant = MonsterVariantFactory.get(color)
+        room = room_at(key)
+        room.monsters.append(Monster(name, variant) if cls is Monster else cls(variant))
+        room.touch()
+    elif operation == ROOM_MONSTER_REMOVED:
+        room = room_at(arguments[0])
+        del room.monsters[arguments[1]]
+        room.touch()
+    elif operation == TREASURE_OPENED:
+        treasure = treasures.get(arguments[0])
+        if treasure is not None:
+            treasure.restore(opened=True)
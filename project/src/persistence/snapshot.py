@@ -0,0 +1,419 @@
+"""Binary snapshot of the game state.
+
+A snapshot holds the player, its inventory and the world: either a list of
+rooms with their connections, or a procedural world stored as its generator
+parameters plus the rooms whose content changed.
+
+Every record has a fixed size, so a snapshot is read through a memory map and
+a room is only decoded when it is accessed:
+
+    header     magic, version, world kind, then (offset, count) per section
+    strings    (start, end) offsets followed by the UTF-8 blob
+    gems       name, bonus damage, bonus durability
+    items      see `_ITEM`
+    item refs  item indexes of the inventory and of the rooms
+    monsters   class, variant color, name
+    refs       monster indexes of the rooms
+    exits      direction, target room
+    rooms      see `_ROOM`
+    player     name, health, inventory
+    world      seed, width, height, chunk size, max chunks (procedural only)
+"""
+import mmap
+import struct
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from ..models.enchantment import Enchantment, EnchantmentType, Gem
+from ..models.item import Item, ItemRarity
+from ..models.item_store import item_kind, POTION, KEY, SWORD, BOW, SHIELD, TREASURE
+from ..models.key import Key
+from ..models.player import Player
+from ..models.potion import Potion, PotionEffect
+from ..models.room import Room, RoomRef
+from ..models.treasure import Treasure
+from ..models.weapon import Weapon, Sword, Bow, Shield, WeaponType, WeaponBrokenState
+from ..patterns.bridge.monster_bridge import Monster, Bokoblin, Moblin, Hinox
+from ..patterns.flyweight.monster_flyweight import MonsterVariantFactory
+from ..world.chunked_world import ChunkedWorld
+from ..world.world_generator import WorldGenerator
+
+MAGIC = b"HERO"
+VERSION = 1
+ROOMS = 0
+PROCEDURAL = 1
+NONE = 0xFFFFFFFF
+
+_SECTIONS = ("strings", "gems", "items", "item_refs", "monsters", "monster_refs", "exits", "rooms", "player", "world")
+_HEADER = struct.Struct("<4sHBx" + "QQ" * len(_SECTIONS))
+_STRING = struct.Struct("<II")
+_GEM = struct.Struct("<Iii")
+# kind, rarity, category, broken, enchantment type (0 is none), name, damage or power,
+# durability, arrows or defense, enchantment power, special ability, first gem, gem count
+_ITEM = struct.Struct("<BBBBBxxxIiiiiIII")
+_REF = struct.Struct("<I")
+_MONSTER = struct.Struct("<BBxxI")
+_EXIT = struct.Struct("<II")
+# name, has position, x, y, first item, item count, first monster, monster count, first exit, exit count
+_ROOM = struct.Struct("<IBxxxiiIIIIII")
+_PLAYER = struct.Struct("<IiII")
+_WORLD = struct.Struct("<qiiii")
+
+_RARITIES = list(ItemRarity)
+_EFFECTS = list(PotionEffect)
+_WEAPON_TYPES = list(WeaponType)
+_ENCHANTMENTS = list(EnchantmentType)
+_MONSTER_CLASSES = (Monster, Bokoblin, Moblin, Hinox)
+_COLORS = ("red", "blue", "white")
+
+World = Union[Sequence[Room], ChunkedWorld]
+
+
+class _Writer:
+    """Collects the records of every section before writing the file."""
+
+    def __init__(self) -> None:
+        self.strings: List[str] = []
+        self.string_codes: Dict[str, int] = {}
+        self.sections: Dict[str, bytearray] = {name: bytearray() for name in _SECTIONS}
+        self.counts: Dict[str, int] = {name: 0 for name in _SECTIONS}
+        # Identical items and gem lists are only written once
+        self.items_written: Dict[bytes, int] = {}
+        self.gems_written: Dict[Tuple[bytes, ...], int] = {}
+
+    def append(self, section: str, record: struct.Struct, *values) -> int:
+        index = self.counts[section]
+        self.sections[section] += record.pack(*values)
+        self.counts[section] = index + 1
+        return index
+
+    def string(self, value: Optional[str]) -> int:
+        if value is None:
+            return NONE
+        code = self.string_codes.get(value)
+        if code is None:
+            code = self.string_codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def item(self, item: Item) -> int:
+        kind = item_kind(item)
+        name = self.string(item.name)
+        rarity = _RARITIES.index(item.rarity)
+        if kind == POTION:
+            record = _ITEM.pack(kind, rarity, _EFFECTS.index(item.effect), 0, 0, name, item.power, 0, 0, 0, NONE, 0, 0)
+        elif kind == KEY or kind == TREASURE:
+            record = _ITEM.pack(kind, rarity, 0, 0, 0, name, 0, 0, 0, 0, NONE, 0, 0)
+        else:
+            enchantment = item.enchantment
+            extra = item.arrow_count if kind == BOW else item.defense if kind == SHIELD else 0
+            record = _ITEM.pack(
+                kind, rarity, _WEAPON_TYPES.index(item.weapon_type), isinstance(item.state, WeaponBrokenState),
+                _ENCHANTMENTS.index(enchantment.type) + 1 if enchantment else 0,
+                name, item.damage, item.durability, extra, enchantment.power if enchantment else 0,
+                self.string(item.special_ability), self.gems(item.gems), len(item.gems),
+            )
+        index = self.items_written.get(record)
+        if index is None:
+            index = self.items_written[record] = self.counts["items"]
+            self.sections["items"] += record
+            self.counts["items"] = index + 1
+        return index
+
+    def gems(self, gems: Sequence[Gem]) -> int:
+        records = tuple(_GEM.pack(self.string(gem.name), gem.bonus_damage, gem.bonus_durability) for gem in gems)
+        first = self.gems_written.get(records)
+        if first is None:
+            first = self.gems_written[records] = self.counts["gems"]
+            self.sections["gems"] += b"".join(records)
+            self.counts["gems"] = first + len(records)
+        return first
+
+    def items(self, items: Sequence[Item]) -> Tuple[int, int]:
+        indexes = [self.item(item) for item in items]
+        first = self.counts["item_refs"]
+        for index in indexes:
+            self.append("item_refs", _REF, index)
+        return first, len(indexes)
+
+    def monsters(self, monsters: Sequence[Monster]) -> Tuple[int, int]:
+        indexes = []
+        for monster in monsters:
+            kind = _MONSTER_CLASSES.index(type(monster)) if type(monster) in _MONSTER_CLASSES else 0
+            indexes.append(self.append("monsters", _MONSTER, kind, _COLORS.index(monster.variant.color),
+                                       self.string(monster.name)))
+        first = self.counts["monster_refs"]
+        for index in indexes:
+            self.append("monster_refs", _REF, index)
+        return first, len(indexes)
+
+    def room(self, name: str, position: Optional[Tuple[int, int]], items: Sequence[Item],
+             monsters: Sequence[Monster], exits: Sequence[Tuple[str, int]]) -> None:
+        first_item, item_count = self.items(items)
+        first_monster, monster_count = self.monsters(monsters)
+        first_exit = self.counts["exits"]
+        for direction, target in exits:
+            self.append("exits", _EXIT, self.string(direction), target)
+        x, y = position if position is not None else (0, 0)
+        self.append("rooms", _ROOM, self.string(name), position is not None, x, y, first_item, item_count,
+                    first_monster, monster_count, first_exit, len(exits))
+
+    def write(self, path: str, world_kind: int) -> int:
+        blob = bytearray()
+        offsets = bytearray()
+        for value in self.strings:
+            encoded = value.encode("utf-8")
+            offsets += _STRING.pack(len(blob), len(blob) + len(encoded))
+            blob += encoded
+        self.sections["strings"] = offsets + blob
+        self.counts["strings"] = len(self.strings)
+
+        header_values: List[int] = []
+        body = bytearray()
+        for name in _SECTIONS:
+            # Sections are 8-byte aligned
+            body += b"\0" * (-len(body) % 8)
+            header_values += [_HEADER.size + len(body), self.counts[name]]
+            body += self.sections[name]
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(MAGIC, VERSION, world_kind, *header_values))
+            file.write(body)
+        return _HEADER.size + len(body)
+
+
+def save(path: str, player: Player, world: World) -> int:
+    """Write a snapshot of the player and the world, return its size in bytes."""
+    writer = _Writer()
+    if isinstance(world, ChunkedWorld):
+        world_kind = PROCEDURAL
+        generator = world.generator
+        writer.append("world", _WORLD, generator.seed, generator.width, generator.height,
+                      world.chunk_size, world.max_chunks)
+        for position, (items, monsters) in world.changed_rooms().items():
+            writer.room("", position, items, monsters, ())
+    else:
+        world_kind = ROOMS
+        rooms = list(world)
+        indexes = {id(room): index for index, room in enumerate(rooms)}
+        by_key = {room.key: index for index, room in reversed(list(enumerate(rooms)))}
+
+        def index_of(neighbour: Union[Room, RoomRef]) -> int:
+            if isinstance(neighbour, RoomRef):
+                # A reference leads to the saved room with its key, or is loaded to be saved
+                index = by_key.get(neighbour.key)
+                if index is not None:
+                    return index
+                neighbour = neighbour.resolve()
+            index = indexes.get(id(neighbour))
+            if index is None:
+                # Rooms reachable from the given ones are saved as well
+                index = indexes[id(neighbour)] = len(rooms)
+                by_key.setdefault(neighbour.key, index)
+                rooms.append(neighbour)
+            return index
+
+        position = 0
+        while position < len(rooms):
+            room = rooms[position]
+            exits = [(direction, index_of(neighbour)) for direction, neighbour in room.connections.items()]
+            writer.room(room.name, room.position, room.items, room.monsters, exits)
+            position += 1
+    first_item, item_count = writer.items(list(player.inventory))
+    writer.append("player", _PLAYER, writer.string(player.name), player.health, first_item, item_count)
+    return writer.write(path, world_kind)
+
+
+class Snapshot:
+    """Snapshot read through a memory map, rooms are decoded on first access."""
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.world_kind, *values = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a game snapshot")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}")
+        self._sections = {name: (values[2 * i], values[2 * i + 1]) for i, name in enumerate(_SECTIONS)}
+        self._strings: Dict[int, str] = {}
+        self._rooms: Dict[int, Room] = {}
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    @property
+    def room_count(self) -> int:
+        return self._sections["rooms"][1]
+
+    def player(self) -> Player:
+        """Decode the player and its inventory."""
+        name, health, first_item, item_count = self._record("player", _PLAYER, 0)
+        player = Player(name=self._string(name), health=health)
+        for item in self._items(first_item, item_count):
+            player.pick_weapon(item)
+        return player
+
+    def room(self, index: int) -> Room:
+        """Decode a room, its exits are references to the other rooms of the snapshot."""
+        room = self._rooms.get(index)
+        if room is not None:
+            return room
+        room = self._rooms[index] = self._room(index)
+        for direction, target in self._exits(index):
+            neighbour = self._rooms.get(target)
+            if neighbour is None:
+                target_name, has_position, x, y = self._record("rooms", _ROOM, target)[:4]
+                target_name = self._string(target_name)
+                # Keyed like the room it leads to, resolved by its index in the snapshot
+                neighbour = RoomRef(target_name, (x, y) if has_position else target_name,
+                                    lambda key, target=target: self.room(target))
+            room.connect(direction, neighbour)
+        return room
+
+    def rooms(self) -> Iterator[Room]:
+        """Decode every room."""
+        return (self.room(index) for index in range(self.room_count))
+
+    def world(self) -> World:
+        """Rebuild the world: the list of rooms, or the procedural world with its changes."""
+        if self.world_kind == ROOMS:
+            # Every room is decoded: sections are unpacked in bulk and exits
+            # point to the rooms themselves
+            items = self._records("items", _ITEM)
+            item_refs = [ref for ref, in self._records("item_refs", _REF)]
+            monsters = self._records("monsters", _MONSTER)
+            monster_refs = [ref for ref, in self._records("monster_refs", _REF)]
+            exits = self._records("exits", _EXIT)
+            records = self._records("rooms", _ROOM)
+            rooms = []
+            for index, (name, has_position, x, y, first_item, item_count,
+                        first_monster, monster_count, _, _) in enumerate(records):
+                room = self._rooms.get(index)
+                if room is None:
+                    room = Room(
+                        name=self._string(name),
+                        items=[self._decode_item(items[ref]) for ref in item_refs[first_item:first_item + item_count]],
+                        monsters=[self._decode_monster(monsters[ref])
+                                  for ref in monster_refs[first_monster:first_monster + monster_count]],
+                        position=(x, y) if has_position else None,
+                    )
+                rooms.append(room)
+            for index, room in enumerate(rooms):
+                if index not in self._rooms:
+                    first_exit, exit_count = records[index][-2:]
+                    for direction, target in exits[first_exit:first_exit + exit_count]:
+                        room.connections[self._string(direction)] = rooms[target]
+            return rooms
+        seed, width, height, chunk_size, max_chunks = self._record("world", _WORLD, 0)
+        world = ChunkedWorld(WorldGenerator(seed, width, height), chunk_size, max_chunks)
+        changed = {}
+        for index in range(self.room_count):
+            _, _, x, y, first_item, item_count, first_monster, monster_count, _, _ = \
+                self._record("rooms", _ROOM, index)
+            changed[(x, y)] = (self._items(first_item, item_count), self._monsters(first_monster, monster_count))
+        world.restore_changes(changed)
+        return world
+
+    def _room(self, index: int) -> Room:
+        (name, has_position, x, y, first_item, item_count,
+         first_monster, monster_count, _, _) = self._record("rooms", _ROOM, index)
+        return Room(
+            name=self._string(name),
+            items=self._items(first_item, item_count),
+            monsters=self._monsters(first_monster, monster_count),
+            position=(x, y) if has_position else None,
+        )
+
+    def _exits(self, index: int) -> Iterator[Tuple[str, int]]:
+        first_exit, exit_count = self._record("rooms", _ROOM, index)[-2:]
+        for i in range(first_exit, first_exit + exit_count):
+            direction, target = self._record("exits", _EXIT, i)
+            yield self._string(direction), target
+
+    def _records(self, section: str, record: struct.Struct) -> List[tuple]:
+        offset, count = self._sections[section]
+        return list(record.iter_unpack(self._map[offset:offset + count * record.size]))
+
+    def _record(self, section: str, record: struct.Struct, index: int) -> tuple:
+        offset, count = self._sections[section]
+        if not 0 <= index < count:
+            raise IndexError(f"No record {index} in section {section}")
+        return record.unpack_from(self._map, offset + index * record.size)
+
+    def _string(self, code: int) -> Optional[str]:
+        if code == NONE:
+            return None
+        value = self._strings.get(code)
+        if value is None:
+            offset, count = self._sections["strings"]
+            start, end = _STRING.unpack_from(self._map, offset + code * _STRING.size)
+            blob = offset + count * _STRING.size
+            value = self._strings[code] = self._map[blob + start:blob + end].decode("utf-8")
+        return value
+
+    def _items(self, first: int, count: int) -> List[Item]:
+        return [self._item(self._record("item_refs", _REF, i)[0]) for i in range(first, first + count)]
+
+    def _item(self, index: int) -> Item:
+        return self._decode_item(self._record("items", _ITEM, index))
+
+    def _decode_item(self, record: tuple) -> Item:
+        (kind, rarity_code, category, broken, enchantment_type, name_code, power, durability, extra,
+         enchantment_power, special, first_gem, gem_count) = record
+        name = self._string(name_code)
+        rarity = _RARITIES[rarity_code]
+        if kind == POTION:
+            return Potion(name=name, rarity=rarity, effect=_EFFECTS[category], power=power)
+        if kind == KEY:
+            return Key(name=name, rarity=rarity)
+        if kind == TREASURE:
+            return Treasure(name=name, rarity=rarity)
+        enchantment = Enchantment(_ENCHANTMENTS[enchantment_type - 1], enchantment_power) if enchantment_type else None
+        gems = tuple(self._gem(i) for i in range(first_gem, first_gem + gem_count))
+        special_ability = self._string(special)
+        if kind == SHIELD:
+            weapon = Shield(name=name, durability=durability, defense=extra, rarity=rarity,
+                            enchantment=enchantment, gems=gems, special_ability=special_ability)
+        elif kind == BOW:
+            weapon = Bow(name=name, damage=power, durability=durability, rarity=rarity,
+                         enchantment=enchantment, gems=gems, special_ability=special_ability)
+            weapon.arrow_count = extra
+        elif kind == SWORD:
+            weapon = Sword(name=name, damage=power, durability=durability, rarity=rarity,
+                           enchantment=enchantment, gems=gems, special_ability=special_ability)
+        else:
+            weapon = Weapon(name=name, rarity=rarity, damage=power, durability=durability,
+                            weapon_type=_WEAPON_TYPES[category], enchantment=enchantment, gems=gems,
+                            special_ability=special_ability)
+        if broken:
+            weapon.state = WeaponBrokenState()
+        return weapon
+
+    def _gem(self, index: int) -> Gem:
+        name, bonus_damage, bonus_durability = self._record("gems", _GEM, index)
+        return Gem(name=self._string(name), bonus_damage=bonus_damage, bonus_durability=bonus_durability)
+
+    def _monsters(self, first: int, count: int) -> List[Monster]:
+        return [self._decode_monster(self._record("monsters", _MONSTER, self._record("monster_refs", _REF, i)[0]))
+                for i in range(first, first + count)]
+
+    def _decode_monster(self, record: tuple) -> Monster:
+        kind, color, name = record
+        variant = MonsterVariantFactory.get(_COLORS[color])
+        return _MONSTER_CLASSES[kind](variant) if kind else Monster(self._string(name), variant)
+
+
+def load(path: str) -> Tuple[Player, World]:
+    """Read the player and the world of a snapshot.
+
+    The returned list of rooms is fully decoded; use `Snapshot` directly to
+    decode rooms one at a time.
+    """
+    with Snapshot(path) as snapshot:
+        return snapshot.player(), snapshot.world()
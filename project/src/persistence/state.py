@@ -0,0 +1,52 @@
+"""Structural state of players, items and rooms, to compare them.
+
+Two objects have the same state when a game cannot tell them apart: same
+stats, weapon state, gems, enchantment, arrows, monster variants and exits.
+Exits are compared by the key of the room they lead to, so a room whose
+neighbours are `RoomRef`s has the state of the same room fully loaded.
+"""
+from typing import Any, List, Sequence
+
+from ..models.item import Item
+from ..models.player import Player
+from ..models.room import Room
+from ..models.weapon import Weapon
+
+
+def item_state(item: Item) -> tuple:
+    if isinstance(item, Weapon):
+        enchantment = (item.enchantment.type.value, item.enchantment.power) if item.enchantment else None
+        return (type(item).__name__, item.name, item.rarity.value, item.damage, item.durability,
+                type(item.state).__name__, enchantment,
+                tuple((gem.name, gem.bonus_damage, gem.bonus_durability) for gem in item.gems),
+                item.special_ability, getattr(item, "arrow_count", None), getattr(item, "defense", None))
+    return (type(item).__name__, item.name, item.rarity.value, getattr(item, "effect", None) and item.effect.value,
+            getattr(item, "power", None))
+
+
+def monster_state(monster: Any) -> tuple:
+    return type(monster).__name__, monster.name, monster.variant.color
+
+
+def player_state(player: Player) -> tuple:
+    return player.name, player.health, tuple(item_state(item) for item in player.inventory)
+
+
+def room_state(room: Room) -> tuple:
+    return (room.name, room.position, tuple(item_state(item) for item in room.items),
+            tuple(monster_state(monster) for monster in room.monsters),
+            tuple(sorted((direction, other.key) for direction, other in room.connections.items())))
+
+
+def differences(expected: Player, expected_rooms: Sequence[Room], actual: Player,
+                actual_rooms: Sequence[Room]) -> List[str]:
+    """What differs between two players and their worlds, empty when they are the same."""
+    found = []
+    if player_state(expected) != player_state(actual):
+        found.append(f"player: {player_state(expected)} != {player_state(actual)}")
+    if len(expected_rooms) != len(actual_rooms):
+        found.append(f"rooms: {len(expected_rooms)} != {len(actual_rooms)}")
+    for index, (room, other) in enumerate(zip(expected_rooms, actual_rooms)):
+        if room_state(room) != room_state(other):
+            found.append(f"room {index}: {room_state(room)} != {room_state(other)}")
+    return found
@@ -0,0 +1,66 @@
+"""Renderer writing only the lines of a view that changed since it was last shown.
+
+Views are identified by a key (e.g. the room being looked at). The first
+render of a view writes all its lines; later renders compare the new lines
+with the last ones and write the removed lines prefixed by "- " and the new
+ones prefixed by "+ ". Views given as the same cached tuple (see
+`Room.detail_lines()`) are recognized without comparing their lines.
+
+At most `max_views` views are remembered, the least recently rendered one is
+forgotten first and written in full on its next render.
+"""
+import sys
+from difflib import SequenceMatcher
+from typing import Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+
+class DiffRenderer:
+    """Write views line by line through `write`, re-emitting only their changes.
+
+    Without `write`, views go to the standard output, looked up on use.
+    """
+
+    def __init__(self, write: Optional[Callable[[str], object]] = None, max_views: int = 64) -> None:
+        if max_views <= 0:
+            raise ValueError("At least one view must be remembered")
+        self.write = write
+        self.max_views = max_views
+        self._views: Dict[Hashable, Tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+    def render(self, view: Hashable, lines: Sequence[str]) -> int:
+        """Write the changes of a view, return the number of lines written."""
+        views = self._views
+        # Taken out and put back, so the views stay ordered from the least recently rendered
+        previous = views.pop(view, None)
+        if lines is previous:
+            views[view] = previous
+            return 0
+        lines = views[view] = tuple(lines)
+        if len(views) > self.max_views:
+            del views[next(iter(views))]
+        if previous is None:
+            changes = list(lines)
+        elif lines == previous:
+            return 0
+        else:
+            changes = []
+            for operation, old_start, old_end, new_start, new_end in SequenceMatcher(
+                    None, previous, lines, autojunk=False).get_opcodes():
+                if operation == "equal":
+                    continue
+                changes.extend(f"- {line}" for line in previous[old_start:old_end])
+                changes.extend(f"+ {line}" for line in lines[new_start:new_end])
+        if changes:
+            write = self.write if self.write is not None else sys.stdout.write
+            write("\n".join(changes) + "\n")
+        return len(changes)
+
+    def forget(self, view: Hashable) -> None:
+        """Write the whole view on its next render."""
+        self._views.pop(view, None)
+
+    def clear(self) -> None:
+        self._views.clear()
@@ -0,0 +1,124 @@
+"""Output backends of the game: null, plain text and rich.
+
+The game only talks to an `Output`, so scripted and batch runs do not pay
+for `rich`: it is imported when a `RichOutput` is created, not before.
+Styles are rich style names ("red", "dim", ...), the plain backend ignores
+them.
+"""
+import sys
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Iterator, Optional, Sequence, TextIO, Type
+
+
+class Output(ABC):
+    """Where the game writes its text and reads the answers of the player."""
+
+    @abstractmethod
+    def write(self, text: str) -> None:
+        """Write text as is."""
+
+    def print(self, text: str, style: Optional[str] = None) -> None:
+        """Write a line of text."""
+        self.write(text + "\n")
+
+    def banner(self, title: str, subtitle: str) -> None:
+        self.print(title, "bold cyan")
+        self.print(subtitle, "dim")
+
+    @abstractmethod
+    def ask(self, prompt: str, choices: Optional[Sequence[str]] = None, default: Optional[str] = None) -> str:
+        """Read an answer, raise EOFError when there is nothing left to read."""
+
+
+class NullOutput(Output):
+    """Discard everything, answers come from a script."""
+
+    def __init__(self, answers: Iterable[str] = ()) -> None:
+        self._answers: Iterator[str] = iter(answers)
+
+    def write(self, text: str) -> None:
+        pass
+
+    def print(self, text: str, style: Optional[str] = None) -> None:
+        pass
+
+    def ask(self, prompt: str, choices: Optional[Sequence[str]] = None, default: Optional[str] = None) -> str:
+        try:
+            return next(self._answers)
+        except StopIteration:
+            raise EOFError from None
+
+
+class PlainOutput(Output):
+    """Plain text on standard streams, or on the given streams."""
+
+    def __init__(self, stream: Optional[TextIO] = None, source: Optional[TextIO] = None) -> None:
+        self._stream = stream
+        self._source = source
+
+    # Standard streams are looked up on use, they may have been replaced since
+    @property
+    def stream(self) -> TextIO:
+        return self._stream if self._stream is not None else sys.stdout
+
+    @property
+    def source(self) -> TextIO:
+        return self._source if self._source is not None else sys.stdin
+
+    def write(self, text: str) -> None:
+        self.stream.write(text)
+
+    def ask(self, prompt: str, choices: Optional[Sequence[str]] = None, default: Optional[str] = None) -> str:
+        hint = f" [{'/'.join(choices)}]" if choices else ""
+        self.write(f"{prompt}{hint}: ")
+        self.stream.flush()
+        line = self.source.readline()
+        if not line:
+            raise EOFError
+        answer = line.strip() or (default or "")
+        if choices and answer not in choices:
+            self.print(f"Please select one of the available options: {', '.join(choices)}")
+            return self.ask(prompt, choices, default)
+        return answer
+
+
+class RichOutput(Output):
+    """Styled text with rich."""
+
+    def __init__(self) -> None:
+        from rich.console import Console
+        from rich.markup import escape
+        self.console = Console()
+        self._escape = escape
+
+    def write(self, text: str) -> None:
+        self.console.print(text, markup=False, end="")
+
+    def print(self, text: str, style: Optional[str] = None) -> None:
+        self.console.print(text, style=style, markup=False)
+
+    def banner(self, title: str, subtitle: str) -> None:
+        from rich.panel import Panel
+        self.console.print(Panel.fit(
+            f"[bold cyan]{self._escape(title)}[/bold cyan]\n[dim]{self._escape(subtitle)}[/dim]",
+            border_style="green"
+        ))
+
+    def ask(self, prompt: str, choices: Optional[Sequence[str]] = None, default: Optional[str] = None) -> str:
+        from rich.prompt import Prompt
+        if default is None:
+            return Prompt.ask(f"[yellow]{self._escape(prompt)}[/yellow]", console=self.console,
+                              choices=list(choices) if choices else None)
+        return Prompt.ask(f"[yellow]{self._escape(prompt)}[/yellow]", console=self.console,
+                          choices=list(choices) if choices else None, default=default)
+
+
+OUTPUTS: Dict[str, Type[Output]] = {"null": NullOutput, "plain": PlainOutput, "rich": RichOutput}
+
+
+def make_output(name: str) -> Output:
+    """Output backend by name."""
+    try:
+        return OUTPUTS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown output {name!r}, expected one of {', '.join(OUTPUTS)}") from None
@@ -0,0 +1,122 @@
+"""Asyncio server hosting many independent game sessions in one process.
+
+Each connection gets its own `GameSession`, played through a `Simulation`
+built from the seeded streams of a recording, so a session plays by the same
+rules as a recorded game and can be recorded too. Worlds of the same seed
+share their read-only room templates, a session only keeps a few chunks
+loaded.
+
+The protocol is line based. The client sends one command per line, the server
+answers either
+
+    OK <n>          followed by the n lines of the answer
+    ERR <message>   when the command is unknown or invalid
+
+The connection is closed after `quit`, or when the hero is defeated.
+
+    python -m src.server.game_server --socket /tmp/hyrule.sock
+"""
+import argparse
+import asyncio
+import os
+from typing import List, Optional
+
+from ..simulation.replay import Recorder, Recording, Simulation
+
+
+def encode(lines: List[str]) -> bytes:
+    """Encode a successful answer."""
+    return "\n".join([f"OK {len(lines)}"] + lines + [""]).encode()
+
+
+def encode_error(message: str) -> bytes:
+    """Encode a failed command."""
+    return f"ERR {message}\n".encode()
+
+
+class GameServer:
+    """Text protocol server, every connection plays its own game."""
+
+    def __init__(self, seed: int = 42, size: int = 1000, chunk_size: int = 4, max_chunks: int = 4,
+                 ticks_per_command: int = 20, record: bool = False) -> None:
+        """With `record`, the recording of every finished session is kept in `recordings`."""
+        self.seed = seed
+        self.size = size
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.ticks_per_command = ticks_per_command
+        self.record = record
+        self.recordings: List[Recording] = []
+        self.sessions = 0
+        # Pending connections accepted by the socket, many clients may connect at once
+        self.backlog = 4096
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def create_session(self) -> Simulation:
+        if self.record:
+            return Recorder(self.seed, self.size, self.ticks_per_command, chunk_size=self.chunk_size,
+                            max_chunks=self.max_chunks, shared=True)
+        recording = Recording(self.seed, self.size, self.ticks_per_command, chunk_size=self.chunk_size,
+                              max_chunks=self.max_chunks)
+        return Simulation(recording, shared=True)
+
+    async def start(self, path: Optional[str] = None, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        """Listen on a Unix socket when a path is given, on a local TCP port otherwise."""
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path, backlog=self.backlog)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port, backlog=self.backlog)
+        return self._server
+
+    async def serve_forever(self, path: Optional[str] = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        server = await self.start(path, host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        simulation = self.create_session()
+        session = simulation.session
+        self.sessions += 1
+        try:
+            writer.write(encode(session.execute("look")))
+            while not session.finished:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    answer = encode(simulation.run(line.decode().strip()))
+                except ValueError as error:
+                    answer = encode_error(str(error))
+                writer.write(answer)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            if isinstance(simulation, Recorder):
+                self.recordings.append(simulation.recording)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Host game sessions over a local socket.")
+    parser.add_argument("--socket", help="Unix socket path, a local TCP port is used otherwise")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--size", type=int, default=1000)
+    arguments = parser.parse_args()
+    if arguments.socket and os.path.exists(arguments.socket):
+        os.remove(arguments.socket)
+    server = GameServer(arguments.seed, arguments.size)
+    try:
+        asyncio.run(server.serve_forever(arguments.socket, port=arguments.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""Game session: one player exploring their own world, driven by text commands.
+
+Sessions share nothing but the read-only room templates of their seed, so a
+process can host as many sessions as memory allows.
+
+The world of a session keeps living between commands through its scheduler,
+advanced by the owner of the session: defeated monsters respawn, potion
+buffs wear off, and a wounded monster left alone recovers its hp. Weapon
+states only change when a weapon is used, they have nothing to do between
+two commands.
+"""
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+from ..models.inventory import Inventory
+from ..models.player import Player
+from ..models.potion import Potion, PotionEffect
+from ..models.room import Room
+from ..models.weapon import Weapon, Bow, Shield, WeaponBrokenState
+from ..patterns.decorator.weapon_decorator import WeaponDecorator
+from ..patterns.prototype.prototype_registry import clone
+from ..simulation.scheduler import MonsterRespawner, PotionBuffs, Scheduler
+from ..world.chunked_world import ChunkedWorld
+
+if TYPE_CHECKING:
+    import numpy as np
+    from ..loot.loot_table import LootTable
+
+# Chance of a monster to miss its counterattack, when the session has a combat generator
+MISS_CHANCE = 0.2
+# Seconds for a wounded monster left alone to recover one hp
+RECOVERY_PERIOD = 1.0
+HELP = ("Commands: look, go <direction>, take <item>, drop <item>, drink <item>, inventory, attack [item], "
+        "status, quit")
+
+
+def _damage(weapon: Weapon, bonus_damage: int = 0) -> int:
+    """Damage the next use of a weapon deals."""
+    if isinstance(weapon, WeaponDecorator):
+        bonus_damage += weapon.bonus_damage
+        weapon = weapon.weapon
+    if isinstance(weapon, Shield):
+        return 0
+    if isinstance(weapon, Bow):
+        return weapon.get_total_damage() + bonus_damage if weapon.arrow_count > 0 else 0
+    return 0 if isinstance(weapon.state, WeaponBrokenState) else weapon.get_total_damage() + bonus_damage
+
+
+class MonsterRecovery:
+    """Actor healing the monster fought in a session while the hero is not hitting it.
+
+    It has nothing left to do once the monster is healed, defeated, or no
+    longer fought.
+    """
+    __slots__ = ("session", "ticks")
+
+    def __init__(self, session: "GameSession") -> None:
+        self.session = session
+        self.ticks = 0
+
+    def update(self, scheduler: Scheduler) -> bool:
+        self.ticks += 1
+        if self.ticks < scheduler.ticks(RECOVERY_PERIOD):
+            return self.session._recovery is self
+        self.ticks = 0
+        return self.session._recover(self)
+
+
+class GameSession:
+    """State of one game, `execute()` runs a command and returns the lines of its answer."""
+
+    def __init__(self, world: ChunkedWorld, player: Optional[Player] = None, loot: Optional["LootTable"] = None,
+                 loot_rng: Optional["np.random.Generator"] = None,
+                 combat_rng: Optional["np.random.Generator"] = None, scheduler: Optional[Scheduler] = None) -> None:
+        """Defeated monsters drop loot when a loot table and its generator are given, monsters
+        can miss their counterattack when a combat generator is given. The world and the
+        player publish on the bus of the scheduler.
+        """
+        self.world = world
+        self.player = player or Player()
+        self.loot = loot
+        self.loot_rng = loot_rng
+        self.combat_rng = combat_rng
+        self.scheduler = scheduler if scheduler is not None else Scheduler()
+        self.world.events = self.player.events = self.scheduler.events
+        # Kept referenced, the bus holds the respawner weakly
+        self.respawner = MonsterRespawner(self.scheduler, world)
+        self.buffs = PotionBuffs(self.scheduler)
+        self.current_room: Room = world.start_room()
+        self.finished = False
+        # Monster being fought in the current room, its remaining hp, and the actor healing it
+        self._target = None
+        self._target_hp = 0
+        self._recovery: Optional[MonsterRecovery] = None
+        self._commands: Dict[str, Callable[[str], List[str]]] = {
+            "look": self._look,
+            "go": self._go,
+            "take": self._take,
+            "drop": self._drop,
+            "drink": self._drink,
+            "inventory": self._inventory,
+            "attack": self._attack,
+            "status": self._status,
+            "help": lambda argument: [HELP],
+            "quit": self._quit,
+        }
+
+    @property
+    def target_hp(self) -> int:
+        """Remaining hp of the monster being fought, 0 when there is none."""
+        return self._target_hp if self._target is not None else 0
+
+    def execute(self, line: str) -> List[str]:
+        """Run a command, raise ValueError when it is unknown or invalid."""
+        if self.finished:
+            raise ValueError("The game is over")
+        name, _, argument = line.strip().partition(" ")
+        command = self._commands.get(name.lower())
+        if command is None:
+            raise ValueError(f"Unknown command {name!r}. {HELP}")
+        return command(argument.strip())
+
+    def _look(self, argument: str) -> List[str]:
+        return list(self.current_room.detail_lines())
+
+    def _go(self, direction: str) -> List[str]:
+        room = self.world.move(self.current_room, direction.lower())
+        if room is None:
+            raise ValueError(f"No exit to the {direction or '?'}")
+        self.current_room = room
+        self._target = self._recovery = None
+        return self._look("")
+
+    def _take(self, argument: str) -> List[str]:
+        room = self.current_room
+        item = self._find(room.items, argument)
+        room.remove_item(item)
+        # Room items are shared with the other sessions of the seed
+        item = clone(item)
+        self.player.pick_weapon(item)
+        return [f"You take {item.name}."]
+
+    def _drop(self, argument: str) -> List[str]:
+        item = self._find(self.player.inventory, argument)
+        self.player.drop_item(None, item)
+        self.current_room.add_item(item)
+        return [f"You drop {item.name}."]
+
+    def _drink(self, argument: str) -> List[str]:
+        potion = self._find(self.player.inventory, argument)
+        if not isinstance(potion, Potion):
+            raise ValueError(f"{potion.name} is not a potion")
+        self.player.drop_item(None, potion)
+        return [self.buffs.drink(self.player, potion)]
+
+    def _inventory(self, argument: str) -> List[str]:
+        if not self.player.inventory:
+            return ["Your inventory is empty."]
+        return [f"{index}: {item}" for index, item in enumerate(self.player.inventory)]
+
+    def _attack(self, argument: str) -> List[str]:
+        room = self.current_room
+        if not room.monsters:
+            raise ValueError("There is no monster here")
+        if not self.player.inventory:
+            raise ValueError("You have no weapon")
+        weapon = self._find(self.player.inventory, argument or "0")
+        if not isinstance(weapon, Weapon):
+            raise ValueError(f"{weapon.name} is not a weapon")
+        monster = room.monsters[0]
+        if self._target is not monster:
+            self._target, self._target_hp = monster, monster.variant.hp()
+        strength = self.buffs.bonus(self.player, PotionEffect.STRENGTH)
+        self._target_hp -= _damage(weapon, strength)
+        lines = self.player.attack(weapon, strength).splitlines()
+        if self._target_hp <= 0:
+            room.remove_monster(monster)
+            self._target = self._recovery = None
+            lines.append(f"{monster.name} is defeated!")
+            if self.loot is not None and self.loot_rng is not None:
+                for item in self.loot.roll_many(self.loot_rng, 1):
+                    room.add_item(item)
+                    lines.append(f"{monster.name} dropped {item.name}.")
+            return lines
+        if self._recovery is None and self._target_hp < monster.variant.hp():
+            self._recovery = MonsterRecovery(self)
+            self.scheduler.activate(room.key, self._recovery)
+        if self.combat_rng is not None and self.combat_rng.random() < MISS_CHANCE:
+            lines.append(f"{monster.name} misses!")
+            return lines
+        lines.append(monster.attack())
+        self.player.health -= monster.variant.attack_power()
+        if self.player.health <= 0:
+            self.finished = True
+            lines.append("You have been defeated. Game over.")
+        return lines
+
+    def _status(self, argument: str) -> List[str]:
+        player = self.player
+        lines = [f"Player: {player.name}, Health: {player.health}, Items: {len(player.inventory)}",
+                 f"Room: {self.current_room.name}"]
+        buffs = [f"{effect.value} +{bonus}" for effect in (PotionEffect.STRENGTH, PotionEffect.STAMINA)
+                 if (bonus := self.buffs.bonus(player, effect))]
+        if buffs:
+            lines.append(f"Buffs: {', '.join(buffs)}")
+        return lines
+
+    def _recover(self, recovery: MonsterRecovery) -> bool:
+        """Give one hp back to the monster fought, return whether it is still wounded."""
+        if recovery is not self._recovery:
+            return False
+        self._target_hp += 1
+        if self._target_hp >= self._target.variant.hp():
+            self._recovery = None
+            return False
+        return True
+
+    def _quit(self, argument: str) -> List[str]:
+        self.finished = True
+        return ["Farewell, hero!"]
+
+    @staticmethod
+    def _find(items: list, argument: str):
+        """Item designated by its index or its name."""
+        if argument.isdigit():
+            index = int(argument)
+            if index < len(items):
+                return items[index]
+        else:
+            if isinstance(items, Inventory):
+                item = items.first_named(argument)
+                if item is not None:
+                    return item
+            for item in items:
+                if item.name.lower() == argument.lower():
+                    return item
+        raise ValueError(f"No item {argument!r}")
@@ -0,0 +1,332 @@
+"""Monte-Carlo balance simulator: weapons against monsters, over a process pool.
+
+An encounter is a hero with one weapon fighting one monster until one of
+them falls, with the rules of `GameSession`: every round the hero swings
+(a broken weapon, a bow without arrows or a shield deals no damage) then the
+monster strikes back if it is still alive. The monster can miss its
+counterattack, which makes the outcome random; the hero never misses in a
+session, `Rules.player_miss` tries out rules where it does.
+
+Every (weapon, monster) pair is simulated `encounters` times in shards of
+`shard_size` encounters, each shard resolved with NumPy on a worker of a
+process pool. The stats of the weapons and monsters are packed once into a
+shared memory block that the workers attach to, instead of pickling the
+objects for every shard. Shards draw from seed sequences spawned from one
+seed, so a run gives the same report whatever the number of workers.
+
+`simulate()` yields the report after every finished shard, so long runs can
+be monitored:
+
+    python -m src.simulation.balance --encounters 1000000 --workers 8
+"""
+import argparse
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..combat.combat_engine import BOW, MELEE, SHIELD
+from ..models.weapon import Bow, Shield, Weapon, WeaponBrokenState
+from ..patterns.bridge.monster_bridge import Bokoblin, Hinox, Moblin, Monster
+from ..patterns.bridge.monster_variant import BlueVariant, RedVariant, WhiteVariant
+from ..patterns.builder.weapon_builder import AncientBowDirector, MasterSwordDirector
+from ..patterns.factory.item_factory import CommonItemFactory, LegendaryItemFactory, RareItemFactory
+from ..patterns.flyweight.monster_flyweight import MonsterVariantFactory
+from ..server.session import MISS_CHANCE
+
+WEAPON_DTYPE = np.dtype([("kind", np.int64), ("damage", np.int64), ("durability", np.int64),
+                         ("arrows", np.int64)])
+MONSTER_DTYPE = np.dtype([("hp", np.int64), ("attack", np.int64)])
+
+
+@dataclass(frozen=True)
+class Rules:
+    """Rules of an encounter."""
+    # Health of a new Player
+    health: int = 100
+    # Sessions have no miss chance for the hero
+    player_miss: float = 0.0
+    monster_miss: float = MISS_CHANCE
+    # Encounters still going after that many rounds are draws
+    max_rounds: int = 200
+
+
+def default_weapons() -> List[Weapon]:
+    """Weapons of the item factories and of the weapon directors."""
+    return [factory.create_weapon() for factory in (CommonItemFactory(), RareItemFactory(), LegendaryItemFactory())] \
+        + [MasterSwordDirector.construct(), AncientBowDirector.construct()]
+
+
+def default_monsters() -> List[Monster]:
+    """Every kind of monster in every variant."""
+    return [kind(MonsterVariantFactory.get(variant))
+            for kind in (Bokoblin, Moblin, Hinox) for variant in (RedVariant, BlueVariant, WhiteVariant)]
+
+
+def weapon_stats(weapons: Sequence[Weapon]) -> np.ndarray:
+    stats = np.zeros(len(weapons), dtype=WEAPON_DTYPE)
+    for row, weapon in zip(stats, weapons):
+        if isinstance(weapon, Shield):
+            row["kind"] = SHIELD
+        elif isinstance(weapon, Bow):
+            row["kind"], row["damage"], row["arrows"] = BOW, weapon.get_total_damage(), weapon.arrow_count
+        else:
+            row["kind"], row["damage"] = MELEE, weapon.get_total_damage()
+        row["durability"] = 0 if isinstance(weapon.state, WeaponBrokenState) else weapon.durability
+    return stats
+
+
+def monster_stats(monsters: Sequence[Monster]) -> np.ndarray:
+    stats = np.zeros(len(monsters), dtype=MONSTER_DTYPE)
+    for row, monster in zip(stats, monsters):
+        row["hp"], row["attack"] = monster.variant.hp(), monster.variant.attack_power()
+    return stats
+
+
+def fight(weapon: np.void, monster: np.void, rules: Rules, count: int,
+          rng: np.random.Generator) -> Tuple[int, int, np.ndarray, np.ndarray]:
+    """Resolve `count` encounters of a weapon against a monster.
+
+    Return the wins, the draws, the histogram of the rounds needed to win and
+    the histogram of the durability consumed in every encounter.
+    """
+    kind = int(weapon["kind"])
+    damage = int(weapon["damage"])
+    # Number of rounds during which the weapon deals damage
+    swings = int(weapon["durability"]) if kind == MELEE else int(weapon["arrows"]) if kind == BOW else 0
+    attack = int(monster["attack"])
+    hp = np.full(count, int(monster["hp"]), dtype=np.int64)
+    health = np.full(count, rules.health, dtype=np.int64)
+    bins = rules.max_rounds + 1
+    time_to_kill = np.zeros(bins, dtype=np.int64)
+    # Rounds fought by every encounter that ended, to derive the durability consumed
+    ended = np.zeros(bins, dtype=np.int64)
+    wins = 0
+    for round_number in range(1, bins):
+        if not len(hp):
+            break
+        if round_number <= swings:
+            hp -= damage * (rng.random(len(hp)) >= rules.player_miss)
+            won = hp <= 0
+            killed = int(won.sum())
+            if killed:
+                wins += killed
+                time_to_kill[round_number] += killed
+                ended[round_number] += killed
+                alive = ~won
+                hp, health = hp[alive], health[alive]
+        health -= attack * (rng.random(len(health)) >= rules.monster_miss)
+        lost = health <= 0
+        fallen = int(lost.sum())
+        if fallen:
+            ended[round_number] += fallen
+            alive = ~lost
+            hp, health = hp[alive], health[alive]
+    draws = len(hp)
+    ended[rules.max_rounds] += draws
+    # A weapon wears every round it is used: until it breaks, runs out of arrows, or for ever for a shield
+    rounds = np.arange(bins)
+    consumed = rounds if kind == SHIELD else np.minimum(rounds, swings)
+    durability = np.bincount(consumed, weights=ended, minlength=bins).astype(np.int64)
+    return wins, draws, time_to_kill, durability
+
+
+class BalanceReport:
+    """Outcome of the encounters of every weapon against every monster, merged shard by shard."""
+
+    def __init__(self, weapons: Sequence[str], monsters: Sequence[str], rules: Rules) -> None:
+        self.weapons = list(weapons)
+        self.monsters = list(monsters)
+        self.rules = rules
+        shape = (len(self.weapons), len(self.monsters))
+        self.encounters = np.zeros(shape, dtype=np.int64)
+        self.wins = np.zeros(shape, dtype=np.int64)
+        self.draws = np.zeros(shape, dtype=np.int64)
+        # Histograms by pair, bin i counts the encounters of i rounds or i uses of the weapon
+        self.time_to_kill = np.zeros(shape + (rules.max_rounds + 1,), dtype=np.int64)
+        self.durability = np.zeros(shape + (rules.max_rounds + 1,), dtype=np.int64)
+        self.shards = 0
+
+    @property
+    def total_encounters(self) -> int:
+        return int(self.encounters.sum())
+
+    def merge(self, weapon: int, monster: int, count: int, wins: int, draws: int, time_to_kill: np.ndarray,
+              durability: np.ndarray) -> None:
+        self.encounters[weapon, monster] += count
+        self.wins[weapon, monster] += wins
+        self.draws[weapon, monster] += draws
+        self.time_to_kill[weapon, monster] += time_to_kill
+        self.durability[weapon, monster] += durability
+        self.shards += 1
+
+    def win_rates(self) -> np.ndarray:
+        """Win rate of every pair, NaN for the pairs without encounters yet."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.wins / self.encounters
+
+    def mean_time_to_kill(self) -> np.ndarray:
+        """Average rounds needed to win, NaN for the pairs never won."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.time_to_kill @ np.arange(self.rules.max_rounds + 1) / self.wins
+
+    def mean_durability(self) -> np.ndarray:
+        """Average durability consumed by an encounter."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.durability @ np.arange(self.rules.max_rounds + 1) / self.encounters
+
+    def win_rate_histogram(self, bins: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """Histogram of the win rates of the pairs, and the edges of its bins."""
+        rates = self.win_rates()
+        return np.histogram(rates[~np.isnan(rates)], bins=bins, range=(0.0, 1.0))
+
+    def lines(self) -> List[str]:
+        """One line per pair: win rate, draws, mean time to kill and mean durability consumed."""
+        rates, kills, worn = self.win_rates(), self.mean_time_to_kill(), self.mean_durability()
+        width = max(map(len, self.weapons)) + max(map(len, self.monsters)) + 4
+        lines = [f"{'':<{width}}{'wins':>8}{'draws':>8}{'rounds to kill':>16}{'durability used':>17}"]
+        for row, weapon in enumerate(self.weapons):
+            for col, monster in enumerate(self.monsters):
+                draws = self.draws[row, col] / max(1, self.encounters[row, col])
+                kill = "-" if np.isnan(kills[row, col]) else f"{kills[row, col]:.2f}"
+                lines.append(f"{f'{weapon} vs {monster}':<{width}}{rates[row, col]:>8.1%}{draws:>8.1%}"
+                             f"{kill:>16}{worn[row, col]:>17.2f}")
+        return lines
+
+
+def _labels(names: Sequence[str]) -> List[str]:
+    """Names told apart by a number when several are the same."""
+    seen: Dict[str, int] = {}
+    labels = []
+    for name in names:
+        seen[name] = seen.get(name, 0) + 1
+        labels.append(name if seen[name] == 1 else f"{name} #{seen[name]}")
+    return labels
+
+
+# Specs of the worker, read from shared memory once by `_attach()`
+_weapons: Optional[np.ndarray] = None
+_monsters: Optional[np.ndarray] = None
+_rules: Optional[Rules] = None
+
+
+def _attach(name: str, weapons: int, monsters: int, rules: Rules) -> None:
+    global _weapons, _monsters, _rules
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        _weapons = np.ndarray(weapons, dtype=WEAPON_DTYPE, buffer=block.buf).copy()
+        _monsters = np.ndarray(monsters, dtype=MONSTER_DTYPE, buffer=block.buf,
+                               offset=weapons * WEAPON_DTYPE.itemsize).copy()
+    finally:
+        block.close()
+    _rules = rules
+
+
+def _run_shard(task: Tuple[int, int, int, np.random.SeedSequence]) -> tuple:
+    weapon, monster, count, seed = task
+    return (weapon, monster, count) + fight(_weapons[weapon], _monsters[monster], _rules, count,
+                                            np.random.default_rng(seed))
+
+
+class BalanceSimulator:
+    """Simulate encounters of every weapon against every monster."""
+
+    def __init__(self, weapons: Optional[Sequence[Weapon]] = None, monsters: Optional[Sequence[Monster]] = None,
+                 rules: Rules = Rules(), seed: int = 0, shard_size: int = 100_000) -> None:
+        self.weapons = list(weapons) if weapons is not None else default_weapons()
+        self.monsters = list(monsters) if monsters is not None else default_monsters()
+        if not self.weapons or not self.monsters:
+            raise ValueError("Balance needs at least a weapon and a monster")
+        if shard_size <= 0:
+            raise ValueError("The shard size must be positive")
+        self.rules = rules
+        self.seed = seed
+        self.shard_size = shard_size
+
+    def tasks(self, encounters: int) -> List[Tuple[int, int, int, np.random.SeedSequence]]:
+        """Shards of `encounters` encounters for every pair, each with its own seed."""
+        shards = [(weapon, monster, min(self.shard_size, encounters - start))
+                  for weapon in range(len(self.weapons)) for monster in range(len(self.monsters))
+                  for start in range(0, encounters, self.shard_size)]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(shards))
+        return [shard + (seed,) for shard, seed in zip(shards, seeds)]
+
+    def simulate(self, encounters: int, workers: Optional[int] = None) -> Iterator[BalanceReport]:
+        """Run `encounters` encounters per pair, yield the report, merged so far, after every shard.
+
+        `workers=0` runs the shards in this process.
+        """
+        # Checked on the call, not on the first report
+        if encounters <= 0:
+            raise ValueError("The number of encounters must be positive")
+        return self._simulate(encounters, workers)
+
+    def _simulate(self, encounters: int, workers: Optional[int]) -> Iterator[BalanceReport]:
+        report = BalanceReport(_labels([weapon.name for weapon in self.weapons]),
+                               _labels([f"{monster.name} ({monster.variant.color})" for monster in self.monsters]),
+                               self.rules)
+        weapons, monsters = weapon_stats(self.weapons), monster_stats(self.monsters)
+        block = shared_memory.SharedMemory(create=True, size=weapons.nbytes + monsters.nbytes)
+        try:
+            block.buf[:weapons.nbytes] = weapons.tobytes()
+            block.buf[weapons.nbytes:weapons.nbytes + monsters.nbytes] = monsters.tobytes()
+            specs = (block.name, len(weapons), len(monsters), self.rules)
+            tasks = self.tasks(encounters)
+            if workers == 0:
+                _attach(*specs)
+                for task in tasks:
+                    report.merge(*_run_shard(task))
+                    yield report
+                return
+            with ProcessPoolExecutor(workers or os.cpu_count(), initializer=_attach, initargs=specs) as pool:
+                yield from self._collect(pool, tasks, report)
+        finally:
+            block.close()
+            block.unlink()
+
+    @staticmethod
+    def _collect(pool: Executor, tasks: list, report: BalanceReport) -> Iterator[BalanceReport]:
+        futures = [pool.submit(_run_shard, task) for task in tasks]
+        try:
+            for future in as_completed(futures):
+                report.merge(*future.result())
+                yield report
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def run(self, encounters: int, workers: Optional[int] = None) -> BalanceReport:
+        """Run the whole simulation and return the final report."""
+        report = None
+        for report in self.simulate(encounters, workers):
+            pass
+        return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulate encounters of every weapon against every monster")
+    parser.add_argument("--encounters", type=int, default=1_000_000, help="encounters per weapon and monster")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, 0 to run in this process")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--every", type=int, default=50, help="print the progress every that many shards")
+    args = parser.parse_args()
+    if args.encounters <= 0:
+        parser.error("--encounters must be positive")
+
+    simulator = BalanceSimulator(seed=args.seed)
+    total = args.encounters * len(simulator.weapons) * len(simulator.monsters)
+    for report in simulator.simulate(args.encounters, args.workers):
+        if report.shards % args.every == 0:
+            print(f"{report.total_encounters:>12,} / {total:,} encounters", flush=True)
+    print("\n".join(report.lines()))
+    counts, edges = report.win_rate_histogram()
+    print("\nWin rates of the pairs:")
+    for low, high, pairs in zip(edges, edges[1:], counts):
+        print(f"{low:>4.0%} - {high:>4.0%}  {'#' * int(pairs)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""Record game sessions and replay them exactly.
+
+A recording holds what a session depends on: a master seed, from which the
+seeds of the random streams of the world generation, the loot and the
+combat are derived, the world size, the commands of the player and the
+number of simulation ticks between two commands, and the name and health
+the player starts with (a recorded player must start with an empty
+inventory). Replaying it runs the
+same session headless, as fast as possible. `Game` and `GameServer` play
+their sessions through a `Simulation` too, so a game they recorded is
+replayed exactly.
+
+While recording, a hash of the state (player, current room and weapons) is
+stored after every `hash_every` commands; a replay compares its own hashes
+with them and stops at the first divergence. Replays are independent, so
+`replay_many()` spreads them over a process pool.
+
+The loot table and the random streams of the loot and the combat are only
+built when they are first drawn from, so NumPy is not imported by a game
+where nothing has been fought yet.
+"""
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from ..models.player import Player
+from ..models.room import Room
+from ..models.weapon import Weapon
+from ..persistence.state import item_state
+from ..server.session import GameSession
+from ..world.chunked_world import ChunkedWorld
+from ..world.room_templates import RoomTemplates
+from ..world.world_generator import WorldGenerator
+
+STREAMS = ("world", "loot", "combat")
+
+
+def derive_seed(seed: int, stream: str) -> int:
+    """Seed of a random stream, stable across processes and runs."""
+    digest = hashlib.blake2b(f"{seed}:{stream}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class _Deferred:
+    """Object built by `factory` when one of its attributes is first used."""
+    __slots__ = ("_factory", "_target")
+
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        self._factory = factory
+        self._target = None
+
+    def __getattr__(self, name: str) -> Any:
+        target = self._target
+        if target is None:
+            target = self._target = self._factory()
+        return getattr(target, name)
+
+
+def _loot_table() -> Any:
+    from ..loot.loot_table import default_loot_table
+    return default_loot_table()
+
+
+def _stream(seed: int) -> Any:
+    """Random generator of a stream, NumPy is imported when it is first drawn from."""
+    def make() -> Any:
+        from ..loot.loot_table import make_rng
+        return make_rng(seed)
+    return _Deferred(make)
+
+
+def _digest(state: Any) -> str:
+    return hashlib.blake2b(repr(state).encode(), digest_size=16).hexdigest()
+
+
+def hash_weapon(weapon: Weapon) -> str:
+    return _digest(item_state(weapon))
+
+
+def hash_player(player: Player) -> str:
+    """Hash of the player and of its inventory, weapons included."""
+    return _digest((player.name, player.health, [item_state(item) for item in player.inventory]))
+
+
+def hash_room(room: Room) -> str:
+    return _digest((room.key, room.name, [item_state(item) for item in room.items],
+                    [(monster.name, monster.variant.color) for monster in room.monsters],
+                    sorted((direction, other.name) for direction, other in room.connections.items())))
+
+
+def state_hash(session: GameSession) -> str:
+    """Hash of the state a session can diverge on."""
+    return _digest((hash_player(session.player), hash_room(session.current_room), session.target_hp,
+                    session.finished))
+
+
+@dataclass
+class Recording:
+    """Everything needed to replay a session."""
+    seed: int
+    size: int = 1000
+    ticks_per_command: int = 20
+    hash_every: int = 1
+    # Rooms kept loaded, evicted rooms are rebuilt with their changes
+    chunk_size: int = 8
+    max_chunks: int = 16
+    # Player the session starts with
+    player_name: str = "Link"
+    player_health: int = 100
+    seeds: Dict[str, int] = field(default_factory=dict)
+    commands: List[str] = field(default_factory=list)
+    # State hash after a command, by number of commands run
+    hashes: Dict[int, str] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        for stream in STREAMS:
+            self.seeds.setdefault(stream, derive_seed(self.seed, stream))
+
+    def dumps(self) -> str:
+        return json.dumps({"seed": self.seed, "size": self.size, "ticks_per_command": self.ticks_per_command,
+                           "hash_every": self.hash_every, "chunk_size": self.chunk_size,
+                           "max_chunks": self.max_chunks, "player_name": self.player_name,
+                           "player_health": self.player_health, "seeds": self.seeds, "commands": self.commands,
+                           "hashes": {str(count): value for count, value in self.hashes.items()}})
+
+    @classmethod
+    def loads(cls, text: str) -> "Recording":
+        data = json.loads(text)
+        data["hashes"] = {int(count): value for count, value in data["hashes"].items()}
+        return cls(**data)
+
+
+class Simulation:
+    """Session built from the seeds of a recording.
+
+    With `shared`, the room templates are shared with the other simulations
+    of the same world seed, as the sessions of a server do; the rooms are the
+    same either way. Without `player`, the session starts with the player
+    of the recording.
+    """
+
+    def __init__(self, recording: Recording, player: Optional[Player] = None, shared: bool = False) -> None:
+        seeds = recording.seeds
+        self.recording = recording
+        size = recording.size
+        if shared:
+            generator: Any = RoomTemplates.shared(seeds["world"], size, size)
+        else:
+            generator = WorldGenerator(seeds["world"], size, size)
+        self.world = ChunkedWorld(generator, recording.chunk_size, recording.max_chunks)
+        if player is None:
+            player = Player(name=recording.player_name, health=recording.player_health)
+        self.session = GameSession(self.world, player, _Deferred(_loot_table), _stream(seeds["loot"]),
+                                   _stream(seeds["combat"]))
+        self.scheduler = self.session.scheduler
+
+    def run(self, line: str) -> List[str]:
+        """Advance the simulation, then run a command, raise ValueError when it is invalid."""
+        self.scheduler.fast_forward(self.recording.ticks_per_command)
+        return self.session.execute(line)
+
+    def execute(self, line: str) -> List[str]:
+        """Like `run()`, errors are answers too."""
+        try:
+            return self.run(line)
+        except ValueError as error:
+            return [f"ERR {error}"]
+
+
+class Recorder(Simulation):
+    """Play a session while recording it."""
+
+    def __init__(self, seed: int, size: int = 1000, ticks_per_command: int = 20, hash_every: int = 1,
+                 chunk_size: int = 8, max_chunks: int = 16, player: Optional[Player] = None,
+                 shared: bool = False) -> None:
+        recording = Recording(seed, size, ticks_per_command, hash_every, chunk_size, max_chunks)
+        if player is not None:
+            recording.player_name, recording.player_health = player.name, player.health
+        super().__init__(recording, player, shared)
+
+    def run(self, line: str) -> List[str]:
+        try:
+            return super().run(line)
+        finally:
+            recording = self.recording
+            recording.commands.append(line)
+            if len(recording.commands) % recording.hash_every == 0:
+                recording.hashes[len(recording.commands)] = state_hash(self.session)
+
+
+@dataclass
+class ReplayResult:
+    """Outcome of a replay, `diverged_at` is the number of commands run when the state first differed."""
+    seed: int
+    commands: int
+    final_hash: str
+    elapsed: float
+    diverged_at: Optional[int] = None
+    expected: Optional[str] = None
+    actual: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.diverged_at is None
+
+
+def replay(recording: Recording) -> ReplayResult:
+    """Run a recorded session again, checking its state against the recorded hashes."""
+    start = time.perf_counter()
+    simulation = Simulation(recording)
+    session = simulation.session
+    run = 0
+    for line in recording.commands:
+        simulation.execute(line)
+        run += 1
+        expected = recording.hashes.get(run)
+        if expected is not None:
+            actual = state_hash(session)
+            if actual != expected:
+                return ReplayResult(recording.seed, run, actual, time.perf_counter() - start, run, expected, actual)
+    return ReplayResult(recording.seed, run, state_hash(session), time.perf_counter() - start)
+
+
+def replay_many(recordings: Iterable[Recording], workers: Optional[int] = None) -> List[ReplayResult]:
+    """Replay recordings in parallel, results are in the order of the recordings."""
+    recordings = list(recordings)
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(replay, recordings, chunksize=max(1, len(recordings) // (4 * workers))))
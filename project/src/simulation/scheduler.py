@@ -0,0 +1,220 @@
+"""Fixed timestep scheduler running the simulation of a game.
+
+The simulation advances by ticks of `timestep` seconds, whatever the frame
+rate of the display: `run()` and `sync()` catch up with the wall clock,
+running as many ticks as the elapsed time requires, and rendering happens
+apart, at most once per frame.
+`fast_forward()` runs ticks back to back without rendering or waiting, for
+headless simulations.
+
+Every tick:
+
+1. timed events that are due (respawns, end of potion buffs) are run, in
+   order, from a priority queue;
+2. the active rooms are updated, a room is only visited while an actor of
+   it has something to do, so idle rooms cost nothing;
+3. events published during the tick are dispatched on the event bus.
+"""
+import heapq
+import time
+from itertools import count
+from typing import Any, Callable, Dict, Hashable, List, Optional, Protocol, Tuple
+
+from ..models.player import Player
+from ..models.potion import Potion, PotionEffect
+from ..patterns.observer.event_bus import Event, EventBus, ROOM_MONSTER_REMOVED
+
+
+class Actor(Protocol):
+    """Something updated every tick while it is active."""
+
+    def update(self, scheduler: "Scheduler") -> bool:
+        """Advance by one tick, return whether there is still something to do."""
+        ...
+
+
+class Timer:
+    """Handle of a timed event, see `Scheduler.schedule()`."""
+    __slots__ = ("tick", "callback", "args", "period", "cancelled")
+
+    def __init__(self, tick: int, callback: Callable[..., Any], args: Tuple[Any, ...], period: int) -> None:
+        self.tick = tick
+        self.callback = callback
+        self.args = args
+        self.period = period
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class Scheduler:
+    """Fixed timestep simulation loop with timed events and active rooms."""
+
+    def __init__(self, timestep: float = 1 / 20, events: Optional[EventBus] = None,
+                 clock: Callable[[], float] = time.perf_counter) -> None:
+        if timestep <= 0:
+            raise ValueError("The timestep must be positive")
+        self.timestep = timestep
+        self.events = events if events is not None else EventBus()
+        self.clock = clock
+        self.tick = 0
+        self.running = False
+        # Wall clock time of the last sync, and the time not simulated yet
+        self._synced: Optional[float] = None
+        self._lag = 0.0
+        # (due tick, insertion order, timer), cancelled timers are dropped when they come up
+        self._timers: List[Tuple[int, int, Timer]] = []
+        self._order = count()
+        # Actors of the rooms with something to process, by room key
+        self._active: Dict[Hashable, List[Actor]] = {}
+
+    @property
+    def time(self) -> float:
+        """Simulated time, in seconds."""
+        return self.tick * self.timestep
+
+    @property
+    def active_rooms(self) -> int:
+        return len(self._active)
+
+    @property
+    def pending_timers(self) -> int:
+        return len(self._timers)
+
+    def ticks(self, seconds: float) -> int:
+        """Number of ticks in a duration, at least one."""
+        return max(1, round(seconds / self.timestep))
+
+    def schedule(self, delay: float, callback: Callable[..., Any], *args: Any) -> Timer:
+        """Call `callback(*args)` once, `delay` seconds from now."""
+        return self._push(Timer(self.tick + self.ticks(delay), callback, args, 0))
+
+    def schedule_every(self, period: float, callback: Callable[..., Any], *args: Any) -> Timer:
+        """Call `callback(*args)` every `period` seconds until the timer is cancelled."""
+        ticks = self.ticks(period)
+        return self._push(Timer(self.tick + ticks, callback, args, ticks))
+
+    def _push(self, timer: Timer) -> Timer:
+        heapq.heappush(self._timers, (timer.tick, next(self._order), timer))
+        return timer
+
+    def activate(self, room_key: Hashable, actor: Actor) -> None:
+        """Update an actor of a room every tick, until it has nothing left to do."""
+        self._active.setdefault(room_key, []).append(actor)
+
+    def step(self) -> None:
+        """Advance the simulation by one tick."""
+        self.tick += 1
+        timers = self._timers
+        while timers and timers[0][0] <= self.tick:
+            _, _, timer = heapq.heappop(timers)
+            if timer.cancelled:
+                continue
+            timer.callback(*timer.args)
+            if timer.period and not timer.cancelled:
+                timer.tick += timer.period
+                self._push(timer)
+        if self._active:
+            idle = []
+            for room_key, actors in self._active.items():
+                actors[:] = [actor for actor in actors if actor.update(self)]
+                if not actors:
+                    idle.append(room_key)
+            for room_key in idle:
+                del self._active[room_key]
+        self.events.dispatch()
+
+    def fast_forward(self, ticks: int) -> None:
+        """Run ticks back to back, without waiting for the wall clock."""
+        step = self.step
+        for _ in range(ticks):
+            step()
+
+    def sync(self, max_ticks: Optional[int] = None) -> int:
+        """Run the ticks of the wall clock time elapsed since the last sync, return their number.
+
+        At most `max_ticks` are run, the simulation falls behind rather than
+        piling up ticks after a pause.
+        """
+        now = self.clock()
+        if self._synced is None:
+            self._synced = now
+            return 0
+        self._lag += now - self._synced
+        self._synced = now
+        ticks = int(self._lag / self.timestep)
+        if max_ticks is not None and ticks > max_ticks:
+            ticks = max_ticks
+            self._lag = ticks * self.timestep
+        self._lag -= ticks * self.timestep
+        self.fast_forward(ticks)
+        return ticks
+
+    def run(self, render: Optional[Callable[["Scheduler"], None]] = None, max_frame_ticks: int = 10,
+            until: Optional[Callable[["Scheduler"], bool]] = None) -> None:
+        """Run ticks in real time until `stop()` or `until(scheduler)`, rendering once per frame."""
+        self.running = True
+        self.sync()
+        while self.running and not (until is not None and until(self)):
+            start = self.clock()
+            self.sync(max_frame_ticks)
+            if render is not None:
+                render(self)
+            time.sleep(max(0.0, self.timestep - self._lag - (self.clock() - start)))
+
+    def stop(self) -> None:
+        self.running = False
+
+
+class MonsterRespawner:
+    """Respawn the monsters removed from the rooms of a world after a delay.
+
+    The rooms must publish on the bus of the scheduler (`world.events`), and
+    the respawner must be kept referenced, the bus only holds it weakly.
+    """
+
+    def __init__(self, scheduler: Scheduler, world: Any, delay: float = 30.0) -> None:
+        self.scheduler = scheduler
+        self.world = world
+        self.delay = delay
+        scheduler.events.subscribe(ROOM_MONSTER_REMOVED, self.on_removed)
+
+    def on_removed(self, event: Event) -> None:
+        self.scheduler.schedule(self.delay, self.respawn, event.source.key, event.value)
+
+    def respawn(self, room_key: Hashable, monster: Any) -> None:
+        # The room may have been unloaded since, the world gives the current one
+        self.world.room_at(room_key).add_monster(monster)
+
+
+class PotionBuffs:
+    """Effects of the potions drunk by players, lasting buffs expire through timed events."""
+
+    def __init__(self, scheduler: Scheduler, duration: float = 60.0) -> None:
+        self.scheduler = scheduler
+        self.duration = duration
+        # Bonus of every effect, by player id
+        self._bonuses: Dict[int, Dict[PotionEffect, int]] = {}
+
+    def drink(self, player: Player, potion: Potion) -> str:
+        """Apply a potion: healing is instant, other effects last `duration` seconds."""
+        if potion.effect is PotionEffect.HEAL:
+            player.health += potion.power
+        else:
+            bonuses = self._bonuses.setdefault(id(player), {})
+            bonuses[potion.effect] = bonuses.get(potion.effect, 0) + potion.power
+            self.scheduler.schedule(self.duration, self._expire, id(player), potion.effect, potion.power)
+        return potion.use()
+
+    def bonus(self, player: Player, effect: PotionEffect) -> int:
+        """Current bonus of an effect for a player."""
+        return self._bonuses.get(id(player), {}).get(effect, 0)
+
+    def _expire(self, player_id: int, effect: PotionEffect, power: int) -> None:
+        bonuses = self._bonuses[player_id]
+        bonuses[effect] -= power
+        if not bonuses[effect]:
+            del bonuses[effect]
+            if not bonuses:
+                del self._bonuses[player_id]
@@ -0,0 +1,184 @@
+"""Procedural world loaded chunk by chunk.
+
+The grid of a `WorldGenerator` is split into square chunks. A chunk is only
+materialized when one of its rooms is entered, and the least recently used
+chunks are evicted once too many are loaded. Inside a chunk rooms are
+directly connected; exits leading to another chunk are `RoomRef`s resolved
+through the world, so an evicted chunk is not kept alive by its neighbours.
+
+The generator can be replaced by `RoomTemplates` shared between worlds of the
+same seed, rooms are then copied from templates instead of being generated.
+
+Rooms changed while loaded (items taken, monsters killed) keep their state
+when their chunk is evicted and loaded again.
+"""
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+
+from ..models.item import Item
+from ..models.monster import Monster
+from ..models.room import Room, RoomRef
+from .world_generator import WorldGenerator
+
+if TYPE_CHECKING:
+    from ..patterns.observer.event_bus import EventBus
+    from ..persistence.journal import Journal
+    from .room_templates import RoomTemplates
+
+Position = Tuple[int, int]
+ChunkKey = Tuple[int, int]
+
+
+class _Chunk:
+    """Rooms of a chunk, with the identity of their initial content."""
+    __slots__ = ("rooms", "pristine")
+
+    def __init__(self) -> None:
+        self.rooms: Dict[Position, Room] = {}
+        # None for rooms restored from a previous change, which are always kept
+        self.pristine: Dict[Position, Optional[Tuple[Tuple[int, ...], Tuple[int, ...]]]] = {}
+
+
+class ChunkedWorld:
+    """World whose rooms are materialized on first entry and evicted with an LRU policy."""
+
+    def __init__(self, generator: Union[WorldGenerator, "RoomTemplates"], chunk_size: int = 16, max_chunks: int = 64) -> None:
+        if chunk_size <= 0 or max_chunks < 2:
+            raise ValueError("Chunk size must be positive and at least two chunks must fit in memory")
+        self.generator = generator
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self._chunks: "OrderedDict[ChunkKey, _Chunk]" = OrderedDict()
+        # Content of the changed rooms of evicted chunks
+        self._changed: Dict[Position, Tuple[List[Item], List[Monster]]] = {}
+        self._pinned: Optional[ChunkKey] = None
+        self._journal: Optional["Journal"] = None
+        self._events: Optional["EventBus"] = None
+
+    def __len__(self) -> int:
+        return len(self.generator)
+
+    @property
+    def loaded_chunks(self) -> int:
+        return len(self._chunks)
+
+    @property
+    def loaded_rooms(self) -> int:
+        return sum(len(chunk.rooms) for chunk in self._chunks.values())
+
+    @property
+    def journal(self) -> Optional["Journal"]:
+        """Journal recording the changes of the loaded rooms."""
+        return self._journal
+
+    @journal.setter
+    def journal(self, journal: Optional["Journal"]) -> None:
+        self._journal = journal
+        for chunk in self._chunks.values():
+            for room in chunk.rooms.values():
+                room.journal = journal
+
+    @property
+    def events(self) -> Optional["EventBus"]:
+        """Bus publishing the changes of the loaded rooms."""
+        return self._events
+
+    @events.setter
+    def events(self, events: Optional["EventBus"]) -> None:
+        self._events = events
+        for chunk in self._chunks.values():
+            for room in chunk.rooms.values():
+                room.events = events
+
+    def start_room(self) -> Room:
+        """Room where the hero starts."""
+        return self.enter((0, 0))
+
+    def room_at(self, position: Position) -> Room:
+        """Return the room at a position, loading its chunk when needed."""
+        x, y = position
+        if not (0 <= x < self.generator.width and 0 <= y < self.generator.height):
+            raise KeyError(f"No room at {position}")
+        key = (x // self.chunk_size, y // self.chunk_size)
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            chunk = self._load(key)
+        else:
+            self._chunks.move_to_end(key)
+        return chunk.rooms[position]
+
+    def enter(self, position: Position) -> Room:
+        """Return the room at a position and keep its chunk loaded while the hero is inside."""
+        room = self.room_at(position)
+        self._pinned = (position[0] // self.chunk_size, position[1] // self.chunk_size)
+        return room
+
+    def resolve(self, room: Union[Room, RoomRef]) -> Room:
+        """Return the loaded room behind a connection."""
+        if isinstance(room, RoomRef):
+            return self.room_at(room.key)
+        return room
+
+    def move(self, room: Room, direction: str) -> Optional[Room]:
+        """Enter the room reached by taking an exit, None when there is no such exit."""
+        target = room.connections.get(direction)
+        if target is None:
+            return None
+        return self.enter(target.key if isinstance(target, RoomRef) else target.position)
+
+    def changed_rooms(self) -> Dict[Position, Tuple[List[Item], List[Monster]]]:
+        """Content of every room which differs from the generated one."""
+        changed = dict(self._changed)
+        for chunk in self._chunks.values():
+            for position, room in chunk.rooms.items():
+                pristine = chunk.pristine[position]
+                if pristine is None or pristine != (tuple(map(id, room.items)), tuple(map(id, room.monsters))):
+                    changed[position] = (room.items, room.monsters)
+        return changed
+
+    def restore_changes(self, changed: Dict[Position, Tuple[List[Item], List[Monster]]]) -> None:
+        """Apply room contents saved by `changed_rooms()`, before any chunk is loaded."""
+        if self._chunks:
+            raise RuntimeError("Changes must be restored before loading any chunk")
+        self._changed.update(changed)
+
+    def _load(self, key: ChunkKey) -> _Chunk:
+        generator = self.generator
+        size = self.chunk_size
+        x_range = range(key[0] * size, min((key[0] + 1) * size, generator.width))
+        y_range = range(key[1] * size, min((key[1] + 1) * size, generator.height))
+        chunk = _Chunk()
+        rooms = chunk.rooms
+        for y in y_range:
+            for x in x_range:
+                room = generator.create_room(x, y)
+                changed = self._changed.pop((x, y), None)
+                if changed is not None:
+                    room.items, room.monsters = changed
+                    chunk.pristine[(x, y)] = None
+                else:
+                    chunk.pristine[(x, y)] = (tuple(map(id, room.items)), tuple(map(id, room.monsters)))
+                room.journal = self._journal
+                room.events = self._events
+                rooms[(x, y)] = room
+        for (x, y), room in rooms.items():
+            for direction, position in generator.exits(x, y).items():
+                neighbour = rooms.get(position)
+                if neighbour is None:
+                    neighbour = RoomRef(generator.room_name(*position), position, self.room_at)
+                room.connect(direction, neighbour)
+
+        self._chunks[key] = chunk
+        while len(self._chunks) > self.max_chunks:
+            self._evict()
+        return chunk
+
+    def _evict(self) -> None:
+        for key in self._chunks:
+            if key != self._pinned:
+                break
+        chunk = self._chunks.pop(key)
+        for position, room in chunk.rooms.items():
+            pristine = chunk.pristine[position]
+            if pristine is None or pristine != (tuple(map(id, room.items)), tuple(map(id, room.monsters))):
+                self._changed[position] = (room.items, room.monsters)
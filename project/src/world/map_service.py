@@ -1,17 +1,34 @@
 """Service to build a world"""
+from typing import List
 from ..models.room import Room
 from ..models.monster import Monster
 from ..models.item import Item
 from ..patterns.bridge.monster_variant import RedVariant, BlueVariant
 from ..patterns.bridge.monster_bridge import Bokoblin, Moblin
-from ..patterns.factory.item_factory import CommonItemFactory, RareItemFactory, LegendaryItemFactory, WeaponFactory
+from ..patterns.flyweight.monster_flyweight import MonsterVariantFactory
+from ..patterns.factory.item_factory import CommonItemFactory
+from .chunked_world import ChunkedWorld
+from .room_templates import RoomTemplates
+from .world_generator import WORLD_SEED, WorldGenerator
+
+# Loot table modifiers by kind of room, weights of matching entries are multiplied
+ROOM_LOOT_MODIFIERS = {
+    "forest": {"weapon": 2.0, "key": 0.0},
+    "cave": {"potion": 3.0, "key": 0.0},
+    "castle": {"rare": 3.0, "legendary": 6.0, "key": 0.0},
+}
+
 
 class MapService:
     """Service class for building and managing a map of rooms with monsters and items."""
 
     @staticmethod
-    def build_world() -> None:
-        """Build the game world with rooms, monsters, and items."""
+    def build_world(seed: int = WORLD_SEED) -> List[Room]:
+        """Build the game world with rooms, monsters, and items.
+
+        Loot is drawn from the default loot table, the same seed gives the same loot,
+        so the world is always the same unless another seed is given.
+        """
 
         #TODO: replace with factory pattern to create room  
         room1 = Room(
@@ -38,15 +55,32 @@ class MapService:
         # TODO: maybe CoR pattern can help us create our world instead of doing it manually?
         # populate rooms with monsters and items
         # TODO: have a treasur box in last room that can only be opened with a key
-        room1.items.append(CommonItemFactory().create_weapon())
+        # NumPy is only loaded by the worlds using loot tables
+        from ..loot.loot_table import default_loot_table, make_rng
+        loot = default_loot_table()
+        rng = make_rng(seed)
+        room1.items.extend(loot.roll_many(rng, 2, ROOM_LOOT_MODIFIERS["forest"]))
+        # The key is needed to progress, it is not left to chance
         room1.items.append(CommonItemFactory().create_key())
 
-        room2.items.append(RareItemFactory().create_potion())
-        room2.monsters.append(Bokoblin(RedVariant()))
+        room2.items.extend(loot.roll_many(rng, 1, ROOM_LOOT_MODIFIERS["cave"]))
+        room2.monsters.append(Bokoblin(MonsterVariantFactory.get(RedVariant)))
         
-        room3.items.append(RareItemFactory().create_weapon())
-        room3.monsters.append(Moblin(BlueVariant()))
+        room3.items.extend(loot.roll_many(rng, 2, ROOM_LOOT_MODIFIERS["castle"]))
+        room3.monsters.append(Moblin(MonsterVariantFactory.get(BlueVariant)))
 
         return [room1, room2, room3]
 
 
+
+
+    @staticmethod
+    def build_chunked_world(seed: int, width: int, height: int, chunk_size: int = 16, max_chunks: int = 64) -> ChunkedWorld:
+        """Build a procedural world whose rooms are only loaded when entered."""
+        return ChunkedWorld(WorldGenerator(seed, width, height), chunk_size, max_chunks)
+
+
+    @staticmethod
+    def build_shared_world(seed: int, width: int, height: int, chunk_size: int = 16, max_chunks: int = 64) -> ChunkedWorld:
+        """Build a procedural world whose room templates are shared with the other worlds of the same seed."""
+        return ChunkedWorld(RoomTemplates.shared(seed, width, height), chunk_size, max_chunks)
@@ -0,0 +1,98 @@
+"""Read-only room templates shared by the worlds built from the same seed.
+
+Every game session owns its world, but sessions playing the same seed would
+generate the same rooms over and over. `RoomTemplates` generates each room
+once and keeps it as an immutable template; a `ChunkedWorld` built on the
+templates only copies the item and monster lists of a room when loading it.
+
+Items and monsters themselves are shared between the sessions: they must be
+copied before being changed, a session copies an item when the hero takes it.
+"""
+from collections import OrderedDict
+from typing import Dict, Tuple
+from weakref import WeakValueDictionary
+
+from ..models.room import Room
+from .world_generator import WorldGenerator
+
+Position = Tuple[int, int]
+
+
+class RoomTemplate:
+    """Generated content and exits of a room."""
+    __slots__ = ("name", "items", "monsters", "exits")
+
+    def __init__(self, name: str, items: tuple, monsters: tuple, exits: Tuple[Tuple[str, Position], ...]) -> None:
+        self.name = name
+        self.items = items
+        self.monsters = monsters
+        self.exits = exits
+
+
+class RoomTemplates:
+    """Cache of the rooms of a generator, usable in place of the generator by `ChunkedWorld`."""
+
+    # Templates in use, by (seed, width, height), freed once no world uses them
+    _shared: "WeakValueDictionary[Tuple[int, int, int], RoomTemplates]" = WeakValueDictionary()
+
+    def __init__(self, generator: WorldGenerator, max_rooms: int = 1 << 16) -> None:
+        self.generator = generator
+        self.max_rooms = max_rooms
+        self._templates: "OrderedDict[Position, RoomTemplate]" = OrderedDict()
+
+    @classmethod
+    def shared(cls, seed: int, width: int, height: int) -> "RoomTemplates":
+        """Return the templates of a seed, shared with every world of the same seed."""
+        key = (seed, width, height)
+        templates = cls._shared.get(key)
+        if templates is None:
+            templates = cls._shared[key] = cls(WorldGenerator(seed, width, height))
+        return templates
+
+    @property
+    def seed(self) -> int:
+        return self.generator.seed
+
+    @property
+    def width(self) -> int:
+        return self.generator.width
+
+    @property
+    def height(self) -> int:
+        return self.generator.height
+
+    def __len__(self) -> int:
+        return len(self.generator)
+
+    @property
+    def cached_rooms(self) -> int:
+        return len(self._templates)
+
+    def template(self, x: int, y: int) -> RoomTemplate:
+        """Return the template of a cell, generating it on first use."""
+        template = self._templates.get((x, y))
+        if template is not None:
+            self._templates.move_to_end((x, y))
+            return template
+        room = self.generator.create_room(x, y)
+        template = RoomTemplate(room.name, tuple(room.items), tuple(room.monsters),
+                                tuple(self.generator.exits(x, y).items()))
+        self._templates[(x, y)] = template
+        if len(self._templates) > self.max_rooms:
+            self._templates.popitem(last=False)
+        return template
+
+    def create_room(self, x: int, y: int) -> Room:
+        """Create the room of a cell from its template, without its connections."""
+        template = self.template(x, y)
+        return Room(name=template.name, items=list(template.items), monsters=list(template.monsters),
+                    position=(x, y))
+
+    def exits(self, x: int, y: int) -> Dict[str, Position]:
+        """Positions of the rooms reachable from a cell, by direction."""
+        return dict(self.template(x, y).exits)
+
+    def room_name(self, x: int, y: int) -> str:
+        """Name of the room of a cell."""
+        template = self._templates.get((x, y))
+        return template.name if template is not None else self.generator.room_name(x, y)
@@ -0,0 +1,169 @@
+"""Seeded procedural world generation.
+
+The world is a `width` x `height` grid of rooms. Every cell is generated from
+a hash of (seed, x, y) only, so any room can be rebuilt on its own and the
+same seed always gives the same world:
+
+- a cell links itself to its west and/or south neighbour, with at least one
+  of both when available, which keeps the whole grid connected;
+- its items come from the rarity factories, its monsters from the bridge
+  classes with flyweight variants.
+
+Streamed rooms reference their neighbours through `RoomRef`, otherwise every
+room generated so far would stay reachable, and alive, through its exits.
+"""
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..models.item import Item
+from ..models.room import Room, RoomRef
+from ..patterns.bridge.monster_bridge import Bokoblin, Moblin, Hinox, Monster
+from ..patterns.bridge.monster_variant import RedVariant, BlueVariant, WhiteVariant
+from ..patterns.factory.item_factory import CommonItemFactory, RareItemFactory, LegendaryItemFactory, ItemFactory
+from ..patterns.flyweight.monster_flyweight import MonsterVariantFactory
+
+# Seed of the default world, the one `Game` plays and `MapService` fills with loot
+WORLD_SEED = 42
+# Moving north increases y, moving east increases x
+DIRECTIONS: Dict[str, Tuple[int, int]] = {
+    "north": (0, 1),
+    "south": (0, -1),
+    "east": (1, 0),
+    "west": (-1, 0),
+}
+
+_BIOMES = ("Ancient Forest", "Dark Cave", "Misty Swamp", "Ruined Shrine", "Frozen Peak", "Desert Canyon",
+           "Sunken Temple", "Lost Woods", "Volcanic Crater", "Abandoned Village")
+_FACTORIES: Tuple[ItemFactory, ...] = (CommonItemFactory(), RareItemFactory(), LegendaryItemFactory())
+# Cumulative rarity odds out of 100: 70% common, 25% rare, 5% legendary
+_FACTORY_ODDS = (70, 95, 100)
+_MONSTERS = (Bokoblin, Moblin, Hinox)
+_VARIANTS = (RedVariant, BlueVariant, WhiteVariant)
+
+_MASK = (1 << 64) - 1
+# Salts separating the random streams of a cell
+_LINKS = 1
+_CONTENT = 2
+
+Resolver = Callable[[Tuple[int, int]], Room]
+
+
+def _mix(seed: int, x: int, y: int, salt: int) -> int:
+    """Hash a cell into 64 bits (splitmix64 finalizer)."""
+    value = (seed * 0x9E3779B97F4A7C15 + x * 0xBF58476D1CE4E5B9 + y * 0x94D049BB133111EB + salt) & _MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+
+class WorldGenerator:
+    """Deterministic generator of a grid of rooms."""
+
+    def __init__(self, seed: int, width: int, height: int, link_chance: float = 0.6) -> None:
+        if width <= 0 or height <= 0:
+            raise ValueError("World dimensions must be positive")
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self._link_threshold = int(link_chance * 1024)
+
+    def __len__(self) -> int:
+        return self.width * self.height
+
+    def links(self, x: int, y: int) -> Tuple[bool, bool]:
+        """Whether the cell opens to its west and to its south neighbour."""
+        has_west, has_south = x > 0, y > 0
+        bits = _mix(self.seed, x, y, _LINKS)
+        west = has_west and (bits & 1023) < self._link_threshold
+        south = has_south and ((bits >> 10) & 1023) < self._link_threshold
+        if not west and not south and (has_west or has_south):
+            # Forced link, to keep the grid connected
+            if has_west and has_south:
+                west = bool((bits >> 20) & 1)
+                south = not west
+            else:
+                west, south = has_west, has_south
+        return west, south
+
+    def exits(self, x: int, y: int) -> Dict[str, Tuple[int, int]]:
+        """Positions of the rooms reachable from a cell, by direction."""
+        west, south = self.links(x, y)
+        exits = {}
+        if west:
+            exits["west"] = (x - 1, y)
+        if south:
+            exits["south"] = (x, y - 1)
+        if x + 1 < self.width and self.links(x + 1, y)[0]:
+            exits["east"] = (x + 1, y)
+        if y + 1 < self.height and self.links(x, y + 1)[1]:
+            exits["north"] = (x, y + 1)
+        return exits
+
+    def room_name(self, x: int, y: int) -> str:
+        """Name of the room of a cell."""
+        return f"{_BIOMES[_mix(self.seed, x, y, _CONTENT) % len(_BIOMES)]} ({x}, {y})"
+
+    def create_room(self, x: int, y: int) -> Room:
+        """Create the room of a cell, without its connections."""
+        # The hash of the cell is consumed digit by digit as a random source
+        bits = _mix(self.seed, x, y, _CONTENT)
+        name = f"{_BIOMES[bits % len(_BIOMES)]} ({x}, {y})"
+        bits //= len(_BIOMES)
+        items: List[Item] = []
+        for _ in range(bits % 3):
+            bits //= 3
+            items.append(self._item(bits % 100, (bits // 100) % 20))
+            bits //= 2000
+        bits //= 3
+        monsters: List[Monster] = []
+        for _ in range(bits % 3):
+            bits //= 3
+            monsters.append(_MONSTERS[bits % 3](MonsterVariantFactory.get(_VARIANTS[(bits // 3) % 3])))
+            bits //= 9
+        return Room(name=name, items=items, monsters=monsters, position=(x, y))
+
+    def create_linked_room(self, position: Tuple[int, int], resolver: Optional[Resolver] = None) -> Room:
+        """Create the room of a cell, its exits being references resolved by `resolver`."""
+        x, y = position
+        room = self.create_room(x, y)
+        resolver = resolver or self.create_linked_room
+        for direction, (nx, ny) in self.exits(x, y).items():
+            room.connect(direction, RoomRef(self.room_name(nx, ny), (nx, ny), resolver))
+        return room
+
+    def rooms(self, resolver: Optional[Resolver] = None) -> Iterator[Room]:
+        """Stream the rooms row by row.
+
+        Exits are `RoomRef`s, by default resolving to a freshly generated
+        room. Nothing is kept between two rooms, so memory stays bounded
+        whatever the size of the world.
+        """
+        for y in range(self.height):
+            for x in range(self.width):
+                yield self.create_linked_room((x, y), resolver)
+
+    def build(self) -> List[Room]:
+        """Generate every room, connected to each other. Meant for small worlds."""
+        rows: List[List[Room]] = []
+        for y in range(self.height):
+            row: List[Room] = []
+            for x in range(self.width):
+                room = self.create_room(x, y)
+                west, south = self.links(x, y)
+                if west:
+                    room.connect("west", row[x - 1])
+                    row[x - 1].connect("east", room)
+                if south:
+                    room.connect("south", rows[y - 1][x])
+                    rows[y - 1][x].connect("north", room)
+                row.append(room)
+            rows.append(row)
+        return [room for row in rows for room in row]
+
+    @staticmethod
+    def _item(rarity_roll: int, kind_roll: int) -> Item:
+        factory = next(f for f, odds in zip(_FACTORIES, _FACTORY_ODDS) if rarity_roll < odds)
+        if kind_roll < 10:
+            return factory.create_weapon()
+        if kind_roll < 17:
+            return factory.create_potion()
+        return factory.create_key()
@@ -0,0 +1,319 @@
+"""Graph index of the world map, with pathfinding.
+
+Rooms are numbered and their connections are stored CSR-style: the exits of
+room `i` are `indices[indptr[i]:indptr[i + 1]]`, with the matching direction
+codes in `directions`. `Room.connect()` keeps the graph up to date: the
+exits of the changed room go in an overlay which is merged back into the
+arrays once it grows, so connecting rooms stays cheap on large worlds.
+
+Exits to rooms which are not loaded (`RoomRef`) are indexed too, by the key
+of the room they reference, but not followed: the graph of a streamed world
+holds its loaded rooms and their borders. When the room itself is added, it
+takes the place of its reference.
+"""
+import heapq
+from collections import deque
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..models.room import Room, RoomRef
+
+# Above this number of rooms all-pairs distances are not cached
+ALL_PAIRS_LIMIT = 2048
+
+Weight = Callable[[Room, Room], float]
+Heuristic = Callable[[int, int], float]
+Position = Callable[[Room], Tuple[int, int]]
+
+
+class WorldGraph:
+    """Integer-indexed adjacency arrays built from a list of rooms."""
+
+    def __init__(self, rooms: Iterable[Room] = (), position: Optional[Position] = None) -> None:
+        # Rooms, or references to the rooms that are not loaded
+        self.rooms: List[Union[Room, RoomRef]] = []
+        # Index of the rooms by id, and of every room or reference by key
+        self._index: Dict[int, int] = {}
+        self._keys: Dict[Hashable, int] = {}
+        self._direction_names: List[str] = []
+        self._direction_codes: Dict[str, int] = {}
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.directions = np.zeros(0, dtype=np.int16)
+        # Exits of the rooms changed since the last compaction
+        self._overlay: Dict[int, List[Tuple[int, int]]] = {}
+        self._exits: Optional[Tuple[List[int], List[int], List[int]]] = None
+        self._all_pairs: Optional[np.ndarray] = None
+        self.version = 0
+        self._position = position
+        self._coordinates: Optional[Tuple[List[int], List[int]]] = None
+        for room in rooms:
+            self.add_room(room)
+        self.compact()
+
+    @classmethod
+    def from_rooms(cls, rooms: Iterable[Room], position: Optional[Position] = None) -> "WorldGraph":
+        """Index the rooms, and every room reachable from them.
+
+        `position(room)` gives the (x, y) grid position of a room, it enables
+        the Manhattan heuristic of `astar()`.
+        """
+        return cls(rooms, position)
+
+    def __len__(self) -> int:
+        return len(self.rooms)
+
+    def __contains__(self, room: Union[Room, RoomRef]) -> bool:
+        return self._find(room) is not None
+
+    def index_of(self, room: Union[Room, RoomRef]) -> int:
+        """Return the index of a room, or of the room a reference leads to."""
+        index = self._find(room)
+        if index is None:
+            raise KeyError(room)
+        return index
+
+    def room(self, index: int) -> Union[Room, RoomRef]:
+        """Return the room stored at an index, a reference when it is not loaded."""
+        return self.rooms[index]
+
+    def add_room(self, room: Room) -> int:
+        """Index a room and every room reachable from it, return its index."""
+        index = self._index.get(id(room))
+        if index is not None:
+            return index
+        index = self._register(room)
+        pending = [room]
+        while pending:
+            current = pending.pop()
+            for neighbour in current.connections.values():
+                if self._find(neighbour) is None:
+                    self._register(neighbour)
+                    if isinstance(neighbour, Room):
+                        pending.append(neighbour)
+            self._overlay[self._index[id(current)]] = self._room_exits(current)
+        self._changed()
+        return index
+
+    def on_connect(self, room: Room) -> None:
+        """Refresh the exits of a room after `Room.connect()`."""
+        for neighbour in room.connections.values():
+            if self._find(neighbour) is None:
+                if isinstance(neighbour, Room):
+                    self.add_room(neighbour)
+                else:
+                    self._register(neighbour)
+        self._overlay[self._index[id(room)]] = self._room_exits(room)
+        self._changed()
+        if len(self._overlay) > max(64, len(self.rooms) // 8):
+            self.compact()
+
+    def compact(self) -> None:
+        """Merge the overlay into the adjacency arrays."""
+        count = len(self.rooms)
+        if not self._overlay and len(self.indptr) == count + 1:
+            return
+        degrees = np.zeros(count, dtype=np.int64)
+        known = len(self.indptr) - 1
+        degrees[:known] = np.diff(self.indptr)
+        for row, exits in self._overlay.items():
+            degrees[row] = len(exits)
+        indptr = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(degrees, out=indptr[1:])
+        indices = np.empty(indptr[-1], dtype=np.int32)
+        directions = np.empty(indptr[-1], dtype=np.int16)
+
+        # Copy unchanged runs of rows in one slice, changed rows one by one
+        previous = 0
+        for row in sorted(self._overlay) + [count]:
+            stop = min(row, known)
+            if previous < stop:
+                source = slice(self.indptr[previous], self.indptr[stop])
+                target = slice(indptr[previous], indptr[stop])
+                indices[target] = self.indices[source]
+                directions[target] = self.directions[source]
+            if row < count:
+                exits = self._overlay[row]
+                start = indptr[row]
+                for offset, (neighbour, direction) in enumerate(exits):
+                    indices[start + offset] = neighbour
+                    directions[start + offset] = direction
+            previous = row + 1
+        self.indptr, self.indices, self.directions = indptr, indices, directions
+        self._overlay.clear()
+        self._exits = None
+
+    def neighbours(self, index: int) -> List[int]:
+        """Indexes of the rooms reachable in one move."""
+        exits = self._overlay.get(index)
+        if exits is not None:
+            return [neighbour for neighbour, _ in exits]
+        indptr, indices, _ = self._exit_lists()
+        return indices[indptr[index]:indptr[index + 1]]
+
+    def exits(self, index: int) -> List[Tuple[str, int]]:
+        """Directions and indexes of the rooms reachable in one move."""
+        names = self._direction_names
+        exits = self._overlay.get(index)
+        if exits is not None:
+            return [(names[direction], neighbour) for neighbour, direction in exits]
+        indptr, indices, directions = self._exit_lists()
+        start, end = indptr[index], indptr[index + 1]
+        return [(names[directions[i]], indices[i]) for i in range(start, end)]
+
+    def distances_from(self, start: Room, max_moves: Optional[int] = None) -> np.ndarray:
+        """Number of moves from `start` to every room, -1 when unreachable."""
+        self.compact()
+        indptr, indices = self.indptr, self.indices
+        distances = np.full(len(self.rooms), -1, dtype=np.int32)
+        source = self.index_of(start)
+        distances[source] = 0
+        frontier = np.array([source], dtype=np.int64)
+        depth = 0
+        while frontier.size and (max_moves is None or depth < max_moves):
+            starts = indptr[frontier]
+            degrees = indptr[frontier + 1] - starts
+            total = int(degrees.sum())
+            if total == 0:
+                break
+            # Position of every exit of the frontier in `indices`
+            offsets = np.repeat(starts - np.cumsum(degrees) + degrees, degrees) + np.arange(total)
+            reached = indices[offsets]
+            frontier = np.unique(reached[distances[reached] < 0]).astype(np.int64)
+            depth += 1
+            distances[frontier] = depth
+        return distances
+
+    def within(self, start: Room, max_moves: int) -> List[Room]:
+        """Rooms reachable from `start` in at most `max_moves` moves."""
+        distances = self.distances_from(start, max_moves)
+        return [self.rooms[i] for i in np.flatnonzero(distances >= 0)]
+
+    def bfs(self, start: Room, goal: Room) -> Optional[List[Room]]:
+        """Path with the fewest moves, None when the goal is unreachable."""
+        source, target = self.index_of(start), self.index_of(goal)
+        parents = {source: source}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            if current == target:
+                return self._path(parents, target)
+            for neighbour in self.neighbours(current):
+                if neighbour not in parents:
+                    parents[neighbour] = current
+                    queue.append(neighbour)
+        return None
+
+    def dijkstra(self, start: Room, goal: Room, weight: Optional[Weight] = None) -> Optional[Tuple[float, List[Room]]]:
+        """Cheapest path and its cost, each move costs `weight(from, to)` (1 by default)."""
+        return self.astar(start, goal, weight, heuristic=lambda index, target: 0)
+
+    def astar(self, start: Room, goal: Room, weight: Optional[Weight] = None,
+              heuristic: Optional[Heuristic] = None) -> Optional[Tuple[float, List[Room]]]:
+        """Cheapest path and its cost, guided by `heuristic(index, goal_index)`.
+
+        Without heuristic, the Manhattan distance between room positions is
+        used when a position function was given, which is admissible as long as every
+        move costs at least 1.
+        """
+        source, target = self.index_of(start), self.index_of(goal)
+        if heuristic is None:
+            heuristic = self._manhattan if self._position else (lambda index, target: 0)
+        rooms = self.rooms
+        costs = {source: 0.0}
+        parents = {source: source}
+        queue = [(heuristic(source, target), 0.0, source)]
+        while queue:
+            _, cost, current = heapq.heappop(queue)
+            if current == target:
+                return cost, self._path(parents, target)
+            if cost > costs[current]:
+                continue
+            for neighbour in self.neighbours(current):
+                step = 1.0 if weight is None else weight(rooms[current], rooms[neighbour])
+                new_cost = cost + step
+                if new_cost < costs.get(neighbour, float("inf")):
+                    costs[neighbour] = new_cost
+                    parents[neighbour] = current
+                    heapq.heappush(queue, (new_cost + heuristic(neighbour, target), new_cost, neighbour))
+        return None
+
+    def route(self, path: Sequence[Room]) -> List[str]:
+        """Directions to follow along a path."""
+        directions = []
+        for current, following in zip(path, path[1:]):
+            target = self.index_of(following)
+            directions.append(next(name for name, index in self.exits(self.index_of(current)) if index == target))
+        return directions
+
+    def all_pairs_distances(self) -> np.ndarray:
+        """Matrix of move counts between every pair of rooms, cached until the map changes."""
+        if len(self.rooms) > ALL_PAIRS_LIMIT:
+            raise ValueError(f"All-pairs distances are limited to {ALL_PAIRS_LIMIT} rooms")
+        if self._all_pairs is None:
+            self._all_pairs = np.stack([self.distances_from(room) for room in self.rooms]) if self.rooms \
+                else np.zeros((0, 0), dtype=np.int32)
+        return self._all_pairs
+
+    def distance(self, start: Room, goal: Room) -> int:
+        """Number of moves between two rooms, -1 when unreachable."""
+        if len(self.rooms) <= ALL_PAIRS_LIMIT:
+            return int(self.all_pairs_distances()[self.index_of(start), self.index_of(goal)])
+        path = self.bfs(start, goal)
+        return -1 if path is None else len(path) - 1
+
+    def _find(self, room: Union[Room, RoomRef]) -> Optional[int]:
+        if isinstance(room, RoomRef):
+            return self._keys.get(room.key)
+        return self._index.get(id(room))
+
+    def _register(self, room: Union[Room, RoomRef]) -> int:
+        index = self._keys.get(room.key)
+        if isinstance(room, RoomRef) or index is None or not isinstance(self.rooms[index], RoomRef):
+            index = len(self.rooms)
+            self.rooms.append(room)
+            self._keys.setdefault(room.key, index)
+        else:
+            # The room was only known through a reference until now
+            self.rooms[index] = room
+        if isinstance(room, Room):
+            self._index[id(room)] = index
+            room.graph = self
+        return index
+
+    def _room_exits(self, room: Room) -> List[Tuple[int, int]]:
+        return [(self._find(neighbour), self._direction_code(direction))
+                for direction, neighbour in room.connections.items()]
+
+    def _direction_code(self, direction: str) -> int:
+        code = self._direction_codes.get(direction)
+        if code is None:
+            code = self._direction_codes[direction] = len(self._direction_names)
+            self._direction_names.append(direction)
+        return code
+
+    def _changed(self) -> None:
+        self.version += 1
+        self._all_pairs = None
+        self._coordinates = None
+
+    def _exit_lists(self) -> Tuple[List[int], List[int], List[int]]:
+        # Python lists are much faster than NumPy arrays to index one item at a time
+        if self._exits is None:
+            self._exits = (self.indptr.tolist(), self.indices.tolist(), self.directions.tolist())
+        return self._exits
+
+    def _manhattan(self, index: int, target: int) -> float:
+        if self._coordinates is None:
+            # References of streamed worlds are keyed by the position of their room
+            positions = [self._position(room) if isinstance(room, Room) else room.key for room in self.rooms]
+            self._coordinates = ([x for x, _ in positions], [y for _, y in positions])
+        xs, ys = self._coordinates
+        return float(abs(xs[index] - xs[target]) + abs(ys[index] - ys[target]))
+
+    def _path(self, parents: Dict[int, int], target: int) -> List[Room]:
+        path = [target]
+        while parents[path[-1]] != path[-1]:
+            path.append(parents[path[-1]])
+        return [self.rooms[index] for index in reversed(path)]
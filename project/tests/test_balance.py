@@ -0,0 +1,56 @@
+"""The balance report counts every encounter, whatever the number of workers."""
+import numpy as np
+import pytest
+
+from src.models.item import ItemRarity
+from src.models.weapon import Shield, Sword
+from src.patterns.bridge.monster_bridge import Bokoblin, Hinox
+from src.patterns.bridge.monster_variant import RedVariant, WhiteVariant
+from src.patterns.flyweight.monster_flyweight import MonsterVariantFactory
+from src.simulation.balance import BalanceSimulator, Rules
+
+ENCOUNTERS = 250
+
+
+def _simulator(rules: Rules = Rules()) -> BalanceSimulator:
+    weapons = [Sword("Blade", 1000, 5, ItemRarity.COMMON), Sword("Stick", 2, 3, ItemRarity.COMMON),
+               Shield("Hylian Shield", 80, 30, ItemRarity.LEGENDARY)]
+    monsters = [Bokoblin(MonsterVariantFactory.get(RedVariant)), Hinox(MonsterVariantFactory.get(WhiteVariant))]
+    return BalanceSimulator(weapons, monsters, rules, seed=3, shard_size=100)
+
+
+def test_report_counts_every_encounter():
+    report = _simulator().run(ENCOUNTERS, workers=0)
+    assert report.shards == 3 * 2 * 3 and report.total_encounters == 3 * 2 * ENCOUNTERS
+    assert (report.encounters == ENCOUNTERS).all()
+    assert (report.wins + report.draws <= report.encounters).all()
+    assert (report.time_to_kill.sum(axis=2) == report.wins).all()
+    assert (report.durability.sum(axis=2) == report.encounters).all()
+    # A shield deals no damage
+    assert (report.wins[2] == 0).all()
+    assert len(report.lines()) == 1 + 3 * 2
+    counts, _ = report.win_rate_histogram()
+    assert counts.sum() == 6
+
+
+def test_certain_outcomes():
+    report = _simulator(Rules(monster_miss=0.0)).run(ENCOUNTERS, workers=0)
+    assert (report.win_rates()[0] == 1.0).all()
+    assert (report.mean_time_to_kill()[0] == 1.0).all() and (report.mean_durability()[0] == 1.0).all()
+    assert np.isnan(report.mean_time_to_kill()[2]).all()
+
+
+def test_same_seed_same_report_whatever_the_workers():
+    alone = _simulator().run(ENCOUNTERS, workers=0)
+    pooled = _simulator().run(ENCOUNTERS, workers=2)
+    for name in ("encounters", "wins", "draws", "time_to_kill", "durability"):
+        assert (getattr(alone, name) == getattr(pooled, name)).all(), name
+
+
+def test_settings_are_checked():
+    with pytest.raises(ValueError):
+        _simulator().simulate(0)
+    with pytest.raises(ValueError):
+        BalanceSimulator([], None)
+    with pytest.raises(ValueError):
+        BalanceSimulator(shard_size=0)
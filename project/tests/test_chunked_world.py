@@ -0,0 +1,83 @@
+"""Chunks of a procedural world are loaded on entry, evicted, and reloaded with their changes."""
+import pytest
+
+from src.models.room import Room, RoomRef
+from src.world.chunked_world import ChunkedWorld
+from src.world.world_generator import WorldGenerator
+
+SEED = 11
+
+
+def _content(room: Room):
+    return [str(item) for item in room.items], [monster.get_stats() for monster in room.monsters]
+
+
+def _world(max_chunks: int = 2) -> ChunkedWorld:
+    return ChunkedWorld(WorldGenerator(SEED, 32, 32), chunk_size=4, max_chunks=max_chunks)
+
+
+def test_chunks_are_loaded_on_entry_and_evicted():
+    world = _world()
+    assert world.loaded_chunks == 0
+    world.room_at((0, 0))
+    assert world.loaded_chunks == 1 and world.loaded_rooms == 16
+    world.room_at((5, 0))
+    world.room_at((9, 0))
+    assert world.loaded_chunks == 2
+
+
+def test_rooms_match_the_generator():
+    world = _world()
+    generator = WorldGenerator(SEED, 32, 32)
+    for position in ((0, 0), (3, 3), (17, 9), (31, 31)):
+        assert _content(world.room_at(position)) == _content(generator.create_room(*position))
+
+
+def test_exits_to_other_chunks_are_references():
+    world = _world()
+    room = next(world.room_at((3, y)) for y in range(32) if "east" in world.room_at((3, y)).connections)
+    east = room.connections["east"]
+    assert isinstance(east, RoomRef) and east.key == (4, room.position[1])
+    assert world.resolve(east) is world.room_at(east.key)
+    assert not isinstance(world.room_at((1, 0)).connections.get("east"), RoomRef)
+
+
+def test_changes_survive_eviction():
+    world = _world()
+    position = next((x, y) for x in range(32) for y in range(32)
+                    if world.room_at((x, y)).items and world.room_at((x, y)).monsters)
+    room = world.room_at(position)
+    taken, killed = room.items[0], room.monsters[0]
+    room.remove_item(taken)
+    room.remove_monster(killed)
+    expected = _content(room)
+    # Load enough other chunks to evict the changed one
+    for x in range(0, 32, 4):
+        world.room_at((x, 0 if position[1] >= 8 else 16))
+    assert room is not world.room_at(position)
+    assert _content(world.room_at(position)) == expected
+    assert position in world.changed_rooms()
+
+
+def test_unchanged_rooms_are_regenerated():
+    world = _world()
+    before = _content(world.room_at((1, 1)))
+    for x in range(4, 32, 4):
+        world.room_at((x, 20))
+    assert _content(world.room_at((1, 1))) == before
+    assert (1, 1) not in world.changed_rooms()
+
+
+def test_the_chunk_of_the_hero_is_kept():
+    world = _world()
+    start = world.enter((0, 0))
+    for x in range(4, 32, 4):
+        world.room_at((x, 20))
+    assert world.room_at((0, 0)) is start
+
+
+def test_settings_are_checked():
+    with pytest.raises(ValueError):
+        ChunkedWorld(WorldGenerator(SEED, 8, 8), chunk_size=0)
+    with pytest.raises(KeyError):
+        _world().room_at((32, 0))
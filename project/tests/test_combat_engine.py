@@ -0,0 +1,69 @@
+"""The batched combat engine must resolve ticks like `weapon.use()` and `monster.attack()` do."""
+from src.combat.combat_engine import CombatEngine
+from src.models.enchantment import Enchantment, EnchantmentType, Gem
+from src.models.item import ItemRarity
+from src.models.weapon import Bow, Shield, Sword, WeaponBrokenState
+from src.patterns.bridge.monster_bridge import Bokoblin, Hinox, Moblin
+from src.patterns.bridge.monster_variant import BlueVariant, RedVariant, WhiteVariant
+from src.patterns.flyweight.monster_flyweight import MonsterVariantFactory
+from src.patterns.prototype.prototype_registry import clone
+
+TICKS = 12
+
+
+def _pairs():
+    weapons = [
+        Sword("Knight's Sword", 20, 5, ItemRarity.RARE, gems=[Gem("Ruby", 15, 10)]),
+        Sword("Flame Blade", 12, 3, ItemRarity.LEGENDARY, Enchantment(EnchantmentType.FIRE, 10)),
+        Bow("Royal Bow", 15, 40, ItemRarity.RARE),
+        Shield("Hylian Shield", 4, 30, ItemRarity.LEGENDARY),
+        Sword("Rusty Sword", 2, 2, ItemRarity.COMMON),
+    ]
+    weapons[2].arrow_count = 3
+    monsters = [Hinox(MonsterVariantFactory.get(WhiteVariant)), Moblin(MonsterVariantFactory.get(RedVariant)),
+                Bokoblin(MonsterVariantFactory.get(BlueVariant)), Moblin(MonsterVariantFactory.get(BlueVariant)),
+                Hinox(MonsterVariantFactory.get(RedVariant))]
+    return weapons, monsters
+
+
+def _damage(weapon) -> int:
+    if isinstance(weapon, Shield):
+        return 0
+    if isinstance(weapon, Bow):
+        return weapon.get_total_damage() if weapon.arrow_count > 0 else 0
+    return 0 if isinstance(weapon.state, WeaponBrokenState) else weapon.get_total_damage()
+
+
+def test_ticks_match_the_per_object_path():
+    weapons, monsters = _pairs()
+    expected_weapons = [clone(weapon) for weapon in weapons]
+    hp = [monster.variant.hp() for monster in monsters]
+    batch = CombatEngine.prepare(weapons, monsters)
+    for _ in range(TICKS):
+        combat_round = batch.tick()
+        messages, dealt = [], []
+        for index, (weapon, monster) in enumerate(zip(expected_weapons, monsters)):
+            if hp[index] <= 0:
+                dealt.append(0)
+                continue
+            damage = _damage(weapon)
+            messages.append(f"{weapon.use()}\n{monster.attack()}")
+            hp[index] -= damage
+            dealt.append(damage)
+        assert combat_round.messages() == messages
+        assert combat_round.damage_dealt.tolist() == dealt
+        assert batch.hp.tolist() == hp
+    batch.sync()
+    for weapon, expected in zip(weapons, expected_weapons):
+        assert weapon.durability == expected.durability
+        assert type(weapon.state) is type(expected.state)
+        assert getattr(weapon, "arrow_count", None) == getattr(expected, "arrow_count", None)
+
+
+def test_resolve_writes_one_tick_back():
+    weapons, monsters = _pairs()
+    durability = [weapon.durability for weapon in weapons]
+    combat_round = CombatEngine.resolve(weapons, monsters)
+    assert combat_round.active.all()
+    assert [weapon.durability for weapon in weapons] == [value - 1 for value in durability]
+    assert weapons[2].arrow_count == 2
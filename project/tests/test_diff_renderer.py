@@ -0,0 +1,46 @@
+"""The renderer writes a view in full once, then only its changes."""
+import pytest
+
+from src.models.item import ItemRarity
+from src.models.key import Key
+from src.models.room import Room
+from src.rendering.diff_renderer import DiffRenderer
+
+
+def test_first_render_is_full_then_only_changes():
+    written = []
+    renderer = DiffRenderer(written.append)
+    assert renderer.render("hall", ["Hall", "a key"]) == 2
+    assert renderer.render("hall", ["Hall", "a key"]) == 0
+    assert renderer.render("hall", ["Hall", "a sword"]) == 2
+    assert written == ["Hall\na key\n", "- a key\n+ a sword\n"]
+    renderer.forget("hall")
+    assert renderer.render("hall", ["Hall", "a sword"]) == 2
+
+
+def test_cached_room_lines_are_not_compared():
+    written = []
+    renderer = DiffRenderer(written.append)
+    room = Room("Hall", [], [])
+    renderer.render(room.key, room.detail_lines())
+    assert renderer.render(room.key, room.detail_lines()) == 0
+    room.add_item(Key("Old Key", ItemRarity.COMMON))
+    assert renderer.render(room.key, room.detail_lines()) == 2
+    assert written[-1].splitlines() == ["+ Items in the room:", "+  - [common] Old Key"]
+
+
+def test_views_are_bounded():
+    renderer = DiffRenderer(lambda text: None, max_views=2)
+    for view in ("hall", "cave", "hall", "tower"):
+        renderer.render(view, [view])
+    assert len(renderer) == 2
+    # The cave was the least recently rendered view
+    assert renderer.render("hall", ["hall"]) == 0 and renderer.render("cave", ["cave"]) == 1
+    with pytest.raises(ValueError):
+        DiffRenderer(max_views=0)
+
+
+def test_standard_output_is_looked_up_on_use(capsys):
+    renderer = DiffRenderer()
+    renderer.render("hall", ["Hall"])
+    assert capsys.readouterr().out == "Hall\n"
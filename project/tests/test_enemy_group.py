@@ -0,0 +1,58 @@
+"""Enemy groups keep their members in flat columns, nested groups included."""
+import pytest
+
+from src.patterns.bridge.monster_bridge import Bokoblin, Hinox, Moblin
+from src.patterns.bridge.monster_variant import BlueVariant, RedVariant, WhiteVariant
+from src.patterns.composite.enemy_group import EnemyGroup
+from src.patterns.flyweight.monster_flyweight import MonsterVariantFactory
+
+RED, BLUE, WHITE = (MonsterVariantFactory.get(variant) for variant in (RedVariant, BlueVariant, WhiteVariant))
+
+
+def test_nested_groups_are_flattened():
+    squad = EnemyGroup("Squad", [Bokoblin(RED), Moblin(BLUE)])
+    horde = EnemyGroup("Horde", [squad, Hinox(WHITE)])
+    horde.add(Bokoblin(BLUE))
+    assert len(horde) == 4 and horde.hp.tolist() == [120, 50, 15, 15]
+    assert horde.total_hp() == horde.max_hp() == 200 and horde.damage() == 135
+    squad.take_damage(100)
+    assert horde.total_hp() == 200
+    with pytest.raises(ValueError):
+        horde.hp[0] = 0
+
+
+def test_remove_keeps_the_columns_in_order():
+    hinox = Hinox(WHITE)
+    group = EnemyGroup("Group", [Bokoblin(RED), hinox, Moblin(BLUE)])
+    group.remove(hinox)
+    assert len(group) == 2 and group.hp.tolist() == [50, 15] and group.damage() == 60
+    assert [monster.name for monster in group.members()] == ["Bokoblin", "Moblin"]
+    with pytest.raises(ValueError):
+        group.remove(hinox)
+
+
+def test_damage_reaches_the_front_members_first():
+    group = EnemyGroup("Group", [Bokoblin(RED), Moblin(BLUE), Hinox(WHITE)])
+    assert group.take_damage(60) == 1
+    assert group.hp.tolist() == [0, 5, 120] and group.alive() == 2 and group.damage() == 75
+    assert group.take_damage(0) == 0 and group.total_hp() == 125
+
+
+def test_dead_members_are_removed():
+    group = EnemyGroup("Group", [Bokoblin(RED), Moblin(BLUE), Hinox(WHITE)])
+    group.take_damage(65)
+    group.remove_dead()
+    assert len(group) == 1 and group.hp.tolist() == [120] and group.max_hp() == 120
+    group.take_damage(20)
+    group.heal()
+    assert group.total_hp() == 120
+
+
+def test_groups_fight_like_monsters():
+    first = EnemyGroup("Reds", [Bokoblin(RED) for _ in range(3)])
+    second = EnemyGroup("Blue", [Moblin(BLUE)])
+    assert first.attack() == "Reds (3 monsters) attacks with 30 points !"
+    assert first.get_stats() == "Reds - 3/3 monsters - HP: 150/150"
+    assert first.fight_round(second) == (1, 1)
+    assert second.is_defeated() and first.fight(second) == 0
+    assert first.get_stats() == "Reds - 2/3 monsters - HP: 100/150"
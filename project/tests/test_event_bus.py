@@ -0,0 +1,78 @@
+"""The event bus delivers events by topic, in order, and forgets dead observers."""
+import gc
+
+from src.models.item import ItemRarity
+from src.models.player import Player
+from src.models.weapon import Sword, WeaponBrokenState, WeaponUsableState
+from src.patterns.decorator.weapon_decorator import RockFusion
+from src.patterns.observer.event_bus import EventBus, WEAPON_BROKEN, WEAPON_REPAIRED, WEAPON_USED
+from src.patterns.observer.weapon_observer import BrokenWeaponObserver
+
+
+class Listener:
+    def __init__(self):
+        self.received = []
+
+    def update(self, event):
+        self.received.append(event.value)
+
+
+def test_collected_observers_are_unsubscribed():
+    bus = EventBus()
+    listener = Listener()
+    bus.subscribe("topic", listener.update)
+    bus.subscribe("topic", Listener().update)
+    gc.collect()
+    assert bus.subscribers("topic") == 1
+    del listener
+    gc.collect()
+    assert not bus.has_subscribers("topic")
+    bus.publish("topic", None, 1)
+    assert bus.pending == 0
+
+
+def test_batched_dispatch_keeps_the_publication_order():
+    bus = EventBus()
+    batches, single = [], []
+    bus.subscribe("a", lambda events: batches.append([event.value for event in events]), batch=True)
+    bus.subscribe("b", lambda event: single.append(event.value))
+    bus.subscribe("b", lambda event: bus.publish("a", None, "late"))
+    for value in range(3):
+        bus.publish("a", None, value)
+        bus.publish("b", None, value)
+    assert single == [] and bus.dispatch() == 6
+    assert batches == [[0, 1, 2]] and single == [0, 1, 2]
+    assert bus.dispatch() == 3 and batches[1] == ["late"] * 3
+
+
+def test_weapons_publish_their_transitions():
+    bus = EventBus()
+    transitions = []
+    for topic in (WEAPON_BROKEN, WEAPON_REPAIRED):
+        bus.subscribe(topic, lambda event: transitions.append((event.topic, event.source.name)))
+    sword = Sword("Blade", 10, 1, ItemRarity.COMMON)
+    player = Player()
+    player.pick_weapon(sword)
+    player.events = bus
+    player.attack(sword)
+    sword.state = WeaponBrokenState()
+    sword.state = WeaponUsableState()
+    player.drop_item(None, sword)
+    sword.state = WeaponBrokenState()
+    bus.dispatch()
+    assert transitions == [(WEAPON_BROKEN, "Blade"), (WEAPON_REPAIRED, "Blade")]
+
+
+def test_broken_weapons_are_dropped():
+    bus = EventBus()
+    player = Player()
+    player.events = bus
+    observer = BrokenWeaponObserver(bus, player)
+    used = []
+    bus.subscribe(WEAPON_USED, lambda event: used.append(event.value))
+    sword, fused = Sword("Blade", 10, 1, ItemRarity.COMMON), RockFusion(Sword("Stick", 2, 1, ItemRarity.COMMON))
+    for weapon in (sword, fused):
+        player.pick_weapon(weapon)
+        player.attack(weapon)
+    bus.dispatch()
+    assert used == [sword, fused] and len(player.inventory) == 0 and observer.subscriptions
@@ -0,0 +1,27 @@
+"""Monsters of the same variant share one variant instance."""
+from src.patterns.bridge.monster_bridge import Bokoblin, Moblin
+from src.patterns.bridge.monster_variant import BlueVariant, RedVariant
+from src.patterns.flyweight.monster_flyweight import MonsterVariantFactory
+
+
+def test_same_variant_is_shared():
+    red = MonsterVariantFactory.get(RedVariant)
+    assert MonsterVariantFactory.get(RedVariant) is red
+    assert MonsterVariantFactory.get("red") is red
+    assert Bokoblin(red).variant is Moblin(MonsterVariantFactory.get("red")).variant
+    assert MonsterVariantFactory.get(BlueVariant) is not red
+
+
+def test_stats_count_the_shared_requests():
+    MonsterVariantFactory.clear()
+    for _ in range(10):
+        MonsterVariantFactory.get(RedVariant)
+    MonsterVariantFactory.get(BlueVariant)
+    assert MonsterVariantFactory.stats() == {"interned": 2, "requests": 11, "saved_instances": 9}
+
+
+def test_clear_drops_the_cache():
+    red = MonsterVariantFactory.get(RedVariant)
+    MonsterVariantFactory.clear()
+    assert MonsterVariantFactory.interned_count() == 0
+    assert MonsterVariantFactory.get(RedVariant) is not red
@@ -0,0 +1,63 @@
+"""The server answers every command of a connection with its own session."""
+import asyncio
+
+import pytest
+
+from src.server.game_server import GameServer
+from src.server.session import GameSession
+from src.world.chunked_world import ChunkedWorld
+from src.world.world_generator import WorldGenerator
+
+
+async def _answer(reader):
+    header = (await reader.readline()).decode()
+    if not header.startswith("OK "):
+        return header.rstrip("\n"), []
+    return "OK", [(await reader.readline()).decode().rstrip("\n") for _ in range(int(header[3:]))]
+
+
+async def _command(reader, writer, line):
+    writer.write(f"{line}\n".encode())
+    await writer.drain()
+    return await _answer(reader)
+
+
+async def _play():
+    server = GameServer(seed=3, size=20)
+    listener = await server.start(port=0)
+    port = listener.sockets[0].getsockname()[1]
+    first, second = await asyncio.open_connection("127.0.0.1", port), await asyncio.open_connection("127.0.0.1", port)
+    start = (await _answer(first[0]))[1]
+    assert (await _answer(second[0]))[1] == start and server.sessions == 2
+
+    status, lines = await _command(*first, "status")
+    assert status == "OK" and lines[0] == "Player: Link, Health: 100, Items: 0"
+    assert (await _command(*first, "dance"))[0].startswith("ERR Unknown command 'dance'")
+    assert (await _command(*first, "drink 3"))[0] == "ERR No item '3'"
+    moves = [await _command(*first, f"go {direction}") for direction in ("north", "east", "south", "west")]
+    assert any(status == "OK" for status, _ in moves)
+    # The other session did not move
+    assert await _command(*second, "look") == ("OK", start)
+
+    assert await _command(*first, "quit") == ("OK", ["Farewell, hero!"])
+    assert await first[0].readline() == b""
+    assert (await _command(*second, "inventory")) == ("OK", ["Your inventory is empty."])
+    second[1].close()
+    await second[1].wait_closed()
+    first[1].close()
+    listener.close()
+    await listener.wait_closed()
+    return server
+
+
+def test_sessions_are_independent():
+    server = asyncio.run(_play())
+    assert server.sessions == 0
+
+
+def test_attacking_without_a_weapon():
+    session = GameSession(ChunkedWorld(WorldGenerator(3, 8, 8), chunk_size=4))
+    session.current_room = next(session.world.room_at((x, y)) for x in range(8) for y in range(8)
+                                if session.world.room_at((x, y)).monsters)
+    with pytest.raises(ValueError, match="You have no weapon"):
+        session.execute("attack")
@@ -0,0 +1,61 @@
+"""Headless runs play a script without rich, on any output backend."""
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.rendering.output import NullOutput, PlainOutput, make_output
+
+PROJECT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Run main() in a fresh interpreter, which fails when rich was imported
+RUN_MAIN = "import sys, main; main.main(sys.argv[1:]); sys.exit('rich' in sys.modules)"
+
+
+def _run(tmp_path, *arguments):
+    script = tmp_path / "commands.txt"
+    script.write_text("look\nstatus\n# a comment\ndance\ninventory\nquit\n", encoding="utf-8")
+    return subprocess.run([sys.executable, "-c", RUN_MAIN, "--headless", "--script", str(script), *arguments],
+                          cwd=PROJECT, capture_output=True, text=True, timeout=60)
+
+
+def test_headless_script_is_played_without_rich(tmp_path):
+    result = _run(tmp_path, "--record", str(tmp_path / "game.json"))
+    assert result.returncode == 0, result.stderr
+    assert "Your adventure begins now..." in result.stdout and "Player: Link, Health: 100" in result.stdout
+    assert "Unknown command 'dance'" in result.stdout and result.stdout.rstrip().endswith("Farewell, hero!")
+    assert (tmp_path / "game.json").exists()
+
+
+def test_null_output_writes_nothing(tmp_path):
+    result = _run(tmp_path, "--output", "null")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == ""
+
+
+def test_plain_and_null_outputs():
+    stream = io.StringIO()
+    output = PlainOutput(stream, io.StringIO("maybe\nyes\n\n"))
+    output.banner("Title", "Subtitle")
+    assert output.ask("Sure", ["yes", "no"]) == "yes"
+    assert output.ask("Again", default="no") == "no"
+    with pytest.raises(EOFError):
+        output.ask("More")
+    assert stream.getvalue().startswith("Title\nSubtitle\nSure [yes/no]: Please select one of the available options")
+    null = NullOutput(["start"])
+    null.print("ignored")
+    assert null.ask("Menu") == "start"
+    with pytest.raises(EOFError):
+        null.ask("Menu")
+    with pytest.raises(ValueError):
+        make_output("html")
+
+
+def test_rich_output():
+    pytest.importorskip("rich")
+    output = make_output("rich")
+    with output.console.capture() as capture:
+        output.banner("Title", "[not markup]")
+        output.print("Line", "red")
+    assert "[not markup]" in capture.get() and "Line" in capture.get()
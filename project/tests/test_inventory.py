@@ -0,0 +1,77 @@
+"""The inventory indexes find, rank and remove items in constant time."""
+import pickle
+
+import pytest
+
+from src.models.inventory import Inventory
+from src.models.item import ItemRarity
+from src.models.key import Key
+from src.models.potion import Potion, PotionEffect
+from src.models.weapon import Bow, Sword, WeaponType
+from src.models.enchantment import Gem
+from src.patterns.prototype.prototype_registry import clone
+
+
+def _inventory():
+    sword = Sword("Blade", 10, 5, ItemRarity.COMMON)
+    bow = Bow("Royal Bow", 15, 35, ItemRarity.RARE)
+    potion = Potion("Red Potion", ItemRarity.COMMON, PotionEffect.HEAL, 20)
+    key = Key("Old Key", ItemRarity.COMMON)
+    return Inventory([sword, bow, potion, key]), sword, bow, potion, key
+
+
+def test_lookups():
+    inventory, sword, bow, potion, key = _inventory()
+    assert sword in inventory and "Red Potion" in inventory and "Lost Sword" not in inventory
+    assert inventory.first_named("Royal Bow") is bow
+    assert inventory.of_rarity(ItemRarity.COMMON) == [sword, potion, key]
+    assert inventory.weapons(WeaponType.BOW) == [bow] and inventory.weapons() == [sword, bow]
+    assert inventory.has_key("Old Key") and inventory.key_for("Old Key") is key
+    assert inventory.index(potion) == 2
+
+
+def test_remove_moves_the_last_item():
+    inventory, sword, bow, potion, key = _inventory()
+    assert inventory.remove(sword) == 0
+    assert list(inventory) == [key, bow, potion] and inventory.index(key) == 0
+    assert "Blade" not in inventory and inventory.weapons() == [bow]
+    del inventory[0]
+    assert not inventory.has_key("Old Key")
+    with pytest.raises(ValueError):
+        inventory.remove(sword)
+
+
+def test_best_weapon_follows_the_stats():
+    inventory, sword, bow, _, _ = _inventory()
+    assert inventory.best_weapon() is bow
+    sword.add_gem(Gem("Ruby", 10, 0))
+    assert inventory.best_weapon() is sword and inventory.best_weapon(WeaponType.BOW) is bow
+    inventory.remove(sword)
+    assert inventory.best_weapon() is bow
+
+
+def test_renamed_items_are_removed_and_reindexed():
+    inventory, sword, bow, _, _ = _inventory()
+    sword.name = "Renamed Blade"
+    bow.weapon_type = WeaponType.SWORD
+    assert inventory.first_named("Blade") is sword
+    inventory.reindex(sword)
+    inventory.reindex(bow)
+    assert inventory.first_named("Renamed Blade") is sword and "Blade" not in inventory
+    assert inventory.best_weapon(WeaponType.SWORD) is bow and inventory.best_weapon(WeaponType.BOW) is None
+    bow.name = "Renamed Bow"
+    inventory.remove(bow)
+    assert inventory.named("Royal Bow") == [] and inventory.weapons() == [sword]
+
+
+def test_pickled_inventory_is_indexed():
+    inventory, *_ = _inventory()
+    copy = pickle.loads(pickle.dumps(inventory))
+    assert copy == inventory and copy.first_named("Blade") is copy[0]
+
+
+def test_copies_of_a_weapon_are_not_watched():
+    inventory, sword, bow, _, _ = _inventory()
+    for copy in (clone(sword), pickle.loads(pickle.dumps(sword))):
+        copy.add_gem(Gem("Ruby", 10, 0))
+        assert inventory.best_weapon() is bow
@@ -0,0 +1,51 @@
+"""Factories create items in batches, pools hand released items out again once reset."""
+from src.models.enchantment import Gem
+from src.models.item import ItemRarity
+from src.models.weapon import Bow, Sword, WeaponBrokenState, WeaponUsableState
+from src.patterns.factory.item_factory import CommonItemFactory, LegendaryItemFactory, RareItemFactory, WeaponFactory
+from src.patterns.factory.item_pool import ItemPool
+
+
+def test_batches_have_the_requested_count_and_rarity():
+    for factory, rarity in ((CommonItemFactory(), ItemRarity.COMMON), (RareItemFactory(), ItemRarity.RARE),
+                            (LegendaryItemFactory(), ItemRarity.LEGENDARY)):
+        for items in (factory.create_weapons(5), factory.create_potions(5), factory.create_keys(5)):
+            assert len(items) == 5 and len({id(item) for item in items}) == 5
+            assert all(item.rarity is rarity for item in items)
+    bows = WeaponFactory.create_weapons(Bow, 3, "Longbow", damage=4, durability=10, rarity=ItemRarity.RARE)
+    assert [bow.name for bow in bows] == ["Longbow"] * 3 and all(isinstance(bow, Bow) for bow in bows)
+    assert RareItemFactory().create_weapons(0) == []
+
+
+def test_released_items_are_reused():
+    pool = ItemPool(CommonItemFactory())
+    weapons = pool.acquire_weapons(3)
+    potion = pool.acquire_potion()
+    pool.release_many(weapons + [potion])
+    assert len(pool) == 4
+    assert {id(weapon) for weapon in pool.acquire_weapons(4)} >= {id(weapon) for weapon in weapons}
+    assert pool.acquire_potion() is potion
+    assert pool.stats() == {"created": 5, "reused": 4, "discarded": 0, "pooled": 0}
+
+
+def test_reused_items_are_reset():
+    pool = ItemPool(CommonItemFactory())
+    sword = pool.acquire_weapon()
+    sword.name = "Renamed"
+    sword.durability = 0
+    sword.state = WeaponBrokenState()
+    sword.add_gem(Gem("Ruby", 3, 2))
+    pool.release(sword)
+    again = pool.acquire_weapon()
+    assert again is sword and again == CommonItemFactory().create_weapon()
+    assert isinstance(again.state, WeaponUsableState) and again.get_total_damage() == 5
+
+
+def test_full_pools_discard_released_items():
+    pool = ItemPool(CommonItemFactory(), max_size=2)
+    pool.release_many(pool.acquire_keys(3))
+    pool.release(Sword("Blade", 10, 5, ItemRarity.COMMON))
+    pool.release(Bow("Longbow", 4, 10, ItemRarity.COMMON))
+    assert len(pool) == 3 and pool.discarded == 2
+    pool.clear()
+    assert len(pool) == 0
@@ -0,0 +1,64 @@
+"""Items stored in columns read back as the items that were stored."""
+import pytest
+
+from src.models.enchantment import Enchantment, EnchantmentType, Gem
+from src.models.item import ItemRarity
+from src.models.item_store import ItemStore
+from src.models.key import Key
+from src.models.potion import Potion, PotionEffect
+from src.models.weapon import Bow, Shield, Sword, WeaponBrokenState
+from src.models.treasure import Treasure
+from src.patterns.proxy.treasure_proxy import TreasureProxy
+from src.persistence.state import item_state
+
+
+def _items():
+    broken = Sword("Rusty Sword", 4, 1, ItemRarity.COMMON)
+    broken.use()
+    return [
+        Sword("Knight's Sword", 20, 30, ItemRarity.RARE, Enchantment(EnchantmentType.FIRE, 5), [Gem("Ruby", 3, 2)],
+              "Flames"),
+        Bow("Royal Bow", 15, 35, ItemRarity.RARE, arrow_count=7),
+        Shield("Hylian Shield", 80, 30, ItemRarity.LEGENDARY),
+        Potion("Red Potion", ItemRarity.COMMON, PotionEffect.HEAL, 20),
+        Key("Old Key", ItemRarity.COMMON),
+        Treasure("Gold"),
+        broken,
+    ]
+
+
+def test_items_round_trip():
+    items = _items()
+    store = ItemStore(items)
+    assert len(store) == len(items)
+    assert [item_state(view.materialize()) for view in store] == [item_state(item) for item in items]
+    assert [str(view) for view in store] == [str(item) for item in items]
+    assert isinstance(store[-1].materialize().state, WeaponBrokenState)
+
+
+def test_use_writes_back():
+    store = ItemStore([Bow("Royal Bow", 15, 35, ItemRarity.RARE, arrow_count=7)])
+    store[0].use()
+    bow = store[0].materialize()
+    assert (bow.arrow_count, bow.durability) == (6, 34)
+
+
+def test_names_and_gems_are_shared():
+    store = ItemStore(Sword("Blade", 10, 5, ItemRarity.COMMON, gems=[Gem("Ruby", 3, 2)]) for _ in range(3))
+    assert len(store._names) == 1 and len(store._objects) == 2
+    first, second = store[0].materialize(), store[1].materialize()
+    assert first.gems == second.gems and first.gems is not second.gems
+
+
+def test_equal_enchantments_and_abilities_are_shared():
+    store = ItemStore(Sword("Blade", 10, 5, ItemRarity.COMMON, Enchantment(EnchantmentType.FIRE, 5),
+                            special_ability="Flames") for _ in range(3))
+    assert len(store._objects) == 3
+    assert store[0].materialize().enchantment == Enchantment(EnchantmentType.FIRE, 5)
+
+
+def test_unknown_items_are_rejected():
+    with pytest.raises(TypeError):
+        ItemStore().add(TreasureProxy("Gold", "Old Key"))
+    with pytest.raises(IndexError):
+        ItemStore()[0]
@@ -0,0 +1,45 @@
+"""The journal recovers the state from its checkpoint and the records written after it."""
+from src.models.item import ItemRarity
+from src.models.player import Player
+from src.models.room import Room
+from src.models.weapon import Sword
+from src.patterns.proxy.treasure_proxy import TreasureProxy
+from src.persistence import state
+from src.persistence.journal import Journal, _checkpoints
+
+
+def _world():
+    hall = Room("Hall", [Sword("Blade", 10, 5, ItemRarity.COMMON)], [])
+    cave = Room("Cave", [], [])
+    hall.connect("east", cave)
+    cave.connect("west", hall)
+    return Player(), [hall, cave]
+
+
+def test_changes_are_recovered(tmp_path):
+    path = str(tmp_path / "game.journal")
+    player, rooms = _world()
+    with Journal(path, state=lambda: (player, rooms), batch_size=2) as journal:
+        journal.checkpoint()
+        journal.attach(player, rooms)
+        sword = rooms[0].items[0]
+        rooms[0].remove_item(sword)
+        player.pick_weapon(sword)
+        player.attack(sword)
+        player.drop_item(None, sword)
+        rooms[1].add_item(sword)
+    recovered, recovered_rooms = Journal.recover(path)
+    assert state.differences(player, rooms, recovered, recovered_rooms) == []
+
+
+def test_opened_treasures_do_not_checkpoint_forever(tmp_path):
+    path = str(tmp_path / "game.journal")
+    player, rooms = _world()
+    with Journal(path, state=lambda: (player, rooms), batch_size=2, checkpoint_every=3) as journal:
+        journal.checkpoint()
+        for key in range(5):
+            journal.treasure_opened(key)
+    assert len(_checkpoints(path)) == 1
+    treasures = {key: TreasureProxy("Gold", "Old Key", key=key) for key in range(6)}
+    Journal.recover(path, treasures)
+    assert [treasures[key].is_opened for key in range(6)] == [True] * 5 + [False]
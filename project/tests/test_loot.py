@@ -0,0 +1,38 @@
+"""Loot tables drop their leaves with the table probabilities, the same seed giving the same drops."""
+import numpy as np
+import pytest
+
+from src.loot.loot_check import check_drops, chi_square_p_value
+from src.loot.loot_table import LootTable, default_loot_table, make_rng
+from src.models.item import ItemRarity
+from src.models.key import Key
+
+SEED = 2024
+
+
+def test_default_table_follows_its_probabilities():
+    table = default_loot_table()
+    result = check_drops(table, SEED, 200_000)
+    assert result.passed, result.problems
+    assert result.leaves == 9 and result.max_deviation < 0.01
+
+
+def test_modifiers_and_empty_drops():
+    table = LootTable([("nothing", 1, None), ("key", 3, lambda: Key("Old Key", ItemRarity.COMMON))])
+    modifiers = {"nothing": 3.0}
+    assert table.leaves(modifiers) == [("nothing", 0.5), ("key", 0.5)]
+    assert check_drops(table, SEED, 50_000, modifiers).passed
+    drops = table.roll_many(make_rng(SEED), 100)
+    assert 0 < len(drops) < 100 and all(isinstance(drop, Key) for drop in drops)
+    with pytest.raises(ValueError):
+        table.leaves({"nothing": 0.0, "key": 0.0})
+
+
+def test_single_leaf_always_fits():
+    table = LootTable([("key", 1, lambda: Key("Old Key", ItemRarity.COMMON))])
+    assert chi_square_p_value(np.array([10.0]), np.array([10.0])) == 1.0
+    assert check_drops(table, SEED, 1_000).passed
+
+
+def test_skewed_drops_are_rejected():
+    assert chi_square_p_value(np.array([900.0, 100.0]), np.array([500.0, 500.0])) < 0.001
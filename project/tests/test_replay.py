@@ -0,0 +1,70 @@
+"""A recorded session replays to the same state, and a divergence is reported."""
+import os
+import subprocess
+import sys
+
+from src.models.player import Player
+from src.models.weapon import Weapon
+from src.simulation.replay import Recorder, Recording, replay, state_hash
+
+SEED = 7
+PROJECT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _explore(recorder: Recorder, steps: int, fight: bool) -> None:
+    """Pick up items, fight monsters with a weapon when `fight`, and walk around."""
+    session = recorder.session
+    for step in range(steps):
+        room = session.current_room
+        weapons = [index for index, item in enumerate(session.player.inventory) if isinstance(item, Weapon)]
+        if fight and room.monsters and weapons:
+            line = f"attack {weapons[0]}"
+        elif room.items:
+            line = "take 0"
+        else:
+            exits = sorted(room.connections)
+            line = f"go {exits[step % len(exits)]}"
+        recorder.execute(line)
+        if session.finished:
+            break
+
+
+def _recorder(player: Player = None) -> Recorder:
+    return Recorder(SEED, size=40, chunk_size=4, max_chunks=2, player=player)
+
+
+def test_replay_reaches_the_recorded_state():
+    recorder = _recorder(Player(name="Zelda", health=40))
+    _explore(recorder, 60, fight=False)
+    recorder.execute("status")
+    recording = Recording.loads(recorder.recording.dumps())
+    assert (recording.player_name, recording.player_health) == ("Zelda", 40)
+    result = replay(recording)
+    assert result.ok and result.commands == len(recorder.recording.commands)
+    assert result.final_hash == state_hash(recorder.session)
+
+
+def test_divergence_is_reported():
+    recorder = _recorder()
+    _explore(recorder, 20, fight=False)
+    recording = recorder.recording
+    recording.hashes[5] = "0" * 32
+    result = replay(recording)
+    assert not result.ok and result.diverged_at == 5 and result.expected == "0" * 32
+
+
+def test_plain_sessions_do_not_load_numpy():
+    # In a fresh interpreter, other tests may already have loaded NumPy in this one
+    script = ("import sys\n"
+              "from tests.test_replay import _explore, _recorder\n"
+              "_explore(_recorder(), 20, fight=False)\n"
+              "sys.exit('numpy' in sys.modules)\n")
+    assert subprocess.run([sys.executable, "-c", script], cwd=PROJECT).returncode == 0
+
+
+def test_fights_and_loot_replay_the_same():
+    recorder = _recorder()
+    _explore(recorder, 400, fight=True)
+    assert any(line.startswith("attack") for line in recorder.recording.commands)
+    result = replay(recorder.recording)
+    assert result.ok and result.final_hash == state_hash(recorder.session)
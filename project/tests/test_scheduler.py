@@ -0,0 +1,78 @@
+"""The scheduler runs timed events in order and only updates the active rooms."""
+import pytest
+
+from src.models.item import ItemRarity
+from src.models.player import Player
+from src.models.potion import Potion, PotionEffect
+from src.simulation.scheduler import MonsterRespawner, PotionBuffs, Scheduler
+from src.world.chunked_world import ChunkedWorld
+from src.world.world_generator import WorldGenerator
+
+
+class Countdown:
+    def __init__(self, ticks):
+        self.ticks = ticks
+
+    def update(self, scheduler):
+        self.ticks -= 1
+        return self.ticks > 0
+
+
+def test_timers_run_in_order_and_can_be_cancelled():
+    scheduler = Scheduler(timestep=0.5)
+    calls = []
+    scheduler.schedule(2.0, calls.append, "late")
+    scheduler.schedule(1.0, calls.append, "early")
+    periodic = scheduler.schedule_every(1.5, calls.append, "tick")
+    scheduler.schedule(1.0, calls.append, "cancelled").cancel()
+    scheduler.fast_forward(6)
+    assert scheduler.time == 3.0
+    assert calls == ["early", "tick", "late", "tick"]
+    periodic.cancel()
+    scheduler.fast_forward(6)
+    assert calls == ["early", "tick", "late", "tick"] and scheduler.pending_timers == 0
+
+
+def test_rooms_are_active_until_their_actors_are_done():
+    scheduler = Scheduler()
+    first, second = Countdown(2), Countdown(4)
+    scheduler.activate("hall", first)
+    scheduler.activate("cave", second)
+    scheduler.fast_forward(2)
+    assert scheduler.active_rooms == 1 and first.ticks == 0
+    scheduler.fast_forward(5)
+    assert scheduler.active_rooms == 0 and second.ticks == 0
+
+
+def test_sync_follows_the_clock():
+    now = [0.0]
+    scheduler = Scheduler(timestep=0.1, clock=lambda: now[0])
+    assert scheduler.sync() == 0
+    now[0] = 0.35
+    assert scheduler.sync() == 3
+    now[0] = 10.0
+    assert scheduler.sync(max_ticks=5) == 5 and scheduler.tick == 8
+    with pytest.raises(ValueError):
+        Scheduler(timestep=0)
+
+
+def test_monsters_respawn_and_buffs_expire():
+    scheduler = Scheduler(timestep=1.0)
+    world = ChunkedWorld(WorldGenerator(3, 8, 8), chunk_size=4)
+    world.events = scheduler.events
+    respawner = MonsterRespawner(scheduler, world, delay=5.0)
+    room = next(world.room_at((x, y)) for x in range(8) for y in range(8) if world.room_at((x, y)).monsters)
+    count = len(room.monsters)
+    room.remove_monster(room.monsters[0])
+    scheduler.fast_forward(4)
+    assert len(room.monsters) == count - 1
+    scheduler.fast_forward(2)
+    assert len(room.monsters) == count and respawner.delay == 5.0
+
+    buffs = PotionBuffs(scheduler, duration=3.0)
+    player = Player()
+    buffs.drink(player, Potion("Strength Potion", ItemRarity.RARE, PotionEffect.STRENGTH, 5))
+    buffs.drink(player, Potion("Red Potion", ItemRarity.COMMON, PotionEffect.HEAL, 20))
+    assert buffs.bonus(player, PotionEffect.STRENGTH) == 5 and player.health == 120
+    scheduler.fast_forward(3)
+    assert buffs.bonus(player, PotionEffect.STRENGTH) == 0
@@ -0,0 +1,84 @@
+"""Snapshots restore the player and the world they were saved from."""
+from src.models.enchantment import Enchantment, EnchantmentType, Gem
+from src.models.item import ItemRarity
+from src.models.key import Key
+from src.models.player import Player
+from src.models.potion import Potion, PotionEffect
+from src.models.room import Room, RoomRef
+from src.models.weapon import Bow, Shield, Sword
+from src.patterns.bridge.monster_bridge import Bokoblin, Hinox, Monster
+from src.patterns.flyweight.monster_flyweight import MonsterVariantFactory
+from src.persistence import snapshot
+from src.persistence.state import differences, room_state
+from src.world.chunked_world import ChunkedWorld
+from src.world.world_generator import WorldGenerator
+
+
+def _player() -> Player:
+    sword = Sword("Knight's Sword", 20, 1, ItemRarity.RARE, Enchantment(EnchantmentType.ICE, 4), [Gem("Ruby", 3, 2)])
+    sword.use()
+    bow = Bow("Royal Bow", 15, 35, ItemRarity.RARE, arrow_count=5)
+    bow.use()
+    player = Player(name="Zelda", health=73)
+    for item in (sword, bow, Shield("Hylian Shield", 80, 30, ItemRarity.LEGENDARY),
+                 Potion("Red Potion", ItemRarity.COMMON, PotionEffect.HEAL, 20), Key("Old Key", ItemRarity.COMMON)):
+        player.pick_weapon(item)
+    return player
+
+
+def _rooms() -> list:
+    red, white = MonsterVariantFactory.get("red"), MonsterVariantFactory.get("white")
+    hall = Room("Hall", [Key("Small Key", ItemRarity.COMMON)], [Bokoblin(red)])
+    armory = Room("Armory", [Sword("Blade", 10, 5, ItemRarity.COMMON)], [Hinox(white), Monster("Lynel", white)])
+    cellar = Room("Cellar", [], [], position=(2, 3))
+    hall.connect("east", armory)
+    armory.connect("west", hall)
+    armory.connect("down", cellar)
+    cellar.connect("up", armory)
+    return [hall, armory, cellar]
+
+
+def test_list_world_round_trip(tmp_path):
+    path = str(tmp_path / "world.snapshot")
+    player, rooms = _player(), _rooms()
+    snapshot.save(path, player, rooms)
+    loaded_player, loaded_rooms = snapshot.load(path)
+    assert differences(player, rooms, loaded_player, loaded_rooms) == []
+    assert loaded_rooms[1].connections["west"] is loaded_rooms[0]
+
+
+def test_reachable_rooms_are_saved(tmp_path):
+    path = str(tmp_path / "world.snapshot")
+    player, rooms = _player(), _rooms()
+    snapshot.save(path, player, rooms[:1])
+    _, loaded_rooms = snapshot.load(path)
+    assert differences(player, rooms, player, loaded_rooms) == []
+
+
+def test_rooms_decoded_alone_round_trip(tmp_path):
+    path, again = str(tmp_path / "world.snapshot"), str(tmp_path / "again.snapshot")
+    player, rooms = _player(), _rooms()
+    snapshot.save(path, player, rooms)
+    with snapshot.Snapshot(path) as snap:
+        armory = snap.room(1)
+        assert room_state(armory) == room_state(rooms[1])
+        assert isinstance(armory.connections["west"], RoomRef)
+        # A world whose exits are references is saved again
+        snapshot.save(again, snap.player(), [armory])
+    loaded_player, loaded_rooms = snapshot.load(again)
+    assert differences(player, [rooms[1], rooms[0], rooms[2]], loaded_player, loaded_rooms) == []
+
+
+def test_procedural_world_round_trip(tmp_path):
+    path = str(tmp_path / "world.snapshot")
+    world = ChunkedWorld(WorldGenerator(5, 16, 16), chunk_size=4, max_chunks=2)
+    position = next((x, y) for x in range(16) for y in range(16) if world.room_at((x, y)).items)
+    room = world.room_at(position)
+    room.remove_item(room.items[0])
+    player = _player()
+    snapshot.save(path, player, world)
+    loaded_player, loaded_world = snapshot.load(path)
+    assert isinstance(loaded_world, ChunkedWorld)
+    positions = [position, (0, 0), (15, 15)]
+    assert differences(player, [world.room_at(p) for p in positions],
+                       loaded_player, [loaded_world.room_at(p) for p in positions]) == []
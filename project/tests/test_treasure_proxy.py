@@ -0,0 +1,61 @@
+"""Treasure boxes create their items on the first successful opening only."""
+from src.models.inventory import Inventory
+from src.models.item import ItemRarity
+from src.models.key import Key
+from src.models.potion import Potion, PotionEffect
+from src.patterns.proxy.treasure_proxy import Treasure, TreasureProxy
+
+
+class CountingLoader:
+    def __init__(self):
+        self.seeds = []
+
+    def __call__(self, seed):
+        self.seeds.append(seed)
+        return [Potion("Red Potion", ItemRarity.COMMON, PotionEffect.HEAL, 20)]
+
+
+class KeyIndex:
+    """Inventory answering key lookups only, iterating it would fail."""
+
+    def __init__(self, *locks):
+        self.locks = locks
+
+    def has_key(self, lock):
+        return lock in self.locks
+
+
+def test_items_are_loaded_on_the_first_opening():
+    loader = CountingLoader()
+    box = TreasureProxy(loader, "Old Key", seed=7)
+    assert box.open([]) == "You need a key to open this treasure box."
+    assert not box.is_loaded and box.contents == [] and loader.seeds == []
+    assert box.open(Inventory([Key("Old Key", ItemRarity.COMMON)])) == \
+        "You opened the treasure box and found: Red Potion"
+    assert box.is_loaded and loader.seeds == [7]
+    assert box.open(["Old Key"]) == "The treasure box is already opened."
+    assert [item.name for item in box.contents] == ["Red Potion"] and loader.seeds == [7]
+
+
+def test_restored_boxes_load_when_their_contents_are_read():
+    loader = CountingLoader()
+    box = TreasureProxy(loader, "Old Key", seed=3)
+    box.restore(opened=True)
+    assert box.is_opened and not box.is_loaded
+    assert len(box.contents) == 1 and loader.seeds == [3]
+    box.restore(opened=False)
+    assert box.contents == []
+
+
+def test_keys_are_found_through_the_key_index():
+    assert TreasureProxy("Gold", "Old Key").open(KeyIndex("Old Key")).endswith("found: Gold")
+    assert TreasureProxy("Gold", "Old Key").open(KeyIndex("Boss Key")) == "You need a key to open this treasure box."
+
+
+def test_treasure_names_and_key_names_are_accepted():
+    box = TreasureProxy("Gold", "Old Key")
+    assert box.is_loaded and not box.open(["Boss Key", Key("Small Key", ItemRarity.COMMON)]).startswith("You opened")
+    assert box.open(["Old Key"]) == "You opened the treasure box and found: Gold"
+    assert box.contents == [Treasure("Gold")]
+    assert TreasureProxy([], "Old Key").open([Key("Old Key", ItemRarity.COMMON)]) == \
+        "You opened the treasure box, it is empty."
@@ -0,0 +1,52 @@
+import pickle
+
+from src.models.enchantment import Gem
+from src.models.item import ItemRarity
+from src.models.weapon import Bow, Sword
+from src.patterns.prototype.prototype_registry import clone, clone_many
+
+
+def test_gems_is_a_list_invalidating_the_stats():
+    sword = Sword("Blade", 10, 5, ItemRarity.COMMON)
+    sword.gems.append(Gem("Ruby", 3, 2))
+    assert sword.get_total_damage() == 13
+    assert sword.get_total_durability() == 7
+    sword.gems[0] = Gem("Onyx", 5, 0)
+    assert sword.get_total_damage() == 15
+    del sword.gems[:]
+    assert sword.get_total_damage() == 10
+    sword.gems = [Gem("Ruby", 3, 2)]
+    assert sword.get_total_damage() == 13
+
+
+def test_copies_own_their_gems():
+    sword = Sword("Blade", 10, 5, ItemRarity.COMMON, gems=[Gem("Ruby", 3, 2)])
+    copies = [clone(sword), pickle.loads(pickle.dumps(sword))] + clone_many(sword, 2)
+    for copy in copies:
+        assert copy.gems == sword.gems and copy.gems is not sword.gems
+        copy.gems.clear()
+        assert copy.get_total_damage() == 10
+    assert sword.get_total_damage() == 13
+
+
+def test_bow_arrow_count():
+    assert Bow("Longbow", 4, 10, ItemRarity.COMMON).arrow_count == 30
+    assert Bow("Longbow", 4, 10, ItemRarity.COMMON, arrow_count=3).arrow_count == 3
+
+
+def test_weapons_without_gems_share_an_empty_tuple():
+    swords = [Sword("Blade", 10, 5, ItemRarity.COMMON) for _ in range(2)]
+    assert all(Sword.gems.slot.__get__(sword) == () for sword in swords)
+    assert swords[0].gems == [] and not swords[0].get_full_description().count("Gems")
+    gems = swords[0].gems
+    gems.append(Gem("Ruby", 3, 2))
+    assert swords[0].gems is gems and swords[0].get_total_damage() == 13
+    assert Sword.gems.slot.__get__(swords[1]) == ()
+    swords[0].remove_gem(Gem("Ruby", 3, 2))
+    assert Sword.gems.slot.__get__(swords[0]) == () and swords[0].get_total_damage() == 10
+
+
+def test_new_weapons_are_stamped_once():
+    first = Sword("Blade", 10, 5, ItemRarity.COMMON, gems=[Gem("Ruby", 3, 2)])
+    second = Sword("Blade", 10, 5, ItemRarity.COMMON)
+    assert second.stats_version == first.stats_version + 1
@@ -0,0 +1,57 @@
+"""Directors build weapons from compiled recipes, cached unless a builder is given."""
+import pytest
+
+from src.models.enchantment import Gem
+from src.models.item import ItemRarity
+from src.models.weapon import Bow, Shield, Sword
+from src.patterns.builder.weapon_builder import (AncientBowDirector, MasterSwordDirector, WeaponBuilder,
+                                                 WeaponDirector, build_many)
+
+
+class LoggingBuilder(WeaponBuilder):
+    def __init__(self):
+        super().__init__()
+        self.names = []
+
+    def set_name(self, name):
+        self.names.append(name)
+        return super().set_name(name)
+
+
+def test_director_spec_is_cached():
+    assert MasterSwordDirector.spec() is MasterSwordDirector.spec()
+    sword, other = MasterSwordDirector.construct(), MasterSwordDirector.construct()
+    assert isinstance(sword, Sword) and sword == other and sword is not other
+    assert sword.gems == other.gems and sword.gems is not other.gems
+    assert isinstance(AncientBowDirector.construct(), Bow)
+
+
+def test_given_builders_are_used_every_time():
+    MasterSwordDirector.construct()
+    for _ in range(2):
+        builder = LoggingBuilder()
+        assert MasterSwordDirector.construct(builder) == MasterSwordDirector.construct()
+        assert builder.names == ["Master Blade"]
+    assert MasterSwordDirector.spec(LoggingBuilder()) is not MasterSwordDirector.spec()
+
+
+def test_specs_build_many_weapons():
+    spec = WeaponBuilder().set_name("Hylian Shield").set_durability(80).set_rarity(ItemRarity.RARE).compile(Shield, 30)
+    shields = build_many(spec, 3)
+    assert len(shields) == 3 and all(shield.defense == 30 for shield in shields)
+    with pytest.raises(ValueError):
+        WeaponBuilder().compile(Sword)
+
+
+def test_abstract_director_has_no_recipe():
+    with pytest.raises(TypeError):
+        WeaponDirector.construct()
+
+
+def test_builders_build_new_weapons():
+    builder = WeaponBuilder().set_name("Blade").add_gem(Gem("Ruby", 3, 2))
+    sword, other = builder.build_sword(), builder.build_sword()
+    assert sword == other and sword is not other and sword.gems is not other.gems
+    assert builder.build_shield(5).defense == 5
+    with pytest.raises(ValueError):
+        builder.set_durability(0).build_bow()
@@ -0,0 +1,57 @@
+"""Fused weapons add the bonus of their fusions and are carried like any other weapon."""
+import pickle
+
+from src.models.item import ItemRarity
+from src.models.player import Player
+from src.models.weapon import Bow, Sword, Weapon
+from src.patterns.decorator.weapon_decorator import ROCK, WOOD, RockFusion, WoodFusion
+from src.server.session import GameSession
+from src.world.chunked_world import ChunkedWorld
+from src.world.world_generator import WorldGenerator
+
+
+def test_fusions_are_flattened():
+    sword = Sword("Blade", 10, 5, ItemRarity.COMMON)
+    fused = RockFusion(WoodFusion(sword))
+    assert fused.weapon is sword and fused.fusions == (WOOD, ROCK)
+    assert fused.get_total_damage() == 18 and str(fused) == "[common] Blade (Wood + Rock)"
+    fused.remove_fusion(WOOD)
+    assert fused.attack() == 15
+
+
+def test_use_adds_the_fusions_to_the_bonus():
+    fused = RockFusion(Sword("Blade", 10, 5, ItemRarity.COMMON))
+    assert "17 damage" in fused.use(2)
+    assert "15 damage" in fused.use()
+
+
+def test_fused_weapons_are_carried_and_ranked():
+    player = Player()
+    bow = Bow("Longbow", 12, 10, ItemRarity.COMMON)
+    fused = WoodFusion(Sword("Blade", 10, 5, ItemRarity.COMMON))
+    player.pick_weapon(bow)
+    player.pick_weapon(fused)
+    assert isinstance(fused, Weapon)
+    assert "13 damage" in player.attack(fused)
+    assert player.inventory.best_weapon() is fused
+    fused.remove_fusion(WOOD)
+    assert player.inventory.best_weapon() is bow
+    fused.add_fusion(ROCK)
+    assert player.inventory.best_weapon() is fused
+    player.drop_item(None, fused)
+    assert player.inventory.best_weapon() is bow
+
+
+def test_fused_weapons_attack_in_sessions():
+    session = GameSession(ChunkedWorld(WorldGenerator(3, 8, 8), chunk_size=4))
+    session.current_room = next(session.world.room_at((x, y)) for x in range(8) for y in range(8)
+                                if session.world.room_at((x, y)).monsters)
+    monster = session.current_room.monsters[0]
+    session.player.pick_weapon(RockFusion(Sword("Blade", 1, 5, ItemRarity.COMMON)))
+    session.execute("attack")
+    assert session.target_hp == monster.variant.hp() - 6
+
+
+def test_pickled_fused_weapons_keep_their_fusions():
+    fused = pickle.loads(pickle.dumps(RockFusion(WoodFusion(Sword("Blade", 10, 5, ItemRarity.COMMON)))))
+    assert fused.fusions == (WOOD, ROCK) and fused.get_total_damage() == 18
@@ -0,0 +1,43 @@
+"""Procedural worlds are connected and the same seed always gives the same world."""
+import pytest
+
+from src.models.room import RoomRef
+from src.persistence.state import room_state
+from src.world.world_generator import DIRECTIONS, WorldGenerator
+
+
+def test_same_seed_same_world():
+    first, second = WorldGenerator(7, 12, 9).build(), WorldGenerator(7, 12, 9).build()
+    assert [room_state(room) for room in first] == [room_state(room) for room in second]
+    other = WorldGenerator(8, 12, 9).build()
+    assert [room_state(room) for room in first] != [room_state(room) for room in other]
+
+
+def test_world_is_connected_both_ways():
+    rooms = WorldGenerator(3, 10, 10).build()
+    seen, todo = {rooms[0].position}, [rooms[0]]
+    while todo:
+        room = todo.pop()
+        for direction, neighbour in room.connections.items():
+            dx, dy = DIRECTIONS[direction]
+            assert neighbour.position == (room.position[0] + dx, room.position[1] + dy)
+            assert any(back is room for back in neighbour.connections.values())
+            if neighbour.position not in seen:
+                seen.add(neighbour.position)
+                todo.append(neighbour)
+    assert len(seen) == len(rooms) == 100
+
+
+def test_streamed_rooms_match_the_built_world():
+    generator = WorldGenerator(5, 6, 4)
+    built = generator.build()
+    for room, streamed in zip(built, generator.rooms()):
+        assert all(isinstance(exit, RoomRef) for exit in streamed.connections.values())
+        assert room_state(streamed) == room_state(room)
+        for direction, neighbour in streamed.connections.items():
+            assert room_state(neighbour.resolve()) == room_state(room.connections[direction])
+
+
+def test_dimensions_are_checked():
+    with pytest.raises(ValueError):
+        WorldGenerator(1, 0, 4)
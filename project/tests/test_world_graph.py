@@ -0,0 +1,65 @@
+"""Pathfinding over the CSR adjacency of `WorldGraph`."""
+from src.models.room import Room
+from src.world.world_graph import WorldGraph
+
+OPPOSITE = {"north": "south", "south": "north", "east": "west", "west": "east"}
+
+
+def _link(first: Room, direction: str, second: Room) -> None:
+    first.connect(direction, second)
+    second.connect(OPPOSITE[direction], first)
+
+
+def _grid(width: int, height: int):
+    """Rooms of a grid, every room linked to its east and north neighbours."""
+    rooms = {(x, y): Room(f"Room {x},{y}", [], []) for y in range(height) for x in range(width)}
+    for (x, y), room in rooms.items():
+        room.position = (x, y)
+        if x + 1 < width:
+            _link(room, "east", rooms[(x + 1, y)])
+        if y + 1 < height:
+            _link(room, "north", rooms[(x, y + 1)])
+    return rooms
+
+
+def test_paths_have_the_fewest_moves():
+    rooms = _grid(6, 5)
+    graph = WorldGraph.from_rooms([rooms[(0, 0)]], position=lambda room: room.position)
+    assert len(graph) == 30
+    path = graph.bfs(rooms[(0, 0)], rooms[(5, 4)])
+    assert len(path) == 10 and path[0] is rooms[(0, 0)] and path[-1] is rooms[(5, 4)]
+    cost, astar_path = graph.astar(rooms[(0, 0)], rooms[(5, 4)])
+    assert cost == 9 and len(astar_path) == 10
+    assert graph.distance(rooms[(0, 0)], rooms[(5, 4)]) == 9
+    assert graph.route(path).count("east") == 5 and graph.route(path).count("north") == 4
+
+
+def test_distances_and_reach():
+    rooms = _grid(4, 4)
+    graph = WorldGraph.from_rooms([rooms[(0, 0)]])
+    distances = graph.distances_from(rooms[(0, 0)])
+    assert distances[graph.index_of(rooms[(3, 3)])] == 6
+    assert {room.position for room in graph.within(rooms[(0, 0)], 1)} == {(0, 0), (1, 0), (0, 1)}
+
+
+def test_weights_steer_dijkstra():
+    rooms = _grid(3, 2)
+    graph = WorldGraph.from_rooms([rooms[(0, 0)]])
+    # Crossing the bottom row is expensive, the cheapest path goes through the top one
+    expensive = rooms[(1, 0)]
+    cost, path = graph.dijkstra(rooms[(0, 0)], rooms[(2, 0)],
+                                weight=lambda start, end: 10.0 if end is expensive else 1.0)
+    assert cost == 4 and [room.position for room in path] == [(0, 0), (0, 1), (1, 1), (2, 1), (2, 0)]
+
+
+def test_connections_update_the_graph():
+    first, second, island = Room("First", [], []), Room("Second", [], []), Room("Island", [], [])
+    _link(first, "east", second)
+    graph = WorldGraph.from_rooms([first])
+    graph.add_room(island)
+    assert graph.bfs(first, island) is None
+    assert graph.distance(first, island) == -1
+    _link(second, "north", island)
+    assert [room.name for room in graph.bfs(first, island)] == ["First", "Second", "Island"]
+    graph.compact()
+    assert graph.distance(first, island) == 2